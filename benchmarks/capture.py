@@ -0,0 +1,183 @@
+"""Record a live ExtApi MQTT stream to a compressed JSONL capture.
+
+Usage:
+    python -m benchmarks.capture --host 192.168.1.10 --username user \
+        --password secret --duration 86400 capture.jsonl.gz
+
+Each line of the capture holds one message with its receive time in seconds
+since the capture started and its topic relative to the MQTT prefix. The
+first line is a header with the prefix and the wall clock start time. Replay
+captures with `pytest benchmarks/test_replay.py --replay=capture.jsonl.gz`.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+import gzip
+import json
+import time
+from typing import Any, TextIO
+
+
+@dataclass
+class CapturedMessage:
+    """A message received at `offset` seconds after the capture started."""
+
+    offset: float
+    topic: str
+    payload: str
+
+
+def open_capture(path: str, mode: str = "rt") -> TextIO:
+    """Open a capture, gzip compressed unless the name ends with .jsonl."""
+    if path.endswith(".jsonl"):
+        return open(path, mode.replace("t", ""), encoding="utf-8")
+    return gzip.open(path, mode, encoding="utf-8")
+
+
+def write_header(file: TextIO, prefix: str, started: datetime) -> None:
+    """Write the capture header."""
+    file.write(json.dumps({"prefix": prefix, "started": started.isoformat()}) + "\n")
+
+
+def write_message(file: TextIO, message: CapturedMessage) -> None:
+    """Write a single captured message."""
+    file.write(
+        json.dumps(
+            {
+                "offset": round(message.offset, 6),
+                "topic": message.topic,
+                "payload": message.payload,
+            }
+        )
+        + "\n"
+    )
+
+
+def write_capture(
+    path: str,
+    messages: Iterable[CapturedMessage],
+    prefix: str = "extapi",
+    started: datetime | None = None,
+) -> int:
+    """Write `messages` to a capture file and return the number written."""
+    count = 0
+    with open_capture(path, "wt") as file:
+        write_header(file, prefix, started or datetime.now(UTC))
+        for message in messages:
+            write_message(file, message)
+            count += 1
+    return count
+
+
+def read_capture(path: str) -> tuple[dict[str, Any], Iterator[CapturedMessage]]:
+    """Read a capture file.
+
+    Returns:
+        The header and an iterator over the captured messages. The file is
+        closed once the iterator is exhausted.
+    """
+    file = open_capture(path)
+    header = json.loads(file.readline())
+
+    def messages() -> Iterator[CapturedMessage]:
+        with file:
+            for line in file:
+                if line.strip():
+                    data = json.loads(line)
+                    yield CapturedMessage(
+                        data["offset"], data["topic"], data["payload"]
+                    )
+
+    return header, messages()
+
+
+def record(
+    path: str,
+    host: str,
+    port: int = 1883,
+    username: str | None = None,
+    password: str | None = None,
+    prefix: str = "extapi",
+    duration: float | None = None,
+) -> int:
+    """Record `<prefix>/#` from a broker until `duration` passes or Ctrl-C.
+
+    Returns:
+        Number of messages recorded.
+    """
+    # paho-mqtt is installed with Home Assistant's MQTT integration
+    import paho.mqtt.client as mqtt
+
+    if hasattr(mqtt, "CallbackAPIVersion"):
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+    else:  # paho-mqtt < 2.0
+        client = mqtt.Client()
+    if username is not None:
+        client.username_pw_set(username, password)
+
+    count = 0
+    started = time.monotonic()
+    with open_capture(path, "wt") as file:
+        write_header(file, prefix, datetime.now(UTC))
+
+        def on_connect(client: Any, *args: Any) -> None:
+            client.subscribe(f"{prefix}/#")
+
+        def on_message(client: Any, userdata: Any, msg: Any) -> None:
+            nonlocal count
+            write_message(
+                file,
+                CapturedMessage(
+                    time.monotonic() - started,
+                    msg.topic.removeprefix(f"{prefix}/"),
+                    msg.payload.decode("utf-8", errors="replace"),
+                ),
+            )
+            count += 1
+
+        client.on_connect = on_connect
+        client.on_message = on_message
+        client.connect(host, port)
+        client.loop_start()
+        try:
+            while duration is None or time.monotonic() - started < duration:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            client.loop_stop()
+            client.disconnect()
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Record a capture from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="capture file, gzip compressed unless .jsonl")
+    parser.add_argument("--host", required=True)
+    parser.add_argument("--port", type=int, default=1883)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--prefix", default="extapi")
+    parser.add_argument(
+        "--duration", type=float, help="seconds to record, until Ctrl-C if omitted"
+    )
+    args = parser.parse_args(argv)
+    count = record(
+        args.path,
+        args.host,
+        args.port,
+        args.username,
+        args.password,
+        args.prefix,
+        args.duration,
+    )
+    print(f"Recorded {count} messages to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Fixtures and options for the benchmarks."""
+
+import pytest
+
+from tests.conftest import mqtt_broker, mqtt_live  # noqa: F401
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("ferroamp replay")
+    group.addoption(
+        "--replay",
+        help="capture file to replay, generated traffic is replayed if omitted",
+    )
+    group.addoption(
+        "--replay-speed",
+        type=float,
+        help="times faster than captured to replay, as fast as possible if omitted",
+    )
+    group.addoption("--replay-report", help="write the replay result as JSON here")
+    parser.getgroup("ferroamp soak").addoption(
+        "--soak-days",
+        type=float,
+        default=0.25,
+        help="days of simulated traffic for the soak test",
+    )
+    parser.getgroup("ferroamp control").addoption(
+        "--hub-delay",
+        type=float,
+        default=0.0,
+        help="seconds the fake EnergyHub waits before answering control requests",
+    )
+
+
+# This fixture enables loading custom integrations in all benchmarks.
+# The recorder has to be set up before hass, which enable_custom_integrations uses,
+# so benchmarks requesting recorder_mock get it first.
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(request):
+    if "recorder_mock" in request.fixturenames:
+        request.getfixturevalue("recorder_mock")
+    request.getfixturevalue("enable_custom_integrations")
+    yield
@@ -0,0 +1,98 @@
+"""Realistic Ferroamp ExtApi payloads used by the benchmarks."""
+
+import json
+
+from custom_components.ferroamp.mqtt_parser import MqttEvent
+
+EHUB_PAYLOAD = """{
+    "wloadconsq": {
+        "L2": "5509231063416", "L3": "10852247351438", "L1": "7902091810549"
+    },
+    "iloadd": {"L2": "-0.67", "L3": "0.56", "L1": "1.55"},
+    "wextconsq": {"L2": "5364952651263", "L3": "10118502962305", "L1": "7277915408026"},
+    "ppv": {"val": "10107.51"},
+    "iext": {"L2": "8.90", "L3": "7.49", "L1": "7.59"},
+    "iloadq": {"L2": "1.16", "L3": "3.61", "L1": "3.89"},
+    "iace": {"L2": "0.00", "L3": "0.00", "L1": "0.00"},
+    "ul": {"L2": "233.81", "L3": "231.18", "L1": "228.81"},
+    "pinvreactive": {"L2": "438.12", "L3": "444.64", "L1": "430.37"},
+    "ts": {"val": "2021-03-08T08:43:12UTC"},
+    "ploadreactive": {"L2": "-110.77", "L3": "91.54", "L1": "250.78"},
+    "state": {"val": "4097"},
+    "wloadprodq": {"L2": "18020837409", "L3": "8433745", "L1": "4976003"},
+    "iavbl": {"L2": "26.31", "L3": "29.69", "L1": "31.20"},
+    "pinv": {"L2": "-2263.35", "L3": "-2234.62", "L1": "-2224.66"},
+    "iextq": {"L2": "-12.53", "L3": "-10.06", "L1": "-9.86"},
+    "pext": {"L2": "-2071.57", "L3": "-1644.50", "L1": "-1595.28"},
+    "wbatcons": {"val": "4472794198593"},
+    "wextprodq": {"L2": "1118056851556", "L3": "604554554552", "L1": "662115344893"},
+    "wpv": {"val": "4422089590383"},
+    "winvconsq": {"L2": "1475109889749", "L3": "1451934095829", "L1": "1436427014025"},
+    "pextreactive": {"L2": "327.35", "L3": "536.18", "L1": "681.15"},
+    "udc": {"neg": "-383.96", "pos": "384.31"},
+    "sext": {"val": "5549.12"},
+    "pbat": {"val": "-3218.99"},
+    "iextd": {"L2": "1.98", "L3": "3.28", "L1": "4.21"},
+    "iavblq_3p": {"val": "29.05"},
+    "wbatprod": {"val": "4918944968551"},
+    "iavblq": {"L2": "29.05", "L3": "33.93", "L1": "35.89"},
+    "ild": {"L2": "2.65", "L3": "2.72", "L1": "2.66"},
+    "gridfreq": {"val": "50.07"},
+    "pload": {"L2": "191.78", "L3": "590.12", "L1": "629.38"},
+    "ilq": {"L2": "-13.69", "L3": "-13.67", "L1": "-13.75"},
+    "winvprodq": {"L2": "2610825033980", "L3": "2570987302422", "L1": "2567078340545"},
+    "il": {"L2": "9.85", "L3": "9.85", "L1": "9.89"},
+    "soc": {"val": "79.9"},
+    "soh": {"val": "98.9"},
+    "ratedcap": {"val": "15300"}
+}"""
+
+SSO_PAYLOAD = """{
+    "relaystatus": {"val": "0"},
+    "temp": {"val": "6.482"},
+    "wpv": {"val": "843516404273"},
+    "ts": {"val": "2021-03-08T08:22:42UTC"},
+    "udc": {"val": "769.872"},
+    "faultcode": {"val": "0"},
+    "ipv": {"val": "4.826"},
+    "upv": {"val": "653.012"},
+    "id": {"val": "12345678"}
+}"""
+
+ESO_PAYLOAD = """{
+    "soc": {"val": 48.100003999999998},
+    "temp": {"val": 20.379000000000001},
+    "wbatcons": {"val": 2213535479518},
+    "ubat": {"val": 622.601},
+    "ibat": {"val": 1.5700000000000001},
+    "relaystatus": {"val": "0"},
+    "faultcode": {"val": "80"},
+    "ts": {"val": "2021-03-07T19:21:04UTC"},
+    "id": {"val": "1"},
+    "wbatprod": {"val": 2465106122063}
+}"""
+
+ESM_PAYLOAD = """{
+    "id": {"val": "1"},
+    "soh": {"val": "89.2"},
+    "soc": {"val": "45.5"},
+    "ratedCapacity": {"val": "15300"},
+    "ratedPower": {"val": "7000"},
+    "status": {"val": "0"}
+}"""
+
+PAYLOADS = {
+    "ehub": EHUB_PAYLOAD,
+    "sso": SSO_PAYLOAD,
+    "eso": ESO_PAYLOAD,
+    "esm": ESM_PAYLOAD,
+}
+
+# Number of buffered events per flush: a single message, the default 30 s
+# interval for ehub, five minutes and an hour of ehub messages.
+WINDOW_SIZES = [1, 30, 300, 3600]
+
+
+def events(payload: str, size: int) -> list[MqttEvent]:
+    """Return `size` independently decoded copies of `payload`."""
+    return [json.loads(payload) for _ in range(size)]
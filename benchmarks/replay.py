@@ -0,0 +1,119 @@
+"""Replay captured ExtApi traffic into a Home Assistant test instance."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+import time
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from custom_components.ferroamp.const import DOMAIN
+
+from .capture import CapturedMessage
+from .clock import perf_counter
+
+
+@dataclass
+class ReplayResult:
+    """Throughput and final sensor states of a replay."""
+
+    messages: int
+    span: float
+    wall: float
+    cpu: float
+    states: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Messages replayed per wall clock second."""
+        return self.messages / self.wall if self.wall else 0.0
+
+    @property
+    def cpu_per_message_us(self) -> float:
+        """Process CPU time per message in µs."""
+        return self.cpu / self.messages * 1e6 if self.messages else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as a JSON serializable dict."""
+        return {
+            "messages": self.messages,
+            "captured_seconds": round(self.span, 3),
+            "wall_seconds": round(self.wall, 3),
+            "cpu_seconds": round(self.cpu, 3),
+            "throughput": round(self.throughput, 1),
+            "cpu_per_message_us": round(self.cpu_per_message_us, 1),
+            "states": self.states,
+        }
+
+
+def sensor_states(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the state and attributes of all Ferroamp sensors."""
+    return {
+        state.entity_id: {"state": state.state, "attributes": dict(state.attributes)}
+        for state in sorted(
+            hass.states.async_all("sensor"), key=lambda state: state.entity_id
+        )
+        if state.entity_id.startswith(f"sensor.{DOMAIN}")
+    }
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    messages: Iterable[CapturedMessage],
+    prefix: str = "extapi",
+    speed: float | None = None,
+    freezer: FrozenDateTimeFactory | None = None,
+) -> ReplayResult:
+    """Fire captured messages into Home Assistant.
+
+    Args:
+        hass: Home Assistant instance with MQTT mocked and Ferroamp set up.
+        messages: Captured messages in receive order.
+        prefix: MQTT prefix of the config entry to replay into.
+        speed: How many times faster than captured to replay, or None to
+            replay as fast as possible.
+        freezer: Frozen clock of Home Assistant. It is moved to the captured
+            time of each message, so sensors flush as they did when captured.
+            Without it sensors only flush as often as the replay takes time.
+
+    Returns:
+        Number of messages, captured and replay durations, CPU time and the
+        final sensor states.
+    """
+    count = 0
+    first: float | None = None
+    last = 0.0
+    start = dt_util.utcnow()
+    wall_start = perf_counter()
+    cpu_start = time.process_time()
+    for message in messages:
+        if first is None:
+            first = message.offset
+        elif speed is not None:
+            # Sleep until the message is due relative to the replay start
+            delay = (message.offset - first) / speed - (perf_counter() - wall_start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if freezer is not None:
+            freezer.move_to(start + timedelta(seconds=message.offset - first))
+        last = message.offset
+        async_fire_mqtt_message(hass, f"{prefix}/{message.topic}", message.payload)
+        count += 1
+        if speed is None and count % 1000 == 0:
+            # Let timers and state writes run as they would between messages
+            await asyncio.sleep(0)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return ReplayResult(
+        messages=count,
+        span=last - (first or 0.0),
+        wall=perf_counter() - wall_start,
+        cpu=time.process_time() - cpu_start,
+        states=sensor_states(hass),
+    )
@@ -0,0 +1,120 @@
+"""Cold-start benchmarks for importing and setting up the integration."""
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+from homeassistant.helpers import entity_registry
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.ferroamp.const import CONF_INTERVAL, DOMAIN
+
+from tests.generator import TrafficGenerator
+
+ROOT = Path(__file__).parent.parent
+
+# Imports Home Assistant and the integration package first, so only the
+# sensor platform and the modules it pulls in from the integration are measured
+IMPORT_SCRIPT = """
+import importlib, json, time, tracemalloc
+import homeassistant.components.mqtt
+import homeassistant.components.sensor
+import homeassistant.helpers.entity_platform
+import homeassistant.helpers.icon
+import homeassistant.helpers.restore_state
+import custom_components.ferroamp
+tracemalloc.start()
+start = time.perf_counter()
+importlib.import_module("custom_components.ferroamp.sensor")
+elapsed = time.perf_counter() - start
+current, peak = tracemalloc.get_traced_memory()
+print(json.dumps({"seconds": elapsed, "bytes": current, "peak_bytes": peak}))
+"""
+
+
+def import_sensor_platform() -> dict[str, float]:
+    """Import the sensor platform in a fresh interpreter and return its cost."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.benchmark(group="cold_start")
+def test_import_sensor_platform(benchmark):
+    measured = []
+    benchmark.pedantic(
+        lambda: measured.append(import_sensor_platform()), rounds=5, iterations=1
+    )
+    best = min(measured, key=lambda m: m["seconds"])
+    # Interpreter startup dominates the benchmark timing, so the import time
+    # and allocations measured inside the interpreter are reported as well
+    benchmark.extra_info.update(best)
+    print(
+        f"\nImport: {best['seconds'] * 1000:.1f} ms, "
+        f"{best['bytes'] / 1024:.0f} KiB allocated, "
+        f"{best['peak_bytes'] / 1024:.0f} KiB peak"
+    )
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+@pytest.mark.parametrize("entries", [1, 4])
+async def test_setup_to_ehub_entities(hass, mqtt_mock, entries, record_property):
+    config_entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_NAME: f"Ferroamp {n}", CONF_PREFIX: f"extapi{n}"},
+            options={CONF_INTERVAL: 30},
+            version=1,
+            unique_id=f"ferroamp{n}",
+        )
+        for n in range(entries)
+    ]
+    payload = json.dumps(TrafficGenerator().ehub_payload())
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for config_entry in config_entries:
+        config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    setup = time.perf_counter() - start
+    for n in range(entries):
+        async_fire_mqtt_message(hass, f"extapi{n}/data/ehub", payload)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    er = entity_registry.async_get(hass)
+    for config_entry in config_entries:
+        entities = entity_registry.async_entries_for_config_entry(
+            er, config_entry.entry_id
+        )
+        assert len(entities) > 90
+        assert all(hass.states.get(entity.entity_id) for entity in entities)
+
+    result = {
+        "setup_seconds": setup,
+        "seconds": elapsed,
+        "bytes": current,
+        "peak_bytes": peak,
+    }
+    record_property("cold_start", result)
+    print(
+        f"\n{entries} entries: setup {setup * 1000:.1f} ms, "
+        f"entities added {elapsed * 1000:.1f} ms, "
+        f"{current / 1024:.0f} KiB allocated, {peak / 1024:.0f} KiB peak"
+    )
@@ -0,0 +1,164 @@
+"""Benchmark control service latency against a fake EnergyHub."""
+
+import asyncio
+from dataclasses import dataclass
+import json
+import statistics
+import time
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_state_change_event
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ferroamp.const import (
+    CONF_INTERVAL,
+    DATA_DEVICES,
+    DOMAIN,
+    TOPIC_CONTROL_REQUEST,
+    TOPIC_CONTROL_RESPONSE,
+    TOPIC_CONTROL_RESULT,
+)
+
+from tests.broker import MqttBroker
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+# Service calls measured for each command and number of hubs
+CALLS = 50
+
+SERVICES = {
+    "charge": {"power": 1000},
+    "discharge": {"power": 1000},
+    "autocharge": {},
+}
+
+
+class FakeEnergyHub:
+    """Answers control requests on a prefix like an EnergyHub does.
+
+    Each request is acknowledged on control/response and completed on
+    control/result after `delay` seconds.
+    """
+
+    def __init__(self, broker: MqttBroker, prefix: str, delay: float) -> None:
+        self.broker = broker
+        self.prefix = prefix
+        self.delay = delay
+        self.requests = 0
+        broker.on_publish(f"{prefix}/{TOPIC_CONTROL_REQUEST}", self.respond)
+
+    async def respond(self, topic: str, payload: bytes) -> None:
+        request = json.loads(payload)
+        self.requests += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        name = request["cmd"]["name"]
+        message = "version: 1.4.0" if name == "extapiversion" else f"{name} accepted"
+        for result_topic in (TOPIC_CONTROL_RESPONSE, TOPIC_CONTROL_RESULT):
+            self.broker.publish(
+                f"{self.prefix}/{result_topic}",
+                json.dumps(
+                    {"transId": request["transId"], "status": "ack", "msg": message}
+                ),
+            )
+
+
+@dataclass
+class ControlResult:
+    """Latency of service calls until acknowledged, in ms."""
+
+    service: str
+    hubs: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    calls_per_second: float
+
+
+async def setup_hub(hass, broker, n: int, delay: float) -> tuple[str, object]:
+    """Set up a config entry with a fake hub and return its device id and sensor."""
+    prefix = f"hub{n}"
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: f"Ferroamp {n}", CONF_PREFIX: prefix},
+        options={CONF_INTERVAL: 30},
+        version=1,
+        unique_id=prefix,
+    )
+    FakeEnergyHub(broker, prefix, delay)
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await broker.wait_subscribed(f"{prefix}/{TOPIC_CONTROL_RESPONSE}")
+
+    device_id = f"ferroamp_{n}_ehub"
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, device_id)})
+    sensor = hass.data[DOMAIN][DATA_DEVICES][prefix][device_id][f"{device_id}_last_cmd"]
+    return device.id, sensor
+
+
+async def call_until_acknowledged(hass, service, data, sensor) -> float:
+    """Call a service and return the seconds until its request is acknowledged."""
+    acknowledged = asyncio.Event()
+    trans_id = sensor.extra_state_attributes.get("transId")
+
+    @callback
+    def state_changed(event) -> None:
+        attributes = event.data["new_state"].attributes
+        if attributes.get("transId") != trans_id and attributes.get("status") == "ack":
+            acknowledged.set()
+
+    unsubscribe = async_track_state_change_event(hass, sensor.entity_id, state_changed)
+    try:
+        start = time.perf_counter()
+        await hass.services.async_call(DOMAIN, service, data, blocking=True)
+        async with asyncio.timeout(10):
+            await acknowledged.wait()
+        return time.perf_counter() - start
+    finally:
+        unsubscribe()
+
+
+@pytest.mark.parametrize("hubs", [1, 4])
+async def test_control_latency(hass, mqtt_live, hubs, request, record_property):
+    delay = request.config.getoption("--hub-delay")
+    targets = [await setup_hub(hass, mqtt_live, n, delay) for n in range(hubs)]
+
+    results = []
+    for service, data in SERVICES.items():
+        latencies = []
+        start = time.perf_counter()
+        for call in range(CALLS):
+            device_id, sensor = targets[call % hubs]
+            # The target is only required, and looked up, with several hubs
+            call_data = {**data, "target": device_id} if hubs > 1 else data
+            latencies.append(
+                await call_until_acknowledged(hass, service, call_data, sensor)
+            )
+        elapsed = time.perf_counter() - start
+        latencies_ms = sorted(latency * 1000 for latency in latencies)
+        results.append(
+            ControlResult(
+                service=service,
+                hubs=hubs,
+                p50_ms=statistics.median(latencies_ms),
+                p95_ms=latencies_ms[int(len(latencies_ms) * 0.95)],
+                max_ms=latencies_ms[-1],
+                calls_per_second=CALLS / elapsed,
+            )
+        )
+
+    print(f"\n{hubs} hubs, hub delay {delay * 1000:.0f} ms")
+    print("service     p50 ms  p95 ms  max ms  calls/s")
+    for result in results:
+        print(
+            f"{result.service:10} {result.p50_ms:7.1f} {result.p95_ms:7.1f} "
+            f"{result.max_ms:7.1f} {result.calls_per_second:8.1f}"
+        )
+        record_property(f"{result.service}_{hubs}", result.__dict__)
+
+    for result in results:
+        assert result.p50_ms >= delay * 1000
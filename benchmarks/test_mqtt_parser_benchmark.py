@@ -0,0 +1,80 @@
+"""Benchmarks for the MQTT parser hot functions."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.ferroamp.mqtt_parser import (
+    MqttMessageParser,
+    average_dc_link_values,
+    average_float_values,
+    average_int_values,
+    average_phase_values,
+    average_single_phase_values,
+    last_string_value,
+)
+
+from .payloads import EHUB_PAYLOAD, ESM_PAYLOAD, PAYLOADS, WINDOW_SIZES, events
+
+
+@pytest.mark.benchmark(group="parse_message")
+@pytest.mark.parametrize("topic", PAYLOADS.keys())
+def test_parse_message(benchmark, topic):
+    msg = MagicMock()
+    msg.payload = PAYLOADS[topic]
+    result = benchmark(MqttMessageParser.parse_message, msg)
+    assert result
+
+
+@pytest.mark.benchmark(group="get_phases")
+def test_get_phases(benchmark):
+    event = events(EHUB_PAYLOAD, 1)[0]
+    assert benchmark(MqttMessageParser.get_phases, event, "pext") is not None
+
+
+@pytest.mark.benchmark(group="get_dc_link")
+def test_get_dc_link(benchmark):
+    event = events(EHUB_PAYLOAD, 1)[0]
+    assert benchmark(MqttMessageParser.get_dc_link, event, "udc") is not None
+
+
+@pytest.mark.benchmark(group="average_float_values")
+@pytest.mark.parametrize("size", WINDOW_SIZES)
+def test_average_float_values(benchmark, size):
+    window = events(EHUB_PAYLOAD, size)
+    assert benchmark(average_float_values, window, "ppv") is not None
+
+
+@pytest.mark.benchmark(group="average_int_values")
+@pytest.mark.parametrize("size", WINDOW_SIZES)
+def test_average_int_values(benchmark, size):
+    window = events(EHUB_PAYLOAD, size)
+    assert benchmark(average_int_values, window, "state") is not None
+
+
+@pytest.mark.benchmark(group="average_phase_values")
+@pytest.mark.parametrize("size", WINDOW_SIZES)
+def test_average_phase_values(benchmark, size):
+    window = events(EHUB_PAYLOAD, size)
+    assert benchmark(average_phase_values, window, "pext") is not None
+
+
+@pytest.mark.benchmark(group="average_single_phase_values")
+@pytest.mark.parametrize("size", WINDOW_SIZES)
+def test_average_single_phase_values(benchmark, size):
+    window = events(EHUB_PAYLOAD, size)
+    assert benchmark(average_single_phase_values, window, "pext", "L1") is not None
+
+
+@pytest.mark.benchmark(group="average_dc_link_values")
+@pytest.mark.parametrize("size", WINDOW_SIZES)
+def test_average_dc_link_values(benchmark, size):
+    window = events(EHUB_PAYLOAD, size)
+    assert benchmark(average_dc_link_values, window, "udc") is not None
+
+
+@pytest.mark.benchmark(group="last_string_value")
+@pytest.mark.parametrize("size", WINDOW_SIZES)
+def test_last_string_value(benchmark, size):
+    window = events(ESM_PAYLOAD, size)
+    assert benchmark(last_string_value, window, "status") == "0"
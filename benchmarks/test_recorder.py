@@ -0,0 +1,133 @@
+"""Benchmark recorder write volume for different update intervals."""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder.db_schema import (
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+from sqlalchemy import func, text
+
+from custom_components.ferroamp.const import CONF_INTERVAL, DATA_DEVICES, DOMAIN
+
+from tests.generator import TrafficGenerator
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+DURATION = timedelta(hours=1)
+
+
+def database_bytes(session) -> int:
+    page_count = session.execute(text("PRAGMA page_count")).scalar()
+    page_size = session.execute(text("PRAGMA page_size")).scalar()
+    return page_count * page_size
+
+
+def write_volume(hass) -> tuple[dict[str, int], dict[str, set[str]], int]:
+    """Return state rows and attribute rows per entity and database size."""
+    with session_scope(hass=hass, read_only=True) as session:
+        states = dict(
+            session.query(StatesMeta.entity_id, func.count(States.state_id))
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id.like(f"sensor.{DOMAIN}_%"))
+            .group_by(StatesMeta.entity_id)
+            .all()
+        )
+        attributes: dict[str, set[str]] = defaultdict(set)
+        for entity_id, shared_attrs in (
+            session.query(StatesMeta.entity_id, StateAttributes.shared_attrs)
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .join(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .filter(StatesMeta.entity_id.like(f"sensor.{DOMAIN}_%"))
+            .distinct()
+        ):
+            attributes[entity_id].add(shared_attrs)
+        return states, attributes, database_bytes(session)
+
+
+@pytest.mark.parametrize("interval", [5, 30, 300])
+async def test_recorder_write_volume(
+    recorder_mock, hass, mqtt_mock, freezer, interval, record_property
+):
+    generator = TrafficGenerator(sso_count=2, eso_count=1, esm_count=1)
+    freezer.move_to(generator.now)
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: interval},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await async_wait_recording_done(hass)
+    _, _, initial_bytes = await recorder.get_instance(hass).async_add_executor_job(
+        write_volume, hass
+    )
+
+    for message in generator.messages(DURATION):
+        freezer.move_to(message.at)
+        async_fire_mqtt_message(hass, message.topic, message.payload)
+    await async_wait_recording_done(hass)
+
+    states, attributes, total_bytes = await recorder.get_instance(
+        hass
+    ).async_add_executor_job(write_volume, hass)
+
+    sensor_classes = {
+        sensor.entity_id: type(sensor).__name__
+        for store in hass.data[DOMAIN][DATA_DEVICES]["ferroamp"].values()
+        for sensor in store.values()
+    }
+    by_class: dict[str, dict[str, int]] = defaultdict(
+        lambda: {"states": 0, "attribute_rows": 0, "attribute_bytes": 0}
+    )
+    for entity_id, count in states.items():
+        summary = by_class[sensor_classes.get(entity_id, "other")]
+        summary["states"] += count
+        summary["attribute_rows"] += len(attributes[entity_id])
+        summary["attribute_bytes"] += sum(map(len, attributes[entity_id]))
+
+    result = {
+        "interval": interval,
+        "state_rows": sum(states.values()),
+        "attribute_rows": sum(map(len, attributes.values())),
+        "attribute_bytes": sum(
+            len(attrs) for values in attributes.values() for attrs in values
+        ),
+        "database_bytes": total_bytes - initial_bytes,
+        "sensor_classes": dict(sorted(by_class.items())),
+    }
+    record_property("write_volume", result)
+    print(
+        f"\ninterval {interval} s: {result['state_rows']} state rows, "
+        f"{result['attribute_rows']} attribute rows "
+        f"({result['attribute_bytes']} bytes), "
+        f"database grew {result['database_bytes']} bytes"
+    )
+    for name, summary in result["sensor_classes"].items():
+        print(
+            f"  {name:32} {summary['states']:6d} states "
+            f"{summary['attribute_rows']:6d} attribute rows "
+            f"{summary['attribute_bytes']:8d} bytes"
+        )
+
+    # Sensors write at most once per interval, plus the first write
+    assert result["state_rows"] <= len(states) * (
+        DURATION.total_seconds() / interval + 2
+    )
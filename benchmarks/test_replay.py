@@ -0,0 +1,110 @@
+"""Replay captured or generated traffic through the sensor platform."""
+
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+import json
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ferroamp.const import CONF_INTERVAL, DOMAIN
+from custom_components.ferroamp.mqtt_parser import convert_to_kwh
+
+from .capture import CapturedMessage, read_capture, write_capture
+from .replay import async_replay
+
+from tests.generator import TrafficGenerator
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+INTERVAL = 30
+
+
+def generated_capture(path, duration):
+    generator = TrafficGenerator(sso_count=4, eso_count=2, esm_count=2)
+    start = generator.now
+    write_capture(
+        path,
+        (
+            CapturedMessage(
+                (message.at - start).total_seconds(),
+                message.topic.removeprefix("extapi/"),
+                message.payload,
+            )
+            for message in generator.messages(duration)
+        ),
+        started=start,
+    )
+
+
+def recent_energy(messages, window):
+    """Return the ESO battery energy consumed in the last `window` s in kWh."""
+    recent = defaultdict(deque)
+    last = 0.0
+    for message in messages:
+        last = message.offset
+        if message.topic != "data/eso":
+            continue
+        payload = json.loads(message.payload)
+        if "wbatcons" in payload:
+            values = recent[payload["id"]["val"]]
+            values.append((message.offset, float(payload["wbatcons"]["val"])))
+            while values[0][0] < last - window:
+                values.popleft()
+    return {
+        eso: [
+            convert_to_kwh(value) for offset, value in values if offset >= last - window
+        ]
+        for eso, values in recent.items()
+    }
+
+
+async def test_replay(hass, mqtt_mock, freezer, request, tmp_path):
+    path = request.config.getoption("--replay")
+    if path is None:
+        path = str(tmp_path / "generated.jsonl.gz")
+        generated_capture(path, timedelta(minutes=10))
+    header, messages = read_capture(path)
+    freezer.move_to(datetime.fromisoformat(header["started"]))
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: INTERVAL},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = await async_replay(
+        hass,
+        messages,
+        speed=request.config.getoption("--replay-speed"),
+        freezer=freezer,
+    )
+    report = result.as_dict()
+    print(
+        f"\nReplayed {result.messages} messages captured over {result.span:.0f} s "
+        f"in {result.wall:.2f} s: {result.throughput:.0f} msg/s, "
+        f"{result.cpu_per_message_us:.0f} µs CPU/msg, "
+        f"{len(result.states)} sensors"
+    )
+    if report_path := request.config.getoption("--replay-report"):
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump({"capture": header, **report}, file, indent=2, default=str)
+
+    assert result.messages > 0
+    assert result.states
+    # Energy counters are the average of the last flushed window, which ends at
+    # most an interval and a message period before the end of the capture
+    _, messages = read_capture(path)
+    recent = recent_energy(messages, 3 * INTERVAL)
+    assert recent
+    for eso, values in recent.items():
+        if not values:
+            continue
+        state = result.states[f"sensor.ferroamp_eso_{eso}_total_energy_consumed"]
+        assert min(values) <= float(state["state"]) <= max(values)
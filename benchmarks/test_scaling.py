@@ -0,0 +1,121 @@
+"""Benchmark how sensor platform cost scales with the number of devices."""
+
+from dataclasses import dataclass
+from datetime import timedelta
+import json
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.ferroamp.const import CONF_INTERVAL, DOMAIN
+
+from .clock import perf_counter
+
+from tests.generator import TrafficGenerator
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+# Number of SSOs, ESOs and ESMs introduced at each scale
+SCALES = [1, 10, 50, 200]
+
+# Rounds of messages from every device for the steady state measurement
+ROUNDS = 5
+
+INTERVAL = 30
+
+
+@dataclass
+class ScaleResult:
+    """Cost in µs per device or message at one scale."""
+
+    devices: int
+    discovery_us: float
+    steady_us: float
+    flush_us: float
+
+
+def device_messages(generator: TrafficGenerator, prefix: str) -> list[tuple]:
+    """Return one message from every SSO, ESO and ESM of the generator."""
+    return (
+        [(f"{prefix}/data/sso", generator.sso_payload(sso)) for sso in generator.ssos]
+        + [(f"{prefix}/data/eso", generator.eso_payload(e)) for e in generator.esos]
+        + [(f"{prefix}/data/esm", generator.esm_payload(e)) for e in generator.esm_ids]
+    )
+
+
+async def fire(hass, messages) -> float:
+    """Fire messages and wait for Home Assistant, returning elapsed µs."""
+    payloads = [(topic, json.dumps(payload)) for topic, payload in messages]
+    start = perf_counter()
+    for topic, payload in payloads:
+        async_fire_mqtt_message(hass, topic, payload)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return (perf_counter() - start) * 1e6
+
+
+async def measure_scale(hass, freezer, devices: int) -> ScaleResult:
+    prefix = f"scale{devices}"
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: f"Ferroamp {devices}", CONF_PREFIX: prefix},
+        options={CONF_INTERVAL: INTERVAL},
+        version=1,
+        unique_id=prefix,
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    generator = TrafficGenerator(
+        prefix=prefix, sso_count=devices, eso_count=devices, esm_count=devices
+    )
+    count = 3 * devices
+
+    # First message from each device creates its sensors and entities
+    discovery = await fire(hass, device_messages(generator, prefix))
+
+    # Within the interval messages are only buffered by the sensors
+    steady = 0.0
+    for _ in range(ROUNDS):
+        generator.advance(5)
+        steady += await fire(hass, device_messages(generator, prefix))
+
+    # Once the interval has passed the next message flushes each sensor
+    freezer.tick(timedelta(seconds=INTERVAL + 1))
+    generator.advance(INTERVAL + 1)
+    flush = await fire(hass, device_messages(generator, prefix))
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    return ScaleResult(
+        devices=devices,
+        discovery_us=discovery / count,
+        steady_us=steady / (ROUNDS * count),
+        flush_us=flush / count,
+    )
+
+
+async def test_device_scaling(hass, mqtt_mock, freezer, record_property):
+    results = [await measure_scale(hass, freezer, devices) for devices in SCALES]
+
+    print("\ndevices  discovery µs/device  steady µs/msg  flush µs/msg")
+    for result in results:
+        print(
+            f"{result.devices:7d} {result.discovery_us:20.0f} "
+            f"{result.steady_us:14.1f} {result.flush_us:13.1f}"
+        )
+        record_property(f"devices_{result.devices}", result.__dict__)
+
+    # Cost per device and per message stays flat when cost grows linearly.
+    # The smallest scale is dominated by fixed overhead and is not compared.
+    reference, largest = results[1], results[-1]
+    # Costs of 0 mean the measurement used the frozen clock
+    assert reference.discovery_us > 0
+    assert reference.steady_us > 0
+    assert reference.flush_us > 0
+    assert largest.discovery_us <= reference.discovery_us * 3
+    assert largest.steady_us <= reference.steady_us * 3
+    assert largest.flush_us <= reference.flush_us * 3
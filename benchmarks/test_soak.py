@@ -0,0 +1,145 @@
+"""Soak test driving the sensor platform with days of simulated traffic."""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+import statistics
+import tracemalloc
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+from homeassistant.helpers import entity_registry
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.ferroamp.const import (
+    CONF_INTERVAL,
+    DATA_DEVICES,
+    DOMAIN,
+    MAX_PENDING_EVENTS,
+)
+
+from .clock import perf_counter
+
+from tests.generator import TrafficGenerator
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+# Simulated time between memory and latency samples
+SAMPLE_PERIOD = timedelta(hours=1)
+
+# Latencies are compared per topic, as the mix changes when SSOs stop reporting
+TOPICS = ("data/ehub", "data/sso", "data/eso", "data/esm")
+
+# Entities disabled before the first message, they must not buffer events
+DISABLED = {
+    "ferroamp_ehub-ul": "ferroamp_external_voltage",
+    "ferroamp_ehub-pext": "ferroamp_external_power",
+    "ferroamp_sso_PS00990-A04-S20120000-upv": "ferroamp_sso_20120000_pv_string_voltage",
+}
+
+
+@dataclass
+class Sample:
+    """Memory and latency measured over one sample period."""
+
+    hours: float
+    memory: int
+    latency_p50_us: dict[str, float]
+    latency_max_us: float
+    max_events: int
+
+
+def max_buffered_events(hass) -> int:
+    return max(
+        len(getattr(sensor, "events", ()))
+        for store in hass.data[DOMAIN][DATA_DEVICES]["ferroamp"].values()
+        for sensor in store.values()
+    )
+
+
+async def test_soak(hass, mqtt_mock, freezer, request):
+    days = request.config.getoption("--soak-days")
+    generator = TrafficGenerator(sso_count=4, eso_count=2, esm_count=2)
+    freezer.move_to(generator.now)
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 30},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    er = entity_registry.async_get(hass)
+    for unique_id, object_id in DISABLED.items():
+        er.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            unique_id,
+            config_entry=config_entry,
+            suggested_object_id=object_id,
+            disabled_by=entity_registry.RegistryEntryDisabler.USER,
+        )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    periods = int(timedelta(days=days) / SAMPLE_PERIOD)
+    samples: list[Sample] = []
+    tracemalloc.start()
+    try:
+        for period in range(periods):
+            if period == periods // 2:
+                # Half of the SSOs stop reporting, as when optimizers are replaced
+                generator.ssos = generator.ssos[: len(generator.ssos) // 2]
+            latencies = defaultdict(list)
+            for message in generator.messages(SAMPLE_PERIOD):
+                freezer.move_to(message.at)
+                start = perf_counter()
+                async_fire_mqtt_message(hass, message.topic, message.payload)
+                latencies[message.topic.removeprefix("extapi/")].append(
+                    (perf_counter() - start) * 1e6
+                )
+            await hass.async_block_till_done(wait_background_tasks=True)
+            # The mocked MQTT client records every message it was handed
+            mqtt_mock.reset_mock()
+            samples.append(
+                Sample(
+                    hours=(period + 1) * SAMPLE_PERIOD / timedelta(hours=1),
+                    memory=tracemalloc.get_traced_memory()[0],
+                    latency_p50_us={
+                        topic: statistics.median(latencies[topic]) for topic in TOPICS
+                    },
+                    latency_max_us=max(max(values) for values in latencies.values()),
+                    max_events=max_buffered_events(hass),
+                )
+            )
+    finally:
+        tracemalloc.stop()
+
+    print("\n  hours    memory  p50 µs ehub/sso/eso/esm  max µs  events")
+    for sample in samples:
+        p50 = "/".join(f"{sample.latency_p50_us[topic]:.0f}" for topic in TOPICS)
+        print(
+            f"{sample.hours:7.1f} {sample.memory:9d} {p50:>23} "
+            f"{sample.latency_max_us:7.0f} {sample.max_events:7d}"
+        )
+
+    for object_id in DISABLED.values():
+        assert hass.states.get(f"sensor.{object_id}") is None
+    # Sensors that are added flush every 30 s, disabled sensors are capped
+    assert all(sample.max_events <= MAX_PENDING_EVENTS for sample in samples)
+
+    # Compare the last quarter with the second, after startup allocations
+    baseline = samples[len(samples) // 4 :][: max(len(samples) // 4, 1)]
+    final = samples[-max(len(samples) // 4, 1) :]
+    baseline_memory = max(sample.memory for sample in baseline)
+    assert max(sample.memory for sample in final) <= baseline_memory * 1.1 + 2**20
+    for topic in TOPICS:
+        # Latencies of 0 mean the measurement used the frozen clock
+        assert all(sample.latency_p50_us[topic] > 0 for sample in samples)
+        baseline_latency = statistics.median(s.latency_p50_us[topic] for s in baseline)
+        final_latency = statistics.median(s.latency_p50_us[topic] for s in final)
+        assert final_latency <= baseline_latency * 1.5, topic
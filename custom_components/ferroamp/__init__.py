@@ -2,19 +2,38 @@
 
 import json
 import logging
+import time
 import uuid
 
 from homeassistant import config_entries, core
 from homeassistant.components import mqtt
 from homeassistant.const import CONF_NAME, CONF_PREFIX
+from homeassistant.core import ServiceResponse, SupportsResponse
 from homeassistant.helpers import device_registry as dr
 from homeassistant.util import slugify
 
-from .const import DATA_DEVICES, DATA_LISTENERS, DATA_PREFIXES, DOMAIN, PLATFORMS
+from .const import (
+    DATA_BACKPRESSURE,
+    DATA_CADENCE,
+    DATA_DECIMATORS,
+    DATA_DEVICES,
+    DATA_LISTENERS,
+    DATA_PAYLOADS,
+    DATA_PREFIXES,
+    DATA_SETUP_TIMES,
+    DATA_TIMELINES,
+    DATA_TRACES,
+    DATA_WRITE_STATS,
+    DOMAIN,
+    PLATFORMS,
+)
+from .memory import memory_report, set_tracing
+from .timeline import StartupTimeline
 
 CONTROL_REQUEST = "control/request"
 ATTR_POWER = "power"
 ATTR_TARGET = "target"
+ATTR_TRACING = "tracing"
 DEFAULT_POWER = 1000
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,6 +44,13 @@ async def async_setup_entry(
 ) -> bool:
     """Set up integration from ConfigEntry."""
     hass.data.setdefault(DOMAIN, {})
+    setup_started, mqtt_ready = hass.data[DOMAIN].get(DATA_SETUP_TIMES, (None, None))
+    timeline = StartupTimeline(setup_started)
+    if setup_started is not None:
+        timeline.mark("setup", at=setup_started)
+        timeline.mark("mqtt_ready", at=mqtt_ready)
+    timeline.mark("setup_entry")
+    hass.data[DOMAIN].setdefault(DATA_TIMELINES, {})[entry.unique_id] = timeline
     hass.data[DOMAIN][entry.unique_id] = entry.data
     hass.data[DOMAIN].setdefault(DATA_PREFIXES, {})
     hass.data[DOMAIN][DATA_PREFIXES][slugify(entry.data[CONF_NAME])] = entry.data[
@@ -50,11 +76,19 @@ async def async_unload_entry(
         hass.data[DOMAIN][DATA_DEVICES].pop(entry.unique_id)
         hass.data[DOMAIN][DATA_PREFIXES].pop(slugify(entry.data[CONF_NAME]))
         hass.data[DOMAIN][DATA_LISTENERS].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_BACKPRESSURE].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_CADENCE].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_DECIMATORS].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_PAYLOADS].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_TRACES].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_WRITE_STATS].pop(entry.unique_id)
+        hass.data[DOMAIN][DATA_TIMELINES].pop(entry.unique_id)
         hass.data[DOMAIN].pop(entry.unique_id)
     return unload_ok
 
 
 async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
+    setup_started = time.monotonic()
     # Make sure MQTT is available and the entry component is loaded
     entries = hass.config_entries.async_entries(mqtt.DOMAIN)
     if len(entries) == 0:
@@ -70,6 +104,7 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
 
     _LOGGER.debug("Setting up ferroamp battery service calls")
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][DATA_SETUP_TIMES] = (setup_started, time.monotonic())
     device_registry = dr.async_get(hass)
 
     async def control_request(cmd_name, target, power=None):
@@ -124,6 +159,31 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
 
     hass.services.async_register(DOMAIN, "charge", charge_battery)
     hass.services.async_register(DOMAIN, "discharge", discharge_battery)
+
+    async def dump_trace(call) -> ServiceResponse:
+        return {
+            config_id: trace.as_list()
+            for config_id, trace in hass.data[DOMAIN].get(DATA_TRACES, {}).items()
+        }
+
+    async def report_memory(call) -> ServiceResponse:
+        tracing = call.data.get(ATTR_TRACING)
+        if tracing is not None:
+            set_tracing(tracing)
+        return {
+            config_id: memory_report(stores)
+            for config_id, stores in hass.data[DOMAIN].get(DATA_DEVICES, {}).items()
+        }
+
     hass.services.async_register(DOMAIN, "autocharge", autocharge_battery)
+    hass.services.async_register(
+        DOMAIN, "dump_trace", dump_trace, supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "memory_report",
+        report_memory,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     return True
@@ -0,0 +1,77 @@
+"""Detection of event loop overload from the lag of Ferroamp messages."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Seconds the baseline lag rises per second, so a clock step on the EnergyHub
+# is absorbed within minutes while a growing backlog is still detected
+BASELINE_RISE = 0.01
+
+
+class BackpressureMonitor:
+    """Track the lag of messages and whether processing should be degraded.
+
+    The lag is the receive time minus the payload timestamp. The smallest lag
+    seen is the baseline, which absorbs the offset between the clocks of Home
+    Assistant and the EnergyHub. Processing is degraded once the lag exceeds
+    the baseline by more than the threshold, and recovers once it is back
+    within half the threshold.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.baseline: float | None = None
+        self.lag: float | None = None
+        self.degraded_since: float | None = None
+        self.degraded_seconds = 0.0
+        self.episodes = 0
+        self.coalesced = 0
+        self._updated: float | None = None
+
+    @property
+    def degraded(self) -> bool:
+        """Return True while processing is degraded."""
+        return self.degraded_since is not None
+
+    def update(self, lag: float, threshold: float, now: float) -> bool:
+        """Update with the lag of a message and return True if degraded.
+
+        Args:
+            lag: Receive time minus payload timestamp in seconds.
+            threshold: Lag above the baseline that degrades processing.
+            now: Monotonic receive time in seconds.
+        """
+        if self.baseline is None or self._updated is None:
+            self.baseline = lag
+        else:
+            self.baseline = min(
+                lag, self.baseline + BASELINE_RISE * (now - self._updated)
+            )
+        self._updated = now
+        self.lag = lag
+        excess = lag - self.baseline
+        if self.degraded_since is None:
+            if excess > threshold:
+                self.degraded_since = now
+                self.episodes += 1
+        elif excess < threshold / 2:
+            self.degraded_seconds += now - self.degraded_since
+            self.degraded_since = None
+        return self.degraded
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the state of the monitor, counting degraded time until now."""
+        degraded_seconds = self.degraded_seconds
+        if self.degraded_since is not None:
+            degraded_seconds += now - self.degraded_since
+        return {
+            "degraded": self.degraded,
+            "episodes": self.episodes,
+            "degraded_seconds": round(degraded_seconds, 3),
+            "coalesced": self.coalesced,
+            "lag_last": round(self.lag, 3) if self.lag is not None else None,
+            "lag_baseline": (
+                round(self.baseline, 3) if self.baseline is not None else None
+            ),
+        }
@@ -0,0 +1,135 @@
+"""Message cadence and gap monitoring for Ferroamp MQTT topics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .const import TOPIC_INTERVALS
+from .mqtt_parser import MqttEvent, MqttMessageParser
+
+# A gap is counted as missed messages once it exceeds this many nominal intervals
+MISSED_GAP_FACTOR = 1.5
+
+
+@dataclass
+class CadenceStats:
+    """Arrival statistics for a single topic and device."""
+
+    expected: float
+    count: int = 0
+    missed: int = 0
+    last_received: datetime | None = None
+    last_ts: datetime | None = None
+    jitter_total: float = 0.0
+    jitter_max: float = 0.0
+    jitter_count: int = 0
+    lag_last: float | None = None
+    lag_total: float = 0.0
+    lag_max: float | None = None
+    lag_count: int = 0
+
+    def record(self, received: datetime, ts: datetime | None) -> None:
+        """Record a message received at `received` with device timestamp `ts`.
+
+        Args:
+            received: Local receive time (aware, UTC).
+            ts: Timestamp from the payload, or None if not present.
+        """
+        self.count += 1
+        if self.last_received is not None:
+            arrival = (received - self.last_received).total_seconds()
+            jitter = abs(arrival - self.expected)
+            self.jitter_total += jitter
+            self.jitter_count += 1
+            if jitter > self.jitter_max:
+                self.jitter_max = jitter
+        if ts is not None:
+            if self.last_ts is not None:
+                gap = (ts - self.last_ts).total_seconds()
+                if gap > self.expected * MISSED_GAP_FACTOR:
+                    self.missed += round(gap / self.expected) - 1
+            lag = (received - ts).total_seconds()
+            self.lag_last = lag
+            self.lag_total += lag
+            self.lag_count += 1
+            if self.lag_max is None or lag > self.lag_max:
+                self.lag_max = lag
+            self.last_ts = ts
+        self.last_received = received
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return statistics as a JSON serializable dictionary."""
+        return {
+            "expected_interval": self.expected,
+            "count": self.count,
+            "missed": self.missed,
+            "last_received": (
+                self.last_received.isoformat() if self.last_received else None
+            ),
+            "last_ts": self.last_ts.isoformat() if self.last_ts else None,
+            "jitter_avg": (
+                round(self.jitter_total / self.jitter_count, 3)
+                if self.jitter_count
+                else None
+            ),
+            "jitter_max": round(self.jitter_max, 3),
+            "bridge_lag_last": (
+                round(self.lag_last, 3) if self.lag_last is not None else None
+            ),
+            "bridge_lag_avg": (
+                round(self.lag_total / self.lag_count, 3) if self.lag_count else None
+            ),
+            "bridge_lag_max": (
+                round(self.lag_max, 3) if self.lag_max is not None else None
+            ),
+        }
+
+
+class CadenceTracker:
+    """Track inter-arrival jitter, missed messages and bridge lag per device."""
+
+    def __init__(self, intervals: dict[str, float] | None = None) -> None:
+        """Initialize the tracker with nominal intervals per topic."""
+        self._intervals = intervals if intervals is not None else TOPIC_INTERVALS
+        self._stats: dict[str, dict[str, CadenceStats]] = {}
+
+    def record(
+        self,
+        topic: str,
+        device_id: str,
+        event: MqttEvent,
+        received: datetime,
+        factor: int = 1,
+    ) -> None:
+        """Record a received message.
+
+        Args:
+            topic: The topic the message arrived on (without prefix).
+            device_id: ID of the device that sent the message.
+            event: The parsed MQTT event.
+            received: Local receive time (aware, UTC).
+            factor: Nominal intervals between recorded messages, more than 1
+                when messages of the topic are decimated.
+        """
+        devices = self._stats.get(topic)
+        if devices is None:
+            devices = self._stats[topic] = {}
+        expected = self._intervals.get(topic, 1) * factor
+        stats = devices.get(device_id)
+        if stats is None:
+            stats = devices[device_id] = CadenceStats(expected)
+        stats.expected = expected
+        stats.record(received, MqttMessageParser.get_timestamp(event))
+
+    def get(self, topic: str, device_id: str) -> CadenceStats | None:
+        """Get statistics for a topic and device, if any were recorded."""
+        return self._stats.get(topic, {}).get(device_id)
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return all statistics grouped by topic and device."""
+        return {
+            topic: {device_id: stats.as_dict() for device_id, stats in devices.items()}
+            for topic, devices in self._stats.items()
+        }
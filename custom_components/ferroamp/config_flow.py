@@ -3,11 +3,66 @@ from typing import Any, Dict, Optional
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME, CONF_PREFIX
 from homeassistant.core import callback
+from homeassistant.data_entry_flow import section
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import slugify
 import voluptuous as vol
 
-from .const import CONF_INTERVAL, DOMAIN, MANUFACTURER
+from .const import (
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ALIGNED_WINDOWS,
+    CONF_BACKPRESSURE,
+    CONF_BACKPRESSURE_LAG,
+    CONF_DIAGNOSTIC_ATTRIBUTES,
+    CONF_HEARTBEAT,
+    CONF_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_SKIP_UNCHANGED,
+    CONF_STAGGERED_FLUSH,
+    DEADBAND_OPTIONS,
+    DECIMATION_OPTIONS,
+    DOMAIN,
+    INTERVAL_OPTIONS,
+    MANUFACTURER,
+)
+
+# Intervals and counts must be at least 1, they are left blank for the default
+NONZERO_INT = vol.All(vol.Coerce(int), vol.Range(min=1))
+DEADBAND = vol.All(vol.Coerce(float), vol.Range(min=0))
+
+# Optional fields of the options form by collapsed section
+OPTION_SECTIONS: Dict[str, Dict[str, Any]] = {
+    "intervals": {
+        **{key: NONZERO_INT for key in INTERVAL_OPTIONS.values()},
+        CONF_ALIGNED_WINDOWS: cv.boolean,
+        CONF_STAGGERED_FLUSH: cv.boolean,
+        CONF_ADAPTIVE_INTERVAL: cv.boolean,
+        CONF_ADAPTIVE_MIN_INTERVAL: NONZERO_INT,
+        CONF_ADAPTIVE_MAX_INTERVAL: NONZERO_INT,
+    },
+    "deadbands": {
+        **{
+            key: DEADBAND
+            for absolute, relative in DEADBAND_OPTIONS.values()
+            for key in (absolute, relative)
+        },
+        CONF_HEARTBEAT: NONZERO_INT,
+    },
+    "performance": {
+        CONF_SKIP_UNCHANGED: cv.boolean,
+        **{every: NONZERO_INT for every, _ in DECIMATION_OPTIONS.values()},
+        # Period 0 means no minimum period between processed messages
+        **{period: cv.positive_int for _, period in DECIMATION_OPTIONS.values()},
+        CONF_BACKPRESSURE: cv.boolean,
+        CONF_BACKPRESSURE_LAG: NONZERO_INT,
+    },
+    "recording": {
+        CONF_LONG_TERM_STATISTICS: cv.boolean,
+        CONF_DIAGNOSTIC_ATTRIBUTES: cv.boolean,
+    },
+}
 
 TOPIC_SCHEMA = vol.Schema(
     {
@@ -49,21 +104,42 @@ class FerroampOptionsFlowHandler(config_entries.OptionsFlow):
         errors: Dict[str, str] = {}
         if user_input is not None:
             if not errors:
-                return self.async_create_entry(title="", data=user_input)
+                # Options are stored flat, sections only group the form
+                data: Dict[str, Any] = {}
+                for key, value in user_input.items():
+                    if key in OPTION_SECTIONS:
+                        data.update(value)
+                    else:
+                        data[key] = value
+                return self.async_create_entry(title="", data=data)
 
         interval = self.config_entry.options.get(CONF_INTERVAL)
         if interval is None or interval == 0:
             interval = 30
 
+        options = self.config_entry.options
+        schema: Dict[Any, Any] = {
+            vol.Required(
+                CONF_INTERVAL,
+                default=interval,
+            ): NONZERO_INT,
+        }
+        for key, fields in OPTION_SECTIONS.items():
+            schema[vol.Optional(key)] = section(
+                vol.Schema(
+                    {
+                        vol.Optional(
+                            field,
+                            description={"suggested_value": options.get(field)},
+                        ): validator
+                        for field, validator in fields.items()
+                    }
+                ),
+                {"collapsed": True},
+            )
+
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(
-                        CONF_INTERVAL,
-                        default=interval,
-                    ): cv.positive_int,
-                }
-            ),
+            data_schema=vol.Schema(schema),
             errors=errors,
         )
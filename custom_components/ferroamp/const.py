@@ -2,10 +2,29 @@
 
 import re
 
+CONF_ADAPTIVE_INTERVAL = "adaptive_interval"
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+CONF_ALIGNED_WINDOWS = "aligned_windows"
+CONF_BACKPRESSURE = "backpressure"
+CONF_BACKPRESSURE_LAG = "backpressure_lag"
+CONF_DIAGNOSTIC_ATTRIBUTES = "diagnostic_attributes"
+CONF_HEARTBEAT = "heartbeat"
 CONF_INTERVAL = "interval"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_SKIP_UNCHANGED = "skip_unchanged"
+CONF_STAGGERED_FLUSH = "staggered_flush"
+DATA_BACKPRESSURE = "backpressure"
+DATA_CADENCE = "cadence"
+DATA_DECIMATORS = "decimators"
 DATA_DEVICES = "devices"
 DATA_LISTENERS = "listeners"
+DATA_PAYLOADS = "payloads"
 DATA_PREFIXES = "prefixes"
+DATA_SETUP_TIMES = "setup_times"
+DATA_TIMELINES = "timelines"
+DATA_TRACES = "traces"
+DATA_WRITE_STATS = "write_stats"
 DOMAIN = "ferroamp"
 MANUFACTURER = "Ferroamp"
 
@@ -17,6 +36,51 @@ TOPIC_CONTROL_REQUEST = "control/request"
 TOPIC_CONTROL_RESPONSE = "control/response"
 TOPIC_CONTROL_RESULT = "control/result"
 
+# Nominal publish interval in seconds for each data topic
+TOPIC_INTERVALS = {
+    TOPIC_EHUB: 1,
+    TOPIC_SSO: 5,
+    TOPIC_ESO: 5,
+    TOPIC_ESM: 60,
+}
+
+# Topics that can be decimated, with options to process only every Nth message
+# and at most one message per period in seconds. Topics shared by several
+# devices are not decimated, dropping their messages could starve a device.
+DECIMATION_OPTIONS = {TOPIC_EHUB: ("ehub_every", "ehub_min_period")}
+
+# Seconds the lag of EnergyHub messages may exceed its baseline before only
+# energy and power sensors without phases are updated, from the newest message
+DEFAULT_BACKPRESSURE_LAG = 3
+
+# Events buffered by a sensor that is not added to Home Assistant yet. Disabled
+# entities are never added, so their buffer is trimmed to this size.
+MAX_PENDING_EVENTS = 100
+
+# Sensor categories with a deadband. A state is only written when it changed
+# more than the absolute band, in the unit of the sensor, and the relative band,
+# in percent of the last written state, or when heartbeat seconds have passed.
+DEADBAND_CATEGORIES = ["voltage", "current", "power", "temperature", "percentage"]
+DEADBAND_OPTIONS = {
+    category: (f"{category}_deadband", f"{category}_deadband_percent")
+    for category in DEADBAND_CATEGORIES
+}
+DEFAULT_HEARTBEAT = 300
+
+# Adaptive update interval in seconds. A sensor updates at the shortest interval
+# when its samples vary by more than the relative volatility, and its interval
+# doubles after every update while its value is flat, up to the longest.
+ADAPTIVE_VOLATILITY = 0.05
+DEFAULT_ADAPTIVE_MIN_INTERVAL = 5
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 300
+
+# Sensor categories with their own update interval, CONF_INTERVAL applies to
+# sensors in a category without one and to sensors without a category
+INTERVAL_CATEGORIES = ["power", "voltage", "energy", "temperature", "battery"]
+INTERVAL_OPTIONS = {
+    category: f"{category}_interval" for category in INTERVAL_CATEGORIES
+}
+
 PLATFORMS = ["sensor"]
 
 EHUB = "ehub"
@@ -0,0 +1,58 @@
+"""Decimation of high-rate Ferroamp MQTT topics."""
+
+from __future__ import annotations
+
+import math
+
+
+class Decimator:
+    """Drop messages of a topic so that only some of them are processed.
+
+    Every Nth message of a topic is kept, and of those at most one per period.
+    Messages are dropped on arrival, before they are decoded.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the decimator."""
+        self._received: dict[str, int] = {}
+        self._accepted_at: dict[str, float] = {}
+        self.skipped: dict[str, int] = {}
+
+    def accept(self, topic: str, every: int, period: float, now: float) -> bool:
+        """Check if a message received on topic should be processed.
+
+        Args:
+            topic: The topic the message arrived on (without prefix).
+            every: Process only every Nth message, all messages if 1 or less.
+            period: Minimum seconds between processed messages, none if 0.
+            now: Monotonic receive time in seconds.
+
+        Returns:
+            True if the message should be processed, False if it is dropped.
+        """
+        received = self._received.get(topic, 0)
+        self._received[topic] = received + 1
+        accepted_at = self._accepted_at.get(topic)
+        if (every > 1 and received % every != 0) or (
+            period > 0 and accepted_at is not None and now - accepted_at < period
+        ):
+            self.skipped[topic] = self.skipped.get(topic, 0) + 1
+            return False
+        self._accepted_at[topic] = now
+        return True
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the number of messages dropped per topic."""
+        return dict(self.skipped)
+
+
+def decimation_factor(interval: float, every: int, period: float) -> int:
+    """Return the nominal intervals between processed messages of a topic.
+
+    Args:
+        interval: Nominal seconds between messages of the topic.
+        every: Process only every Nth message, all messages if 1 or less.
+        period: Minimum seconds between processed messages, none if 0.
+    """
+    every = max(every, 1)
+    return every * max(math.ceil(period / (interval * every)), 1)
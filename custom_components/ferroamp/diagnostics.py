@@ -0,0 +1,76 @@
+"""Diagnostics support for Ferroamp."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant import config_entries, core
+
+from .backpressure import BackpressureMonitor
+from .cadence import CadenceTracker
+from .const import (
+    DATA_BACKPRESSURE,
+    DATA_CADENCE,
+    DATA_DECIMATORS,
+    DATA_DEVICES,
+    DATA_PAYLOADS,
+    DATA_TIMELINES,
+    DATA_TRACES,
+    DATA_WRITE_STATS,
+    DOMAIN,
+)
+from .decimation import Decimator
+from .memory import memory_report
+from .payload_cache import PayloadCache
+from .timeline import StartupTimeline
+from .tracing import TraceRecorder
+from .write_stats import WriteStats
+
+
+async def async_get_config_entry_diagnostics(
+    hass: core.HomeAssistant, entry: config_entries.ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    cadence: CadenceTracker | None = (
+        hass.data[DOMAIN].get(DATA_CADENCE, {}).get(entry.unique_id)
+    )
+    trace: TraceRecorder | None = (
+        hass.data[DOMAIN].get(DATA_TRACES, {}).get(entry.unique_id)
+    )
+    write_stats: WriteStats | None = (
+        hass.data[DOMAIN].get(DATA_WRITE_STATS, {}).get(entry.unique_id)
+    )
+    backpressure: BackpressureMonitor | None = (
+        hass.data[DOMAIN].get(DATA_BACKPRESSURE, {}).get(entry.unique_id)
+    )
+    decimator: Decimator | None = (
+        hass.data[DOMAIN].get(DATA_DECIMATORS, {}).get(entry.unique_id)
+    )
+    payloads: PayloadCache | None = (
+        hass.data[DOMAIN].get(DATA_PAYLOADS, {}).get(entry.unique_id)
+    )
+    timeline: StartupTimeline | None = (
+        hass.data[DOMAIN].get(DATA_TIMELINES, {}).get(entry.unique_id)
+    )
+    devices = hass.data[DOMAIN].get(DATA_DEVICES, {}).get(entry.unique_id, {})
+    return {
+        "timeline": timeline.as_list() if timeline is not None else [],
+        "cadence": cadence.as_dict() if cadence is not None else {},
+        "trace": trace.as_list() if trace is not None else [],
+        "writes": (
+            write_stats.as_dict(time.monotonic()) if write_stats is not None else {}
+        ),
+        "backpressure": (
+            backpressure.as_dict(time.monotonic()) if backpressure is not None else {}
+        ),
+        "decimated": decimator.as_dict() if decimator is not None else {},
+        "unchanged": payloads.as_dict() if payloads is not None else {},
+        "memory": memory_report(devices),
+        "attributes": {
+            sensor.entity_id: attributes
+            for store in devices.values()
+            for sensor in store.values()
+            if (attributes := sensor.diagnostic_attributes) is not None
+        },
+    }
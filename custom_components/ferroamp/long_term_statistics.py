@@ -0,0 +1,165 @@
+"""Hourly long-term statistics computed from every received sample.
+
+The recorder is only imported when statistics are restored or imported, so the
+sensor platform does not load it while long-term statistics are disabled.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant import core
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder.models import (
+        StatisticData,
+        StatisticMetaData,
+    )
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class HourSamples:
+    """Samples of a sensor within one hour."""
+
+    start: datetime
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    last: float = 0.0
+    increase: float = 0.0
+
+
+class StatisticsAccumulator:
+    """Accumulate samples of a sensor into hourly statistics.
+
+    Measurements get the mean, min and max of every hour. Totals get the last
+    value of every hour and the sum of all increases. Like the energy sensors,
+    a total that drops by less than 10% is ignored and a larger drop is a
+    reset of the counter.
+    """
+
+    def __init__(self, has_sum: bool) -> None:
+        """Initialize the accumulator."""
+        self.has_sum = has_sum
+        self.hour: HourSamples | None = None
+        self.last: float | None = None
+        # The sum continues from the recorder, totals are ignored until then
+        self.sum: float | None = None if has_sum else 0.0
+
+    @property
+    def restored(self) -> bool:
+        """Return True when samples are accumulated."""
+        return self.sum is not None
+
+    def restore(self, state: float | None, total: float | None) -> None:
+        """Continue from the last state and sum imported to the recorder."""
+        self.last = state
+        self.sum = total or 0.0
+
+    def add(self, ts: datetime, value: float) -> HourSamples | None:
+        """Add a sample and return the previous hour once ts is in a later hour."""
+        if not self.restored:
+            return None
+        start = ts.replace(minute=0, second=0, microsecond=0)
+        completed = None
+        if self.hour is not None and start != self.hour.start:
+            if start < self.hour.start:
+                # Late sample of an hour that is already complete
+                return None
+            completed = self.hour
+            self.hour = None
+        if self.hour is None:
+            self.hour = HourSamples(start)
+        hour = self.hour
+        hour.count += 1
+        hour.total += value
+        hour.minimum = min(hour.minimum, value)
+        hour.maximum = max(hour.maximum, value)
+        hour.last = value
+        if self.has_sum:
+            if self.last is None:
+                self.last = value
+            elif value >= self.last:
+                hour.increase += value - self.last
+                self.last = value
+            elif value * 1.1 < self.last:
+                hour.increase += value
+                self.last = value
+        return completed
+
+    def statistic(self, hour: HourSamples) -> StatisticData:
+        """Return the statistics row of a completed hour."""
+        if self.has_sum:
+            self.sum = (self.sum or 0.0) + hour.increase
+            return {"start": hour.start, "state": hour.last, "sum": self.sum}
+        return {
+            "start": hour.start,
+            "mean": hour.total / hour.count,
+            "min": hour.minimum,
+            "max": hour.maximum,
+        }
+
+
+def build_statistic_id(unique_id: str) -> str:
+    """Build the external statistic id for a sensor."""
+    return f"{DOMAIN}:{slugify(unique_id)}"
+
+
+def build_metadata(
+    statistic_id: str, name: str | None, unit: str | None, has_sum: bool
+) -> StatisticMetaData:
+    """Build the metadata of the external statistic of a sensor."""
+    return {
+        "has_mean": not has_sum,
+        "has_sum": has_sum,
+        "name": name,
+        "source": DOMAIN,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
+
+
+async def async_restore(
+    hass: core.HomeAssistant, accumulator: StatisticsAccumulator, statistic_id: str
+) -> None:
+    """Continue the sum of a total from the last imported statistics row."""
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.statistics import get_last_statistics
+
+    last: dict[str, list[dict[str, Any]]] = await get_instance(
+        hass
+    ).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"state", "sum"}
+    )
+    rows = last.get(statistic_id)
+    if rows:
+        accumulator.restore(rows[0].get("state"), rows[0].get("sum"))
+    else:
+        accumulator.restore(None, None)
+    _LOGGER.debug(
+        "Restored statistics of %s at %s, sum %s",
+        statistic_id,
+        dt_util.utc_from_timestamp(rows[0]["start"]) if rows else None,
+        accumulator.sum,
+    )
+
+
+def async_import(
+    hass: core.HomeAssistant, metadata: StatisticMetaData, row: StatisticData
+) -> None:
+    """Import a statistics row to the recorder."""
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+    )
+
+    async_add_external_statistics(hass, metadata, [row])
@@ -0,0 +1,120 @@
+"""Memory footprint reporting for Ferroamp sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+import sys
+import tracemalloc
+from typing import Any
+
+# Only allocations made from this integration are included in snapshots
+TRACEMALLOC_FILTER = "*custom_components/ferroamp/*"
+
+# Frames stored per allocation, deep enough to see which integration code
+# called json.loads and other library functions
+TRACEMALLOC_FRAMES = 10
+
+
+def deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """Return the approximate size in bytes of `obj` and everything it contains.
+
+    Objects whose id is already in `seen` are not counted again, so shared
+    objects are only accounted for once across calls using the same set.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    return size
+
+
+def tracemalloc_report(top: int) -> dict[str, Any]:
+    """Return allocations by this integration, largest source lines first.
+
+    Args:
+        top: Number of source lines to include.
+
+    Returns:
+        Dictionary with totals and the top source lines, or only the tracing
+        flag if tracemalloc is not tracing.
+    """
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(True, TRACEMALLOC_FILTER, all_frames=True),)
+    )
+    stats = snapshot.statistics("lineno")
+    return {
+        "tracing": True,
+        "size": sum(stat.size for stat in stats),
+        "count": sum(stat.count for stat in stats),
+        "top": [
+            {
+                "line": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size": stat.size,
+                "count": stat.count,
+            }
+            for stat in stats[:top]
+        ],
+    }
+
+
+def set_tracing(enabled: bool) -> None:
+    """Start or stop tracing allocations with tracemalloc."""
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def memory_report(
+    stores: Mapping[str, Mapping[str, Any]], top: int = 10
+) -> dict[str, Any]:
+    """Build a memory report for the sensors of one config entry.
+
+    Args:
+        stores: Sensor stores by device ID, as kept in hass.data.
+        top: Number of tracemalloc source lines to include.
+
+    Returns:
+        Dictionary with live sensors and buffered events grouped by sensor
+        class, store sizes per device and tracemalloc statistics.
+    """
+    classes: dict[str, dict[str, int]] = {}
+    seen: set[int] = set()
+    unique_events: set[int] = set()
+    events_size = 0
+    buffered = 0
+    for store in stores.values():
+        for sensor in store.values():
+            cls = classes.setdefault(
+                type(sensor).__name__,
+                {"sensors": 0, "buffered_events": 0, "events_bytes": 0},
+            )
+            cls["sensors"] += 1
+            events = getattr(sensor, "events", None)
+            if events:
+                cls["buffered_events"] += len(events)
+                buffered += len(events)
+                unique_events.update(id(event) for event in events)
+                # Events are shared between all sensors of a device, so each
+                # payload is attributed to the first class that holds it.
+                size = deep_sizeof(events, seen)
+                cls["events_bytes"] += size
+                events_size += size
+    return {
+        "sensor_classes": dict(sorted(classes.items())),
+        "event_buffers": {
+            "buffered_events": buffered,
+            "unique_events": len(unique_events),
+            "bytes": events_size,
+        },
+        "stores": {device_id: len(store) for device_id, store in stores.items()},
+        "tracemalloc": tracemalloc_report(top),
+    }
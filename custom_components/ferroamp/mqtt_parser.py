@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import UTC, datetime
 import json
 import logging
 from typing import Any
@@ -84,6 +85,25 @@ class MqttMessageParser:
             return id_val.get("val")
         return None
 
+    @staticmethod
+    def get_timestamp(event: MqttEvent) -> datetime | None:
+        """Extract the device timestamp from event.
+
+        Args:
+            event: The parsed MQTT event.
+
+        Returns:
+            The timestamp as an aware UTC datetime, or None if missing or invalid.
+        """
+        ts_val = event.get("ts")
+        if ts_val is None:
+            return None
+        try:
+            ts = datetime.fromisoformat(ts_val["val"].removesuffix("UTC"))
+        except (KeyError, TypeError, ValueError):
+            return None
+        return ts.replace(tzinfo=UTC)
+
     @staticmethod
     def get_value(event: MqttEvent, key: str) -> dict[str, Any] | None:
         """Get raw value dict for a key from event.
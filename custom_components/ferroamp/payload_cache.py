@@ -0,0 +1,48 @@
+"""Recognition of repeated payloads of slow-moving Ferroamp devices."""
+
+from __future__ import annotations
+
+from .mqtt_parser import MqttEvent
+
+Payload = str | bytes
+
+
+class PayloadCache:
+    """Last payload of each device and the number of payloads skipped per topic.
+
+    ESM payloads have no timestamp and repeat byte for byte while nothing
+    changes. The decoded event of the last payload of each device is kept, so
+    a repeated payload is recognized without decoding it again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._events: dict[str, dict[Payload, tuple[str, MqttEvent]]] = {}
+        self._payloads: dict[tuple[str, str], Payload] = {}
+        self.skipped: dict[str, int] = {}
+
+    def lookup(self, topic: str, payload: Payload) -> tuple[str, MqttEvent] | None:
+        """Get the device and decoded event of a repeated payload, if known."""
+        events = self._events.get(topic)
+        if events is None:
+            return None
+        return events.get(payload)
+
+    def store(
+        self, topic: str, device_id: str, payload: Payload, event: MqttEvent
+    ) -> None:
+        """Remember payload as the last payload of a device."""
+        events = self._events.setdefault(topic, {})
+        previous = self._payloads.get((topic, device_id))
+        if previous is not None:
+            events.pop(previous, None)
+        self._payloads[(topic, device_id)] = payload
+        events[payload] = (device_id, event)
+
+    def skip(self, topic: str) -> None:
+        """Count a payload skipped on topic."""
+        self.skipped[topic] = self.skipped.get(topic, 0) + 1
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the number of payloads skipped per topic."""
+        return dict(self.skipped)
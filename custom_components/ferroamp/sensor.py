@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 import json
 import logging
+import statistics
+import time
 from typing import Any
 import uuid
+import zlib
 
 from homeassistant import config_entries, core
 from homeassistant.components import mqtt
@@ -38,18 +41,47 @@ from homeassistant.helpers.entity_registry import (
 )
 from homeassistant.helpers.icon import icon_for_battery_level
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.util import slugify
+from homeassistant.util import dt as dt_util, slugify
 
+from .backpressure import BackpressureMonitor
+from .cadence import CadenceTracker
 from .const import (
+    ADAPTIVE_VOLATILITY,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ALIGNED_WINDOWS,
+    CONF_BACKPRESSURE,
+    CONF_BACKPRESSURE_LAG,
+    CONF_DIAGNOSTIC_ATTRIBUTES,
+    CONF_HEARTBEAT,
     CONF_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_SKIP_UNCHANGED,
+    CONF_STAGGERED_FLUSH,
+    DATA_BACKPRESSURE,
+    DATA_CADENCE,
+    DATA_DECIMATORS,
     DATA_DEVICES,
     DATA_LISTENERS,
+    DATA_PAYLOADS,
+    DATA_TIMELINES,
+    DATA_TRACES,
+    DATA_WRITE_STATS,
+    DEADBAND_OPTIONS,
+    DECIMATION_OPTIONS,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_BACKPRESSURE_LAG,
+    DEFAULT_HEARTBEAT,
     DOMAIN,
     EHUB,
     EHUB_NAME,
     FAULT_CODES_ESO,
     FAULT_CODES_SSO,
+    INTERVAL_OPTIONS,
     MANUFACTURER,
+    MAX_PENDING_EVENTS,
     REGEX_ESM_ID,
     REGEX_SSO_ID,
     TOPIC_CONTROL_REQUEST,
@@ -58,8 +90,17 @@ from .const import (
     TOPIC_EHUB,
     TOPIC_ESM,
     TOPIC_ESO,
+    TOPIC_INTERVALS,
     TOPIC_SSO,
 )
+from .decimation import Decimator, decimation_factor
+from .long_term_statistics import (
+    StatisticsAccumulator,
+    async_import,
+    async_restore,
+    build_metadata,
+    build_statistic_id,
+)
 from .mqtt_parser import (
     CommandParser,
     MqttEvent,
@@ -73,12 +114,36 @@ from .mqtt_parser import (
     convert_to_kwh,
     last_string_value,
 )
+from .payload_cache import Payload, PayloadCache
+from .timeline import StartupTimeline
+from .tracing import TraceRecorder
+from .write_stats import WriteStats
 
 _LOGGER = logging.getLogger(__name__)
 
 # Type alias for sensor storage
 SensorStore = dict[str, "FerroampSensor"]
 
+# Deadband category of sensors by unit
+DEADBAND_UNITS = {
+    UnitOfElectricPotential.VOLT: "voltage",
+    UnitOfElectricCurrent.AMPERE: "current",
+    UnitOfPower.WATT: "power",
+    UnitOfTemperature.CELSIUS: "temperature",
+    PERCENTAGE: "percentage",
+}
+
+# Update interval category of sensors by unit, ESM sensors are all "battery"
+INTERVAL_UNITS = {
+    UnitOfPower.WATT: "power",
+    UnitOfElectricCurrent.AMPERE: "power",
+    UnitOfElectricPotential.VOLT: "voltage",
+    UnitOfFrequency.HERTZ: "voltage",
+    UnitOfEnergy.KILO_WATT_HOUR: "energy",
+    UnitOfTemperature.CELSIUS: "temperature",
+    PERCENTAGE: "battery",
+}
+
 
 class SensorType(Enum):
     """Enumeration of sensor types for data-driven sensor creation."""
@@ -1003,8 +1068,34 @@ async def async_setup_entry(
     """Set up sensors from a config entry created in the integrations UI."""
     hass.data[DOMAIN].setdefault(DATA_DEVICES, {})
     hass.data[DOMAIN].setdefault(DATA_LISTENERS, {})
+    hass.data[DOMAIN].setdefault(DATA_BACKPRESSURE, {})
+    hass.data[DOMAIN].setdefault(DATA_CADENCE, {})
+    hass.data[DOMAIN].setdefault(DATA_DECIMATORS, {})
+    hass.data[DOMAIN].setdefault(DATA_PAYLOADS, {})
+    hass.data[DOMAIN].setdefault(DATA_TRACES, {})
+    hass.data[DOMAIN].setdefault(DATA_WRITE_STATS, {})
     hass.data[DOMAIN][DATA_DEVICES].setdefault(config_entry.unique_id, {})
     hass.data[DOMAIN][DATA_LISTENERS].setdefault(config_entry.unique_id, [])
+    cadence: CadenceTracker = hass.data[DOMAIN][DATA_CADENCE].setdefault(
+        config_entry.unique_id, CadenceTracker()
+    )
+    trace: TraceRecorder = hass.data[DOMAIN][DATA_TRACES].setdefault(
+        config_entry.unique_id, TraceRecorder()
+    )
+    backpressure: BackpressureMonitor = hass.data[DOMAIN][DATA_BACKPRESSURE].setdefault(
+        config_entry.unique_id, BackpressureMonitor()
+    )
+    decimator: Decimator = hass.data[DOMAIN][DATA_DECIMATORS].setdefault(
+        config_entry.unique_id, Decimator()
+    )
+    payloads: PayloadCache = hass.data[DOMAIN][DATA_PAYLOADS].setdefault(
+        config_entry.unique_id, PayloadCache()
+    )
+    hass.data[DOMAIN][DATA_WRITE_STATS].setdefault(config_entry.unique_id, WriteStats())
+    timeline: StartupTimeline = hass.data[DOMAIN][DATA_TIMELINES][
+        config_entry.unique_id
+    ]
+    timeline.mark("platform_setup")
     listeners: list[Callable[[], None]] = hass.data[DOMAIN][DATA_LISTENERS].get(
         config_entry.unique_id
     )
@@ -1026,6 +1117,18 @@ async def async_setup_entry(
     entity_registry = async_get_entity_reg(hass)
 
     ehub = ehub_sensors(slug, interval, config_id)
+    # Sensors still updated while the event loop lags. Sensors that parse the
+    # phases of a value, per-phase and three-phase sensors, are not.
+    ehub_essential = [
+        sensor
+        for sensor in ehub
+        if sensor.device_class in (SensorDeviceClass.ENERGY, SensorDeviceClass.POWER)
+        and not isinstance(
+            sensor, (SinglePhaseFerroampSensor, ThreePhaseFerroampSensor)
+        )
+    ]
+    # Newest EnergyHub message waiting to be processed while the event loop lags
+    pending: list[tuple[MqttEvent, datetime, float]] = []
     eso_sensors: dict[str, list[FerroampSensor]] = {}
     esm_sensors: dict[str, list[FerroampSensor]] = {}
     sso_sensors: dict[str, list[FerroampSensor]] = {}
@@ -1039,36 +1142,179 @@ async def async_setup_entry(
             new = True
         return store, new
 
+    def enabled(sensor: FerroampSensor) -> bool:
+        """Check if Home Assistant will add the sensor, i.e. it is not disabled."""
+        entity_id = entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, sensor.unique_id
+        )
+        if entity_id is None:
+            return sensor.entity_registry_enabled_default
+        return not entity_registry.async_get(entity_id).disabled
+
+    def unregistered(
+        sensor: FerroampSensor, event: MqttEvent | None, store: SensorStore
+    ) -> bool:
+        """Check if the sensor is new and has data in event."""
+        return sensor.unique_id not in store and (
+            not sensor.check_presence or sensor.present(event)
+        )
+
     def register_sensor(
         sensor: FerroampSensor, event: MqttEvent | None, store: SensorStore
     ) -> None:
-        if sensor.unique_id not in store:
-            if not sensor.check_presence or sensor.present(event):
-                store[sensor.unique_id] = sensor
-                _LOGGER.debug(
-                    "Registering new sensor %(unique_id)s => %(event)s",
-                    {"unique_id": sensor.unique_id, "event": event},
-                )
-                async_add_entities((sensor,), True)
+        if unregistered(sensor, event, store):
+            sensor.handle_options_update(config_entry.options)
+            store[sensor.unique_id] = sensor
+            _LOGGER.debug("Registering new sensor %s", sensor.unique_id)
+            if enabled(sensor):
+                timeline.entity_pending(sensor.unique_id)
+            async_add_entities((sensor,), True)
 
     def update_sensor_from_event(
         event: MqttEvent, sensors: list[FerroampSensor], store: SensorStore
     ) -> None:
-        _LOGGER.debug("Event received %s", event)
+        # Entities may be added before async_add_entities returns, so all new
+        # sensors of the event are pending before the first one is added
+        for sensor in sensors:
+            if unregistered(sensor, event, store) and enabled(sensor):
+                timeline.entity_pending(sensor.unique_id)
         for sensor in sensors:
             register_sensor(sensor, event, store)
             sensor.hass = hass
             sensor.add_event(event)
 
+    def decimated(topic: str) -> bool:
+        """Check if a message on topic is dropped by decimation."""
+        every, period = DECIMATION_OPTIONS[topic]
+        return not decimator.accept(
+            topic,
+            config_entry.options.get(every) or 1,
+            config_entry.options.get(period) or 0,
+            time.monotonic(),
+        )
+
+    def cadence_factor(topic: str) -> int:
+        """Get the nominal intervals between processed messages on topic."""
+        if topic not in DECIMATION_OPTIONS:
+            return 1
+        every, period = DECIMATION_OPTIONS[topic]
+        return decimation_factor(
+            TOPIC_INTERVALS[topic],
+            config_entry.options.get(every) or 1,
+            config_entry.options.get(period) or 0,
+        )
+
+    def decode_message(msg: mqtt.ReceiveMessage) -> tuple[MqttEvent, datetime, float]:
+        received = dt_util.utcnow()
+        start = time.perf_counter()
+        event = MqttMessageParser.parse_message(msg)
+        return event, received, (time.perf_counter() - start) * 1_000_000
+
+    def record_message(
+        topic: str,
+        device_id: str,
+        event: MqttEvent,
+        received: datetime,
+        decode_us: float,
+        sensors: list[FerroampSensor] | None,
+    ) -> None:
+        timeline.mark_once(topic, "first_message", topic=topic)
+        cadence.record(topic, device_id, event, received, cadence_factor(topic))
+        trace.record(
+            topic, device_id, received, decode_us, len(sensors) if sensors else 0
+        )
+
+    def skip_unchanged(
+        topic: str,
+        device_id: str,
+        payload: Payload,
+        event: MqttEvent,
+        received: datetime,
+        decode_us: float,
+        sensors: list[FerroampSensor] | None,
+        new: bool = False,
+    ) -> bool:
+        """Skip a payload of a device if it leaves all its sensors as they are."""
+        if not config_entry.options.get(CONF_SKIP_UNCHANGED):
+            return False
+        payloads.store(topic, device_id, payload, event)
+        if new or sensors is None:
+            return False
+        if not all(sensor.holds(event) for sensor in sensors):
+            return False
+        payloads.skip(topic)
+        record_message(topic, device_id, event, received, decode_us, None)
+        return True
+
+    def skip_repeated(
+        topic: str, payload: Payload, devices: dict[str, list[FerroampSensor]]
+    ) -> bool:
+        """Skip a repeated payload of a device without decoding it again."""
+        if not config_entry.options.get(CONF_SKIP_UNCHANGED):
+            return False
+        cached = payloads.lookup(topic, payload)
+        if cached is None:
+            return False
+        device_id, event = cached
+        return skip_unchanged(
+            topic,
+            device_id,
+            payload,
+            event,
+            dt_util.utcnow(),
+            0.0,
+            devices.get(device_id),
+        )
+
+    def lagging(event: MqttEvent, received: datetime) -> bool:
+        """Check if EnergyHub messages lag enough to degrade processing."""
+        if not config_entry.options.get(CONF_BACKPRESSURE):
+            return False
+        ts = MqttMessageParser.get_timestamp(event)
+        if ts is None:
+            return backpressure.degraded
+        return backpressure.update(
+            (received - ts).total_seconds(),
+            config_entry.options.get(CONF_BACKPRESSURE_LAG) or DEFAULT_BACKPRESSURE_LAG,
+            time.monotonic(),
+        )
+
+    @callback
+    def process_pending() -> None:
+        event, received, decode_us = pending.pop()
+        store, _ = get_store(f"{slug}_{EHUB}")
+        update_sensor_from_event(event, ehub_essential, store)
+        record_message(TOPIC_EHUB, EHUB, event, received, decode_us, ehub_essential)
+
+    def coalesce(event: MqttEvent, received: datetime, decode_us: float) -> None:
+        """Queue an EnergyHub message, replacing one that is still queued."""
+        if pending:
+            backpressure.coalesced += 1
+            replaced, replaced_received, replaced_decode_us = pending[0]
+            record_message(
+                TOPIC_EHUB, EHUB, replaced, replaced_received, replaced_decode_us, None
+            )
+            pending[0] = (event, received, decode_us)
+        else:
+            pending.append((event, received, decode_us))
+            hass.loop.call_soon(process_pending)
+
     @callback
     def ehub_event_received(msg: mqtt.ReceiveMessage) -> None:
-        event = MqttMessageParser.parse_message(msg)
+        if decimated(TOPIC_EHUB):
+            return
+        event, received, decode_us = decode_message(msg)
+        # Messages keep their order while a lagging message is still queued
+        if lagging(event, received) or pending:
+            coalesce(event, received, decode_us)
+            return
         store, _ = get_store(f"{slug}_{EHUB}")
         update_sensor_from_event(event, ehub, store)
+        record_message(TOPIC_EHUB, EHUB, event, received, decode_us, ehub)
 
     @callback
     def sso_event_received(msg: mqtt.ReceiveMessage) -> None:
-        event = MqttMessageParser.parse_message(msg)
+        event, received, decode_us = decode_message(msg)
         sso_id = MqttMessageParser.get_id(event)
         model = None
         match = REGEX_SSO_ID.match(sso_id)
@@ -1169,10 +1415,13 @@ async def async_setup_entry(
 
         if sensors is not None:
             update_sensor_from_event(event, sensors, store)
+        record_message(TOPIC_SSO, sso_id, event, received, decode_us, sensors)
 
     @callback
     def eso_event_received(msg: mqtt.ReceiveMessage) -> None:
-        event = MqttMessageParser.parse_message(msg)
+        if skip_repeated(TOPIC_ESO, msg.payload, eso_sensors):
+            return
+        event, received, decode_us = decode_message(msg)
         eso_id = MqttMessageParser.get_id(event)
         if not eso_id:
             return
@@ -1272,12 +1521,19 @@ async def async_setup_entry(
                 ),
             ]
 
+        if skip_unchanged(
+            TOPIC_ESO, eso_id, msg.payload, event, received, decode_us, sensors, new
+        ):
+            return
         if sensors is not None:
             update_sensor_from_event(event, sensors, store)
+        record_message(TOPIC_ESO, eso_id, event, received, decode_us, sensors)
 
     @callback
     def esm_event_received(msg: mqtt.ReceiveMessage) -> None:
-        event = MqttMessageParser.parse_message(msg)
+        if skip_repeated(TOPIC_ESM, msg.payload, esm_sensors):
+            return
+        event, received, decode_us = decode_message(msg)
         esm_id = MqttMessageParser.get_id(event)
         model = None
         device_id = f"{slug}_esm_{esm_id}"
@@ -1325,6 +1581,7 @@ async def async_setup_entry(
                     interval,
                     config_id,
                     model=model,
+                    interval_category="battery",
                 ),
                 BatteryFerroampSensor(
                     "State of Charge",
@@ -1335,6 +1592,7 @@ async def async_setup_entry(
                     interval,
                     config_id,
                     model=model,
+                    interval_category="battery",
                 ),
                 IntValFerroampSensor(
                     "Rated Capacity",
@@ -1347,6 +1605,7 @@ async def async_setup_entry(
                     interval,
                     config_id,
                     model=model,
+                    interval_category="battery",
                 ),
                 PowerFerroampSensor(
                     "Rated Power",
@@ -1358,11 +1617,17 @@ async def async_setup_entry(
                     interval,
                     config_id,
                     model=model,
+                    interval_category="battery",
                 ),
             ]
 
+        if skip_unchanged(
+            TOPIC_ESM, esm_id, msg.payload, event, received, decode_us, sensors, new
+        ):
+            return
         if sensors is not None:
             update_sensor_from_event(event, sensors, store)
+        record_message(TOPIC_ESM, esm_id, event, received, decode_us, sensors)
 
     def get_generic_sensor(
         store: SensorStore,
@@ -1409,6 +1674,7 @@ async def async_setup_entry(
         trans_id, status, message = CommandParser.parse_response(response)
         store, _ = get_store(f"{slug}_{EHUB}")
         if CommandParser.is_version_response(message):
+            timeline.mark_once("extapiversion", "extapiversion_received", status=status)
             sensor = get_version_sensor(store)
             sensor.set_version(CommandParser.extract_version(message))
         else:
@@ -1419,62 +1685,24 @@ async def async_setup_entry(
     get_version_sensor(store)
     get_cmd_sensor(store)
 
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_EHUB}",
-            ehub_event_received,
-            0,
-        )
-    )
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_SSO}",
-            sso_event_received,
-            0,
-        )
-    )
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_ESO}",
-            eso_event_received,
-            0,
-        )
-    )
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_ESM}",
-            esm_event_received,
-            0,
-        )
-    )
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_CONTROL_REQUEST}",
-            ehub_request_received,
-            0,
-        )
-    )
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_CONTROL_RESPONSE}",
-            ehub_response_received,
-            0,
-        )
-    )
-    listeners.append(
-        await mqtt.async_subscribe(
-            hass,
-            f"{config_entry.data[CONF_PREFIX]}/{TOPIC_CONTROL_RESULT}",
-            ehub_response_received,
-            0,
+    for topic, msg_callback in (
+        (TOPIC_EHUB, ehub_event_received),
+        (TOPIC_SSO, sso_event_received),
+        (TOPIC_ESO, eso_event_received),
+        (TOPIC_ESM, esm_event_received),
+        (TOPIC_CONTROL_REQUEST, ehub_request_received),
+        (TOPIC_CONTROL_RESPONSE, ehub_response_received),
+        (TOPIC_CONTROL_RESULT, ehub_response_received),
+    ):
+        listeners.append(
+            await mqtt.async_subscribe(
+                hass,
+                f"{config_entry.data[CONF_PREFIX]}/{topic}",
+                msg_callback,
+                0,
+            )
         )
-    )
+        timeline.mark("subscribed", topic=topic)
 
     payload = {"transId": str(uuid.uuid1()), "cmd": {"name": "extapiversion"}}
     await mqtt.async_publish(
@@ -1482,6 +1710,7 @@ async def async_setup_entry(
         f"{config_entry.data[CONF_PREFIX]}/{TOPIC_CONTROL_REQUEST}",
         json.dumps(payload),
     )
+    timeline.mark("extapiversion_requested")
 
     return True
 
@@ -1545,6 +1774,10 @@ def isfloat(value: Any) -> bool:
 class FerroampSensor(SensorEntity, RestoreEntity):
     """Representation of a Ferroamp Sensor."""
 
+    # Attributes that repeat other sensors or are rarely needed are moved to
+    # diagnostics with CONF_DIAGNOSTIC_ATTRIBUTES, so the recorder skips them
+    _bulky_attributes = False
+
     def __init__(
         self,
         name: str,
@@ -1581,18 +1814,40 @@ class FerroampSensor(SensorEntity, RestoreEntity):
         elif unit == UnitOfTemperature.CELSIUS:
             self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._interval = interval
+        self._interval_category: str | None = kwargs.get(
+            "interval_category", INTERVAL_UNITS.get(unit)
+        )
         entity_id = slugify(name)
         self.entity_id = f"sensor.{entity_prefix}_{entity_id}"
         self.device_id = device_id
         self.config_id = config_id
         self._attr_state_class = kwargs.get("state_class")
         self._added = False
+        self._attributes_in_diagnostics = False
         self.check_presence: bool = kwargs.get("check_presence", False)
 
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the attributes unless they are moved to diagnostics."""
+        if self._attributes_in_diagnostics:
+            return None
+        return super().extra_state_attributes
+
+    @property
+    def diagnostic_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes moved to diagnostics, if any."""
+        if not self._attributes_in_diagnostics:
+            return None
+        return dict(getattr(self, "_attr_extra_state_attributes", None) or {})
+
     def present(self, event: MqttEvent | None) -> bool:
         """Check if sensor data is present in event."""
         return True
 
+    def holds(self, event: MqttEvent) -> bool:
+        """Check if event would leave the state of the sensor as it is."""
+        return True
+
     def add_event(self, event: MqttEvent) -> None:
         """Add MQTT event data - override in subclasses."""
         pass
@@ -1607,10 +1862,45 @@ class FerroampSensor(SensorEntity, RestoreEntity):
             self.unique_id
         ] = self
         self._added = True
+        timeline: StartupTimeline | None = (
+            self.hass.data[DOMAIN].get(DATA_TIMELINES, {}).get(self.config_id)
+        )
+        if timeline is not None:
+            timeline.entity_added(self.unique_id)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine and account for the write."""
+        super().async_write_ha_state()
+        write_stats: WriteStats | None = (
+            self.hass.data[DOMAIN].get(DATA_WRITE_STATS, {}).get(self.config_id)
+        )
+        if write_stats is None:
+            return
+        state = self.hass.states.get(self.entity_id)
+        if state is not None:
+            write_stats.record(
+                self.entity_id,
+                self.device_id,
+                state.attributes,
+                state.last_updated,
+                time.monotonic(),
+            )
 
     def handle_options_update(self, options: dict[str, Any]) -> None:
         """Handle options update."""
         self._interval = options.get(CONF_INTERVAL, self._interval)
+        if self._interval_category is not None:
+            interval = options.get(INTERVAL_OPTIONS[self._interval_category])
+            if interval is not None:
+                self._interval = interval
+        in_diagnostics = self._bulky_attributes and bool(
+            options.get(CONF_DIAGNOSTIC_ATTRIBUTES)
+        )
+        if in_diagnostics != self._attributes_in_diagnostics:
+            self._attributes_in_diagnostics = in_diagnostics
+            if self._added:
+                self.async_write_ha_state()
 
 
 class KeyedFerroampSensor(FerroampSensor):
@@ -1646,6 +1936,24 @@ class KeyedFerroampSensor(FerroampSensor):
         self.updated = datetime.min
         self.events: list[MqttEvent] = []
         self.check_presence = kwargs.get("check_presence", False)
+        self._deadband_category = DEADBAND_UNITS.get(unit)
+        self._deadband = 0.0
+        self._deadband_percent = 0.0
+        self._heartbeat = DEFAULT_HEARTBEAT
+        self._written_value: Any = None
+        self._written_at = datetime.min
+        self._adaptive = False
+        self._adaptive_min = DEFAULT_ADAPTIVE_MIN_INTERVAL
+        self._adaptive_max = DEFAULT_ADAPTIVE_MAX_INTERVAL
+        self._adaptive_mean: float | None = None
+        self._aligned = False
+        self._window_end: datetime | None = None
+        self._staggered = False
+        self._due = datetime.min
+        self._statistics: StatisticsAccumulator | None = None
+        self._skip_unchanged = False
+        # Fingerprint of the events the state was last updated from, if equal
+        self._held: tuple[Any] | None = None
 
     def present(self, event: MqttEvent | None) -> bool:
         """Check if sensor data is present in event."""
@@ -1657,6 +1965,41 @@ class KeyedFerroampSensor(FerroampSensor):
         """Get raw value from event."""
         return MqttMessageParser.get_value(event, self._state_key)
 
+    def fingerprint(self, event: MqttEvent) -> Any:
+        """Get the part of event that the state is computed from."""
+        return self.get_value(event)
+
+    def holds(self, event: MqttEvent) -> bool:
+        """Check if event would leave the state of the sensor as it is.
+
+        That is the case when no events are buffered and the written state was
+        updated from events equal to event, so skipping it changes neither the
+        average of the next update nor when it is written.
+        """
+        if not self._added:
+            return True
+        if self.check_presence and not self.present(event):
+            return len(self.events) == 0
+        return (
+            self._held is not None
+            and len(self.events) == 0
+            and not self._aligned
+            and self._statistics is None
+            and self._written_value == self._attr_native_value
+            and self._held[0] == self.fingerprint(event)
+        )
+
+    def sample(self, event: MqttEvent) -> float | None:
+        """Get the numeric value of the state key in event, if any."""
+        value = self.get_value(event)
+        if (
+            isinstance(value, dict)
+            and value.get("val") is not None
+            and isfloat(value["val"])
+        ):
+            return float(value["val"])
+        return None
+
     def get_float_value(self, event: MqttEvent) -> float:
         """Get float value from event."""
         val = MqttMessageParser.get_float(event, self._state_key)
@@ -1666,22 +2009,218 @@ class KeyedFerroampSensor(FerroampSensor):
 
     def add_event(self, event: MqttEvent) -> None:
         """Add MQTT event to processing queue."""
+        if self._statistics is not None and self._added:
+            self.add_statistics_sample(event)
+        if self._aligned and self._interval > 0:
+            self.add_aligned_event(event)
+            return
         if not self.check_presence or self.present(event):
             self.events.append(event)
         now = datetime.now()
         delta = (now - self.updated).total_seconds()
-        if delta > self._interval and self._added:
+        if self._added and (
+            self.flush_due(now, delta)
+            or (self._adaptive and delta > self._adaptive_min and self.stepped(event))
+        ):
             self.process_events(now)
+        elif not self._added and len(self.events) > MAX_PENDING_EVENTS:
+            del self.events[:-MAX_PENDING_EVENTS]
+
+    def add_statistics_sample(self, event: MqttEvent) -> None:
+        """Add the sample in event to the long-term statistics."""
+        value = self.sample(event)
+        if value is None:
+            return
+        ts = MqttMessageParser.get_timestamp(event) or dt_util.utcnow()
+        hour = self._statistics.add(ts, value)
+        if hour is not None:
+            statistic_id = build_statistic_id(self.unique_id)
+            async_import(
+                self.hass,
+                build_metadata(
+                    statistic_id,
+                    f"{self._attr_device_info['name']} {self._attr_name}",
+                    self._attr_native_unit_of_measurement,
+                    self._statistics.has_sum,
+                ),
+                self._statistics.statistic(hour),
+            )
+
+    def restore_statistics(self) -> None:
+        """Start restoring the long-term statistics sum from the recorder."""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.warning(
+                "Recorder is not available, no long-term statistics for %s",
+                self.entity_id,
+            )
+            self._statistics = None
+        elif self._statistics.has_sum:
+            self.hass.async_create_background_task(
+                async_restore(
+                    self.hass, self._statistics, build_statistic_id(self.unique_id)
+                ),
+                f"ferroamp restore statistics {self.unique_id}",
+            )
+
+    def add_aligned_event(self, event: MqttEvent) -> None:
+        """Add MQTT event to the window of its timestamp.
+
+        Windows are multiples of the interval from local midnight. Events of
+        a window are processed when the first event of a later window arrives.
+        """
+        ts = MqttMessageParser.get_timestamp(event) or dt_util.utcnow()
+        if self._window_end is None or ts >= self._window_end:
+            if self._window_end is not None and self._added:
+                self.process_events(datetime.now())
+            self._window_end = self.window_start(ts) + timedelta(seconds=self._interval)
+        if not self.check_presence or self.present(event):
+            self.events.append(event)
+        if not self._added and len(self.events) > MAX_PENDING_EVENTS:
+            del self.events[:-MAX_PENDING_EVENTS]
+
+    def window_start(self, ts: datetime) -> datetime:
+        """Get the start of the aligned window containing ts."""
+        midnight = dt_util.as_utc(dt_util.start_of_local_day(dt_util.as_local(ts)))
+        offset = (ts - midnight).total_seconds()
+        return midnight + timedelta(seconds=offset - offset % self._interval)
+
+    def flush_due(self, now: datetime, delta: float) -> bool:
+        """Check if the events should be processed now."""
+        if self._staggered and self._interval > 0:
+            return now >= self._due
+        return delta > self._interval
+
+    def next_flush(self, now: datetime) -> datetime:
+        """Get the next flush time on the staggered schedule of this sensor.
+
+        The unique_id is hashed into a phase offset within the interval, so
+        sensors flush spread over the interval instead of on the same message.
+        """
+        # Microseconds keep the schedule exact, the remaining time is never 0
+        interval = int(self._interval * 1_000_000)
+        offset = zlib.crc32(self.unique_id.encode()) * interval // 2**32
+        elapsed = (round(now.timestamp() * 1_000_000) - offset) % interval
+        return now + timedelta(microseconds=interval - elapsed)
 
     def process_events(self, now: datetime) -> None:
         """Process accumulated events and update state."""
         temp = self.events
         self.events = []
         self.updated = now
+        if self._adaptive:
+            self.adapt_interval(temp)
+        if self._staggered and self._interval > 0:
+            self._due = self.next_flush(now)
+        if self._skip_unchanged:
+            self.settle(temp)
         if len(temp) != 0:
-            if self.update_state_from_events(temp):
+            if self.update_state_from_events(temp) and self.outside_deadband(now):
                 self.async_write_ha_state()
 
+    def settle(self, events: list[MqttEvent]) -> None:
+        """Remember the fingerprint of the events of an update if all are equal."""
+        if len(events) == 0:
+            return
+        fingerprint = self.fingerprint(events[0])
+        if all(self.fingerprint(event) == fingerprint for event in events[1:]):
+            self._held = (fingerprint,)
+        else:
+            self._held = None
+
+    def outside_deadband(self, now: datetime) -> bool:
+        """Check if the state should be written and if so remember it as written.
+
+        Numeric states within the deadband of the last written state are not
+        written, unless the heartbeat has passed since then.
+        """
+        value = self._attr_native_value
+        if (
+            (self._deadband or self._deadband_percent)
+            and isinstance(value, (int, float))
+            and isinstance(self._written_value, (int, float))
+            and (now - self._written_at).total_seconds() < self._heartbeat
+        ):
+            band = max(
+                self._deadband, abs(self._written_value) * self._deadband_percent / 100
+            )
+            if abs(value - self._written_value) <= band:
+                return False
+        self._written_value = value
+        self._written_at = now
+        return True
+
+    def volatile(self, change: float, mean: float) -> bool:
+        """Check if a change of the samples is large enough to flush quickly.
+
+        The absolute deadband, if any, is the smallest change that counts.
+        """
+        return change > max(abs(mean) * ADAPTIVE_VOLATILITY, self._deadband)
+
+    def stepped(self, event: MqttEvent) -> bool:
+        """Check if event stepped away from the samples of the last flush."""
+        if self._adaptive_mean is None:
+            return False
+        sample = self.sample(event)
+        return sample is not None and self.volatile(
+            abs(sample - self._adaptive_mean), self._adaptive_mean
+        )
+
+    def adapt_interval(self, events: list[MqttEvent]) -> None:
+        """Adapt the interval to the volatility of the samples in events."""
+        samples = [sample for sample in map(self.sample, events) if sample is not None]
+        if len(samples) == 0:
+            return
+        mean = statistics.fmean(samples)
+        change = statistics.pstdev(samples, mean)
+        if self._adaptive_mean is not None:
+            change = max(change, abs(mean - self._adaptive_mean))
+        self._adaptive_mean = mean
+        if self.volatile(change, mean):
+            self._interval = self._adaptive_min
+        else:
+            self._interval = min(max(self._interval, 1) * 2, self._adaptive_max)
+
+    def handle_options_update(self, options: dict[str, Any]) -> None:
+        """Handle options update."""
+        super().handle_options_update(options)
+        if self._deadband_category is not None:
+            absolute, relative = DEADBAND_OPTIONS[self._deadband_category]
+            self._deadband = options.get(absolute) or 0.0
+            self._deadband_percent = options.get(relative) or 0.0
+        self._heartbeat = options.get(CONF_HEARTBEAT) or DEFAULT_HEARTBEAT
+        self._aligned = bool(options.get(CONF_ALIGNED_WINDOWS))
+        self._window_end = None
+        self._staggered = bool(options.get(CONF_STAGGERED_FLUSH)) and not self._aligned
+        self._due = datetime.min
+        if options.get(CONF_LONG_TERM_STATISTICS) and self._attr_device_class in (
+            SensorDeviceClass.ENERGY,
+            SensorDeviceClass.POWER,
+        ):
+            if self._statistics is None:
+                self._statistics = StatisticsAccumulator(
+                    self._attr_state_class == SensorStateClass.TOTAL_INCREASING
+                )
+                if self._added:
+                    self.restore_statistics()
+        else:
+            self._statistics = None
+        self._skip_unchanged = bool(options.get(CONF_SKIP_UNCHANGED))
+        if not self._skip_unchanged:
+            self._held = None
+        # Adapting the interval would move the windows off the aligned grid
+        self._adaptive = bool(options.get(CONF_ADAPTIVE_INTERVAL)) and not self._aligned
+        if self._adaptive:
+            self._adaptive_min = options.get(
+                CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL
+            )
+            self._adaptive_max = max(
+                options.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL),
+                self._adaptive_min,
+            )
+            self._interval = min(
+                max(self._interval, self._adaptive_min), self._adaptive_max
+            )
+
     def update_state_from_events(self, events: list[MqttEvent]) -> bool:
         """Update state from events - must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement update_state_from_events")
@@ -1689,6 +2228,8 @@ class KeyedFerroampSensor(FerroampSensor):
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
+        if self._statistics is not None:
+            self.restore_statistics()
         self.process_events(datetime.now())
 
 
@@ -1960,6 +2501,19 @@ class EnergyFerroampSensor(FloatValFerroampSensor):
             **kwargs,
         )
 
+    def sample(self, event: MqttEvent) -> float | None:
+        """Get the energy in event in kWh, if any."""
+        value = super().sample(event)
+        if value is None:
+            return None
+        return convert_to_kwh(value)
+
+    def holds(self, event: MqttEvent) -> bool:
+        """Check if event would leave the state as it is, zero values are ignored."""
+        if self.get_float_value(event) <= 0:
+            return True
+        return super().holds(event)
+
     def add_event(self, event: MqttEvent) -> None:
         """Add event, filtering out zero values."""
         if not self.check_presence or self.present(event):
@@ -2115,6 +2669,21 @@ class CalculatedPowerFerroampSensor(KeyedFerroampSensor):
         self._attr_native_value = int(round(avg_voltage * avg_current, 0))
         return True
 
+    def fingerprint(self, event: MqttEvent) -> Any:
+        """Get the voltage and current in event."""
+        return (
+            MqttMessageParser.get_value(event, self._voltage_key),
+            MqttMessageParser.get_value(event, self._current_key),
+        )
+
+    def sample(self, event: MqttEvent) -> float | None:
+        """Get the power calculated from event, if any."""
+        voltage = MqttMessageParser.get_float(event, self._voltage_key)
+        current = MqttMessageParser.get_float(event, self._current_key)
+        if voltage is None or current is None:
+            return None
+        return voltage * current
+
 
 class SinglePhaseFerroampSensor(KeyedFerroampSensor):
     """Single phase Sensor."""
@@ -2151,6 +2720,10 @@ class SinglePhaseFerroampSensor(KeyedFerroampSensor):
         self._phase = phase
         self._attr_unique_id = f"{self.device_id}-{self._state_key}-{self._phase}"
 
+    def sample(self, event: MqttEvent) -> float | None:
+        """Get the value of the phase in event, if any."""
+        return MqttMessageParser.get_single_phase(event, self._state_key, self._phase)
+
     def update_state_from_events(self, events: list[MqttEvent]) -> bool:
         """Update state from events."""
         avg = average_single_phase_values(events, self._state_key, self._phase)
@@ -2174,6 +2747,8 @@ class SinglePhaseFerroampSensor(KeyedFerroampSensor):
 class ThreePhaseFerroampSensor(KeyedFerroampSensor):
     """Ferroamp ThreePhase Sensor."""
 
+    _bulky_attributes = True
+
     def __init__(
         self,
         name: str,
@@ -2211,6 +2786,13 @@ class ThreePhaseFerroampSensor(KeyedFerroampSensor):
         """Calculate aggregated value from phases."""
         return phases.total
 
+    def sample(self, event: MqttEvent) -> float | None:
+        """Get the aggregated value of the phases in event, if any."""
+        phases = self.get_phases(event)
+        if phases is None:
+            return None
+        return self.calculate_value(phases)
+
     def update_state_from_events(self, events: list[MqttEvent]) -> bool:
         """Update state from events."""
         avg_phases = average_phase_values(events, self._state_key)
@@ -2284,6 +2866,10 @@ class SinglePhaseEnergyFerroampSensor(SinglePhaseFerroampSensor):
             return round(convert_to_kwh(val), 2)
         return None
 
+    def sample(self, event: MqttEvent) -> float | None:
+        """Get the energy of the phase in event in kWh, if any."""
+        return self.get_energy_value(event)
+
     def add_event(self, event: MqttEvent) -> None:
         """Add event, filtering out zero values."""
         val = self.get_energy_value(event)
@@ -2294,7 +2880,7 @@ class SinglePhaseEnergyFerroampSensor(SinglePhaseFerroampSensor):
         _LOGGER.info(
             "%s value %s for phase %s seems to be zero or None. Ignoring",
             self.entity_id,
-            self.get_energy_value(event),
+            val,
             self._phase,
         )
 
@@ -2483,6 +3069,8 @@ class ThreePhasePowerFerroampSensor(ThreePhaseFerroampSensor):
 class CommandFerroampSensor(FerroampSensor):
     """Ferroamp command status Sensor."""
 
+    _bulky_attributes = True
+
     def __init__(
         self,
         name: str,
@@ -2561,6 +3149,8 @@ class VersionFerroampSensor(FerroampSensor):
 class FaultcodeFerroampSensor(KeyedFerroampSensor):
     """Ferroamp Faultcode Sensor."""
 
+    _bulky_attributes = True
+
     def __init__(
         self,
         name: str,
@@ -0,0 +1,54 @@
+"""Startup timeline instrumentation for Ferroamp."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+
+class StartupTimeline:
+    """Record when each setup phase of a config entry happened.
+
+    Offsets are seconds since `origin`, which is normally the time the
+    integration's async_setup started.
+    """
+
+    def __init__(self, origin: float | None = None) -> None:
+        """Initialize the timeline."""
+        self._origin = origin if origin is not None else time.monotonic()
+        self._marks: list[tuple[float, str, dict[str, Any]]] = []
+        self._once: set[str] = set()
+        self._pending: set[str] = set()
+        self._added = 0
+
+    def mark(self, name: str, at: float | None = None, **details: Any) -> None:
+        """Record that phase `name` happened now, or at monotonic time `at`."""
+        if at is None:
+            at = time.monotonic()
+        self._marks.append((at - self._origin, name, details))
+
+    def mark_once(self, key: str, name: str, **details: Any) -> None:
+        """Record phase `name` unless a phase with `key` was already recorded."""
+        if key not in self._once:
+            self._once.add(key)
+            self.mark(name, **details)
+
+    def entity_pending(self, unique_id: str) -> None:
+        """Register an entity that has been handed to Home Assistant."""
+        self._pending.add(unique_id)
+
+    def entity_added(self, unique_id: str) -> None:
+        """Register an entity as added, marking when no entities are pending."""
+        if unique_id not in self._pending:
+            return
+        self._pending.discard(unique_id)
+        self._added += 1
+        if not self._pending:
+            self.mark("entities_added", count=self._added)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return recorded phases in order as JSON serializable dicts."""
+        return [
+            {"offset": round(offset, 3), "phase": name, **details}
+            for offset, name, details in self._marks
+        ]
@@ -0,0 +1,64 @@
+"""Fixed-size in-memory trace of received Ferroamp MQTT messages."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+DEFAULT_TRACE_SIZE = 500
+
+# (topic, device_id, received, decode_us, sensors)
+TraceEntry = tuple[str, str, datetime, float, int]
+
+
+class TraceRecorder:
+    """Ring buffer recording one entry per handled message.
+
+    Recording only appends a tuple to a bounded deque, all formatting is
+    deferred until the trace is dumped.
+    """
+
+    def __init__(self, size: int = DEFAULT_TRACE_SIZE) -> None:
+        """Initialize the recorder with room for `size` entries."""
+        self._entries: deque[TraceEntry] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Return number of recorded entries."""
+        return len(self._entries)
+
+    def record(
+        self,
+        topic: str,
+        device_id: str,
+        received: datetime,
+        decode_us: float,
+        sensors: int,
+    ) -> None:
+        """Record a handled message.
+
+        Args:
+            topic: The topic the message arrived on (without prefix).
+            device_id: ID of the device that sent the message.
+            received: Local receive time.
+            decode_us: Time spent decoding the payload in microseconds.
+            sensors: Number of sensors the event was fanned out to.
+        """
+        self._entries.append((topic, device_id, received, decode_us, sensors))
+
+    def clear(self) -> None:
+        """Remove all recorded entries."""
+        self._entries.clear()
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return recorded entries, oldest first, as JSON serializable dicts."""
+        return [
+            {
+                "topic": topic,
+                "device": device_id,
+                "received": received.isoformat(),
+                "decode_us": round(decode_us, 1),
+                "sensors": sensors,
+            }
+            for topic, device_id, received, decode_us, sensors in self._entries
+        ]
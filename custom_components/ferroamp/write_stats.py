@@ -0,0 +1,166 @@
+"""Accounting of state writes and the recorder rows they produce."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+from typing import Any
+
+# Width of a rolling window bucket in seconds
+BUCKET_SECONDS = 60
+
+# Rolling windows reported, in seconds
+WINDOWS = {"5m": 300, "1h": 3600}
+
+
+@dataclass
+class WriteCounters:
+    """Write counters for an entity, a device or a time bucket."""
+
+    writes: int = 0
+    state_rows: int = 0
+    attribute_rows: int = 0
+    attribute_bytes: int = 0
+
+    def add(self, other: WriteCounters) -> None:
+        """Add counters from another instance."""
+        self.writes += other.writes
+        self.state_rows += other.state_rows
+        self.attribute_rows += other.attribute_rows
+        self.attribute_bytes += other.attribute_bytes
+
+    def as_dict(self) -> dict[str, int]:
+        """Return counters as dictionary."""
+        return {
+            "writes": self.writes,
+            "state_rows": self.state_rows,
+            "attribute_rows": self.attribute_rows,
+            "attribute_bytes": self.attribute_bytes,
+        }
+
+
+@dataclass
+class EntityWriteStats:
+    """Write statistics for a single entity."""
+
+    device_id: str
+    total: WriteCounters = field(default_factory=WriteCounters)
+    buckets: deque[tuple[int, WriteCounters]] = field(
+        default_factory=lambda: deque(maxlen=max(WINDOWS.values()) // BUCKET_SECONDS)
+    )
+    last_updated: datetime | None = None
+    last_attributes: dict[str, Any] | None = None
+
+    def record(
+        self, attributes: Mapping[str, Any], last_updated: datetime, now: float
+    ) -> None:
+        """Record a state write with the given attributes at monotonic time `now`.
+
+        Home Assistant only changes the state, and the recorder only stores a
+        new state row, when the state or the attributes differ from the previous
+        ones, which moves `last_updated`. A new attributes row is only stored
+        when the attributes differ from the previous ones.
+        """
+        bucket_index = int(now // BUCKET_SECONDS)
+        if not self.buckets or self.buckets[-1][0] != bucket_index:
+            self.buckets.append((bucket_index, WriteCounters()))
+        bucket = self.buckets[-1][1]
+        bucket.writes += 1
+        self.total.writes += 1
+        if last_updated == self.last_updated:
+            return
+        self.last_updated = last_updated
+        bucket.state_rows += 1
+        self.total.state_rows += 1
+        if attributes != self.last_attributes:
+            self.last_attributes = dict(attributes)
+            size = len(
+                json.dumps(self.last_attributes, separators=(",", ":"), default=str)
+            )
+            bucket.attribute_rows += 1
+            bucket.attribute_bytes += size
+            self.total.attribute_rows += 1
+            self.total.attribute_bytes += size
+
+    def window(self, seconds: int, now: float) -> WriteCounters:
+        """Return counters for writes within the last `seconds` seconds."""
+        oldest = int((now - seconds) // BUCKET_SECONDS)
+        counters = WriteCounters()
+        for bucket_index, bucket in self.buckets:
+            if bucket_index > oldest:
+                counters.add(bucket)
+        return counters
+
+
+class WriteStats:
+    """Count state writes per entity and device over rolling windows."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self._entities: dict[str, EntityWriteStats] = {}
+
+    def record(
+        self,
+        entity_id: str,
+        device_id: str,
+        attributes: Mapping[str, Any],
+        last_updated: datetime,
+        now: float,
+    ) -> None:
+        """Record a state write.
+
+        Args:
+            entity_id: The entity that wrote its state.
+            device_id: The device the entity belongs to.
+            attributes: The attributes of the state after the write.
+            last_updated: When the state last changed, after the write.
+            now: Monotonic time of the write in seconds.
+        """
+        stats = self._entities.get(entity_id)
+        if stats is None:
+            stats = self._entities[entity_id] = EntityWriteStats(device_id)
+        stats.record(attributes, last_updated, now)
+
+    def _summary(self, stats: EntityWriteStats, now: float) -> dict[str, Any]:
+        return {
+            "total": stats.total.as_dict(),
+            **{
+                name: stats.window(seconds, now).as_dict()
+                for name, seconds in WINDOWS.items()
+            },
+        }
+
+    def as_dict(self, now: float) -> dict[str, dict[str, Any]]:
+        """Return statistics per entity and per device.
+
+        Entities are sorted with the most written entity first.
+        """
+        entities = dict(
+            sorted(
+                self._entities.items(),
+                key=lambda item: item[1].total.writes,
+                reverse=True,
+            )
+        )
+        devices: dict[str, dict[str, WriteCounters]] = {}
+        for stats in entities.values():
+            device = devices.setdefault(
+                stats.device_id,
+                {"total": WriteCounters(), **{n: WriteCounters() for n in WINDOWS}},
+            )
+            device["total"].add(stats.total)
+            for name, seconds in WINDOWS.items():
+                device[name].add(stats.window(seconds, now))
+        return {
+            "entities": {
+                entity_id: self._summary(stats, now)
+                for entity_id, stats in entities.items()
+            },
+            "devices": {
+                device_id: {name: c.as_dict() for name, c in counters.items()}
+                for device_id, counters in devices.items()
+            },
+        }
@@ -0,0 +1,284 @@
+"""A minimal in-process MQTT 3.1.1 broker for end-to-end tests.
+
+The broker implements enough of MQTT 3.1.1 for Home Assistant's MQTT client:
+connect, subscribe and unsubscribe with wildcards, publish with QoS 0-2,
+retained messages and keep alive pings. Messages are always delivered to
+subscribers with QoS 0. There is no authentication and no persistence.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import inspect
+import struct
+
+CONNECT = 1
+CONNACK = 2
+PUBLISH = 3
+PUBACK = 4
+PUBREC = 5
+PUBREL = 6
+PUBCOMP = 7
+SUBSCRIBE = 8
+SUBACK = 9
+UNSUBSCRIBE = 10
+UNSUBACK = 11
+PINGREQ = 12
+PINGRESP = 13
+DISCONNECT = 14
+
+PublishHandler = Callable[[str, bytes], Awaitable[None] | None]
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Return True if `topic` matches `topic_filter`, which may use + and #."""
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for index, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level not in ("+", topic_levels[index]):
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+def _encode_length(length: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        encoded.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(encoded)
+
+
+def _encode_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack("!H", len(data)) + data
+
+
+def _packet(packet_type: int, flags: int, body: bytes) -> bytes:
+    return bytes([packet_type << 4 | flags]) + _encode_length(len(body)) + body
+
+
+@dataclass
+class PublishedMessage:
+    """A message published by a client."""
+
+    topic: str
+    payload: bytes
+    qos: int
+    retain: bool
+
+
+@dataclass
+class _Client:
+    client_id: str
+    writer: asyncio.StreamWriter
+    subscriptions: set[str] = field(default_factory=set)
+
+    def send(self, packet: bytes) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(packet)
+
+
+class MqttBroker:
+    """Accept MQTT clients on localhost and route messages between them.
+
+    Tests can publish to clients with `publish`, inspect messages published
+    by clients in `published` and react to them with `on_publish`. Handlers
+    returning an awaitable run as tasks, so a slow handler does not hold up
+    the packets of its client.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Initialize the broker, listening on a free port by default."""
+        self.host = host
+        self.port = port
+        self.published: list[PublishedMessage] = []
+        self._server: asyncio.Server | None = None
+        self._clients: list[_Client] = []
+        self._retained: dict[str, bytes] = {}
+        self._handlers: list[tuple[str, PublishHandler]] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._changed = asyncio.Condition()
+
+    async def start(self) -> None:
+        """Start accepting connections."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Disconnect all clients and stop accepting connections."""
+        if self._server is not None:
+            self._server.close()
+        for client in self._clients:
+            client.writer.close()
+        # Closed connections see end of stream and finish on their own
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    @property
+    def subscriptions(self) -> set[str]:
+        """Topic filters subscribed to by any client."""
+        return {sub for client in self._clients for sub in client.subscriptions}
+
+    def on_publish(self, topic_filter: str, handler: PublishHandler) -> None:
+        """Call `handler(topic, payload)` for messages published by clients."""
+        self._handlers.append((topic_filter, handler))
+
+    def publish(self, topic: str, payload: bytes | str, retain: bool = False) -> int:
+        """Deliver a message to all subscribed clients.
+
+        Returns:
+            Number of clients the message was delivered to.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        if retain:
+            self._retained[topic] = payload
+        packet = _packet(PUBLISH, int(retain), _encode_string(topic) + payload)
+        delivered = 0
+        for client in self._clients:
+            if any(topic_matches(sub, topic) for sub in client.subscriptions):
+                client.send(packet)
+                delivered += 1
+        return delivered
+
+    async def wait_for(
+        self, predicate: Callable[[], bool], timeout: float = 10
+    ) -> None:
+        """Wait until `predicate` returns True after a broker state change."""
+        async with self._changed:
+            await asyncio.wait_for(self._changed.wait_for(predicate), timeout)
+
+    async def wait_subscribed(self, topic: str, timeout: float = 10) -> None:
+        """Wait until a client subscribes to a filter matching `topic`."""
+        await self.wait_for(
+            lambda: any(topic_matches(sub, topic) for sub in self.subscriptions),
+            timeout,
+        )
+
+    async def wait_published(
+        self, topic_filter: str, count: int = 1, timeout: float = 10
+    ) -> list[PublishedMessage]:
+        """Wait until clients published `count` messages matching the filter."""
+
+        def matching() -> list[PublishedMessage]:
+            return [
+                msg for msg in self.published if topic_matches(topic_filter, msg.topic)
+            ]
+
+        await self.wait_for(lambda: len(matching()) >= count, timeout)
+        return matching()
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        client: _Client | None = None
+        try:
+            while True:
+                header = await reader.readexactly(1)
+                length = 0
+                for shift in range(0, 28, 7):
+                    byte = (await reader.readexactly(1))[0]
+                    length |= (byte & 0x7F) << shift
+                    if not byte & 0x80:
+                        break
+                body = await reader.readexactly(length)
+                packet_type, flags = header[0] >> 4, header[0] & 0x0F
+                if packet_type == CONNECT:
+                    client = _Client(self._client_id(body), writer)
+                    self._clients.append(client)
+                    writer.write(_packet(CONNACK, 0, b"\x00\x00"))
+                elif client is None:
+                    break
+                elif packet_type == PUBLISH:
+                    self._handle_publish(client, flags, body)
+                elif packet_type == PUBREL:
+                    client.send(_packet(PUBCOMP, 0, body[:2]))
+                elif packet_type == SUBSCRIBE:
+                    self._handle_subscribe(client, body)
+                elif packet_type == UNSUBSCRIBE:
+                    self._handle_unsubscribe(client, body)
+                elif packet_type == PINGREQ:
+                    client.send(_packet(PINGRESP, 0, b""))
+                elif packet_type == DISCONNECT:
+                    break
+                await writer.drain()
+                await self._notify()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if client is not None:
+                self._clients.remove(client)
+            writer.close()
+            self._tasks.discard(task)
+
+    @staticmethod
+    def _client_id(body: bytes) -> str:
+        # Protocol name, level, connect flags and keep alive precede the id
+        (name_length,) = struct.unpack_from("!H", body)
+        offset = 2 + name_length + 4
+        (id_length,) = struct.unpack_from("!H", body, offset)
+        return body[offset + 2 : offset + 2 + id_length].decode("utf-8")
+
+    def _handle_publish(self, client: _Client, flags: int, body: bytes) -> None:
+        qos, retain = (flags >> 1) & 0x03, bool(flags & 0x01)
+        (topic_length,) = struct.unpack_from("!H", body)
+        topic = body[2 : 2 + topic_length].decode("utf-8")
+        offset = 2 + topic_length
+        if qos:
+            packet_id = body[offset : offset + 2]
+            offset += 2
+            client.send(_packet(PUBACK if qos == 1 else PUBREC, 0, packet_id))
+        payload = body[offset:]
+        self.published.append(PublishedMessage(topic, payload, qos, retain))
+        self.publish(topic, payload, retain)
+        for topic_filter, handler in self._handlers:
+            if topic_matches(topic_filter, topic):
+                result = handler(topic, payload)
+                # Handlers run on their own, so the client's packets are still
+                # read while a handler waits
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+    def _handle_subscribe(self, client: _Client, body: bytes) -> None:
+        packet_id, offset = body[:2], 2
+        granted = bytearray()
+        new_filters = []
+        while offset < len(body):
+            (length,) = struct.unpack_from("!H", body, offset)
+            topic_filter = body[offset + 2 : offset + 2 + length].decode("utf-8")
+            offset += 2 + length + 1
+            client.subscriptions.add(topic_filter)
+            new_filters.append(topic_filter)
+            granted.append(0)
+        client.send(_packet(SUBACK, 0, packet_id + bytes(granted)))
+        for topic, payload in self._retained.items():
+            if any(topic_matches(sub, topic) for sub in new_filters):
+                client.send(_packet(PUBLISH, 1, _encode_string(topic) + payload))
+
+    def _handle_unsubscribe(self, client: _Client, body: bytes) -> None:
+        packet_id, offset = body[:2], 2
+        while offset < len(body):
+            (length,) = struct.unpack_from("!H", body, offset)
+            client.subscriptions.discard(
+                body[offset + 2 : offset + 2 + length].decode("utf-8")
+            )
+            offset += 2 + length
+        client.send(_packet(UNSUBACK, 0, packet_id))
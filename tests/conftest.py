@@ -5,13 +5,24 @@
 
 from unittest.mock import patch
 
+from homeassistant.components import mqtt
+from homeassistant.components.mqtt.const import CONF_BROKER
+from homeassistant.const import CONF_PORT
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .broker import MqttBroker
 
 
 # This fixture enables loading custom integrations in all tests.
 # Remove to enable selective use of this fixture
+# The recorder has to be set up before hass, which enable_custom_integrations uses,
+# so tests requesting recorder_mock get it first.
 @pytest.fixture(autouse=True)
-def auto_enable_custom_integrations(enable_custom_integrations):
+def auto_enable_custom_integrations(request):
+    if "recorder_mock" in request.fixturenames:
+        request.getfixturevalue("recorder_mock")
+    request.getfixturevalue("enable_custom_integrations")
     yield
 
 
@@ -25,3 +36,28 @@ def skip_notifications_fixture():
         "homeassistant.components.persistent_notification.async_dismiss"
     ):
         yield
+
+
+# This fixture starts an in-process MQTT broker on localhost.
+@pytest.fixture
+async def mqtt_broker(socket_enabled):
+    """Start an MQTT broker for end-to-end tests."""
+    broker = MqttBroker()
+    await broker.start()
+    yield broker
+    await broker.stop()
+
+
+# This fixture sets up Home Assistant's real MQTT integration connected to
+# mqtt_broker. Use it instead of mqtt_mock to exercise the network path.
+@pytest.fixture
+async def mqtt_live(mqtt_broker, hass):
+    """Set up the MQTT integration against the in-process broker."""
+    entry = MockConfigEntry(
+        domain=mqtt.DOMAIN,
+        data={CONF_BROKER: mqtt_broker.host, CONF_PORT: mqtt_broker.port},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    assert await mqtt.async_wait_for_mqtt_client(hass)
+    return mqtt_broker
@@ -0,0 +1,215 @@
+"""Differential equivalence harness for sensor aggregation.
+
+The harness feeds the same windows of events through two sets of sensors. One
+set is updated by the reference `update_state_from_events` implementations and
+the other by a candidate implementation. After each window the state and
+attributes of each pair of sensors are compared. Use it to verify that a new
+aggregation path produces the same states as the current one.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+import json
+import math
+import random
+from typing import Any
+
+from custom_components.ferroamp.mqtt_parser import MqttEvent, MqttMessageParser
+from custom_components.ferroamp.sensor import KeyedFerroampSensor, ehub_sensors
+
+from .generator import TrafficGenerator
+
+# Returns True if the state of the sensor changed, like update_state_from_events
+UpdateFunction = Callable[[KeyedFerroampSensor, list[MqttEvent]], bool]
+
+SensorFactory = Callable[[], list[KeyedFerroampSensor]]
+
+
+def reference_update(sensor: KeyedFerroampSensor, events: list[MqttEvent]) -> bool:
+    """Update a sensor with its current update_state_from_events."""
+    return type(sensor).update_state_from_events(sensor, events)
+
+
+def ehub_sensor_factory() -> list[KeyedFerroampSensor]:
+    """Create all EnergyHub sensors, detached from Home Assistant."""
+    return [
+        sensor
+        for sensor in ehub_sensors("ferroamp", 0, None)
+        if isinstance(sensor, KeyedFerroampSensor)
+    ]
+
+
+@dataclass
+class Snapshot:
+    """Result of updating a sensor with a window of events."""
+
+    changed: bool
+    value: Any
+    attributes: dict[str, Any] | None
+
+
+@dataclass
+class Divergence:
+    """A window after which a candidate sensor differs from the reference."""
+
+    sensor: str
+    window: int
+    values: list[Any]
+    expected: Snapshot
+    actual: Snapshot
+
+    def __str__(self) -> str:
+        """Describe the divergence and the values that triggered it."""
+        return (
+            f"{self.sensor} diverged after window {self.window}: "
+            f"expected {self.expected}, got {self.actual}; window values "
+            f"{self.values}"
+        )
+
+
+def _close(expected: Any, actual: Any, rel_tol: float, abs_tol: float) -> bool:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(
+            _close(expected[key], actual[key], rel_tol, abs_tol) for key in expected
+        )
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return math.isclose(expected, actual, rel_tol=rel_tol, abs_tol=abs_tol)
+    return expected == actual
+
+
+def _buffer(sensor: KeyedFerroampSensor, window: list[MqttEvent]) -> list[MqttEvent]:
+    """Return the events the sensor would buffer from `window`.
+
+    Events go through add_event, so filtering such as ignoring zero energy
+    values is applied, without the sensor ever flushing.
+    """
+    sensor.events = []
+    sensor._added = True
+    sensor._interval = math.inf
+    for event in window:
+        sensor.add_event(event)
+    return sensor.events
+
+
+def _snapshot(sensor: KeyedFerroampSensor, changed: bool) -> Snapshot:
+    attributes = getattr(sensor, "_attr_extra_state_attributes", None)
+    return Snapshot(
+        changed,
+        sensor._attr_native_value,
+        dict(attributes) if attributes is not None else None,
+    )
+
+
+def compare(
+    windows: Iterable[list[MqttEvent]],
+    candidate: UpdateFunction,
+    sensor_factory: SensorFactory = ehub_sensor_factory,
+    rel_tol: float = 1e-9,
+    abs_tol: float = 1e-9,
+) -> list[Divergence]:
+    """Feed windows through reference and candidate sensors and compare them.
+
+    Args:
+        windows: Lists of events, each processed as one update interval.
+        candidate: Update function to verify against the reference.
+        sensor_factory: Creates the sensors to compare, called twice.
+        rel_tol: Relative tolerance for numeric states and attributes.
+        abs_tol: Absolute tolerance for numeric states and attributes.
+
+    Returns:
+        The first divergence of each sensor. Once a sensor has diverged, its
+        state carries over into later windows, so later windows are not
+        compared for it.
+    """
+    reference = sensor_factory()
+    candidates = sensor_factory()
+    divergences: dict[str, Divergence] = {}
+    for index, window in enumerate(windows):
+        for expected_sensor, actual_sensor in zip(reference, candidates):
+            if expected_sensor.unique_id in divergences:
+                continue
+            expected = _snapshot(
+                expected_sensor,
+                reference_update(expected_sensor, _buffer(expected_sensor, window)),
+            )
+            actual = _snapshot(
+                actual_sensor,
+                candidate(actual_sensor, _buffer(actual_sensor, window)),
+            )
+            if expected.changed != actual.changed or not (
+                _close(expected.value, actual.value, rel_tol, abs_tol)
+                and _close(expected.attributes, actual.attributes, rel_tol, abs_tol)
+            ):
+                divergences[expected_sensor.unique_id] = Divergence(
+                    expected_sensor.unique_id,
+                    index,
+                    [
+                        MqttMessageParser.get_value(event, expected_sensor._state_key)
+                        for event in window
+                    ],
+                    expected,
+                    actual,
+                )
+    return list(divergences.values())
+
+
+def _perturb(payload: dict[str, Any], rng: random.Random) -> dict[str, Any]:
+    """Apply an anomaly seen in real traffic to an ehub payload."""
+    key = rng.choice([key for key in payload if key != "ts"])
+    anomaly = rng.randrange(4)
+    if anomaly == 0:
+        del payload[key]
+    elif anomaly == 1:
+        payload[key] = {name: "0" for name in payload[key]}
+    elif anomaly == 2:
+        # Counter dip within 10%, ignored by the energy monotonicity check
+        payload[key] = {
+            name: str(float(value) * 0.95) for name, value in payload[key].items()
+        }
+    else:
+        # Counter reset below 10%, accepted by the energy monotonicity check
+        payload[key] = {
+            name: str(float(value) * 0.5) for name, value in payload[key].items()
+        }
+    return payload
+
+
+def random_windows(
+    seed: int = 0,
+    count: int = 200,
+    max_size: int = 60,
+    anomaly_probability: float = 0.05,
+) -> Iterator[list[MqttEvent]]:
+    """Yield windows of generated ehub events with random sizes and anomalies."""
+    rng = random.Random(seed)
+    generator = TrafficGenerator(seed=seed)
+    generator.advance(rng.uniform(0, 86400))
+    for _ in range(count):
+        window = []
+        for _ in range(rng.randint(1, max_size)):
+            generator.advance(1)
+            payload = generator.ehub_payload()
+            if rng.random() < anomaly_probability:
+                payload = _perturb(payload, rng)
+            window.append(json.loads(json.dumps(payload)))
+        yield window
+
+
+def capture_windows(
+    path: str, size: int, topic: str = "data/ehub"
+) -> Iterator[list[MqttEvent]]:
+    """Yield windows of `size` events from a capture made by benchmarks.capture."""
+    from benchmarks.capture import read_capture
+
+    _, messages = read_capture(path)
+    window: list[MqttEvent] = []
+    for message in messages:
+        if message.topic == topic:
+            window.append(json.loads(message.payload))
+            if len(window) == size:
+                yield window
+                window = []
+    if window:
+        yield window
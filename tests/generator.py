@@ -0,0 +1,376 @@
+"""Synthetic Ferroamp ExtApi traffic for load and soak tests.
+
+The generator simulates a site with solar panels, a battery and a three phase
+load, and emits ehub, sso, eso and esm payloads describing it. Energy counters
+only rise, phase values are consistent with each other (grid power is load
+power plus inverter power) and battery state of charge follows the battery
+power.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import heapq
+import json
+import math
+import random
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+
+from custom_components.ferroamp.const import (
+    FAULT_CODES_ESO,
+    FAULT_CODES_SSO,
+    TOPIC_EHUB,
+    TOPIC_ESM,
+    TOPIC_ESO,
+    TOPIC_INTERVALS,
+    TOPIC_SSO,
+)
+
+PHASES = ("L1", "L2", "L3")
+
+# Energy counters are reported in mJ
+MJ_PER_WS = 1000
+
+TS_FORMAT = "%Y-%m-%dT%H:%M:%SUTC"
+
+
+@dataclass
+class GeneratedMessage:
+    """A payload to publish at a simulated point in time."""
+
+    at: datetime
+    topic: str
+    payload: str
+
+
+@dataclass
+class _Counters:
+    """Energy counters in mJ for one direction per phase."""
+
+    values: dict[str, float] = field(
+        default_factory=lambda: {phase: 1e12 for phase in PHASES}
+    )
+
+    def add(self, powers: Mapping[str, float], seconds: float) -> None:
+        for phase in PHASES:
+            self.values[phase] += max(powers[phase], 0) * seconds * MJ_PER_WS
+
+
+@dataclass
+class _Sso:
+    id: str
+    share: float
+    wpv: float = 5e11
+    faultcode: int = 0
+
+
+@dataclass
+class _Eso:
+    id: str
+    wbatprod: float = 2e12
+    wbatcons: float = 2e12
+    faultcode: int = 0
+
+
+def _phases(values: Mapping[str, float]) -> dict[str, str]:
+    return {phase: f"{values[phase]:.2f}" for phase in PHASES}
+
+
+def _counter_phases(counters: _Counters) -> dict[str, str]:
+    return {phase: f"{counters.values[phase]:.0f}" for phase in PHASES}
+
+
+class TrafficGenerator:
+    """Generate realistic ExtApi traffic for a simulated Ferroamp site.
+
+    Args:
+        prefix: MQTT prefix the topics are published under.
+        sso_count: Number of SSOs (solar string optimizers).
+        eso_count: Number of ESOs (battery converters).
+        esm_count: Number of ESMs (battery modules).
+        start: Simulated time of the first message.
+        intervals: Seconds between messages per topic, defaults to the
+            intervals used by the EnergyHub.
+        seed: Seed for the random number generator.
+        fault_probability: Probability per SSO/ESO message that a fault code
+            bit is toggled.
+        solar_peak: Solar power in W at noon on a clear day.
+        battery_capacity: Battery capacity in Wh.
+        battery_power: Maximum battery charge and discharge power in W.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "extapi",
+        sso_count: int = 1,
+        eso_count: int = 1,
+        esm_count: int = 1,
+        start: datetime | None = None,
+        intervals: Mapping[str, float] | None = None,
+        seed: int = 0,
+        fault_probability: float = 0.0,
+        solar_peak: float = 10000.0,
+        battery_capacity: float = 15300.0,
+        battery_power: float = 7000.0,
+    ) -> None:
+        """Initialize the simulated site."""
+        self.prefix = prefix
+        self.intervals = {**TOPIC_INTERVALS, **(intervals or {})}
+        self.now = start or datetime(2021, 6, 1, 4, 0, tzinfo=UTC)
+        self.fault_probability = fault_probability
+        self.solar_peak = solar_peak
+        self.battery_capacity = battery_capacity
+        self.battery_power = battery_power
+        self._random = random.Random(seed)
+
+        weights = [self._random.uniform(0.8, 1.2) for _ in range(sso_count)]
+        self.ssos = [
+            _Sso(f"PS00990-A04-S{20120000 + n}", weight / sum(weights))
+            for n, weight in enumerate(weights)
+        ]
+        self.esos = [_Eso(str(20030049 + n)) for n in range(eso_count)]
+        self.esm_ids = [f"ES01Z{80000000 + n}" for n in range(esm_count)]
+
+        self.soc = 50.0
+        self.soh = 98.9
+        self.cloud = 1.0
+        self.base_load = {"L1": 400.0, "L2": 250.0, "L3": 600.0}
+        self.load = dict(self.base_load)
+        self.ul = {phase: 230.0 for phase in PHASES}
+        self.gridfreq = 50.0
+        self.ppv = 0.0
+        self.pbat = 0.0
+        self.pinv = {phase: 0.0 for phase in PHASES}
+        self.pload = {phase: 0.0 for phase in PHASES}
+        self.pext = {phase: 0.0 for phase in PHASES}
+        self.wpv = 4e12
+        self.wbatprod = 4e12
+        self.wbatcons = 4e12
+        self.wextcons = _Counters()
+        self.wextprod = _Counters()
+        self.winvcons = _Counters()
+        self.winvprod = _Counters()
+        self.wloadcons = _Counters()
+        self.wloadprod = _Counters()
+        self._update_powers()
+
+    def _walk(self, value: float, step: float, low: float, high: float) -> float:
+        return min(max(value + self._random.gauss(0, step), low), high)
+
+    def _update_powers(self) -> None:
+        hour = self.now.hour + self.now.minute / 60 + self.now.second / 3600
+        sun = max(math.sin(math.pi * (hour - 6) / 12), 0)
+        self.ppv = self.solar_peak * sun * self.cloud
+        for phase in PHASES:
+            self.load[phase] = self._walk(
+                self.load[phase], 20, 50, self.base_load[phase] * 4
+            )
+            self.ul[phase] = self._walk(self.ul[phase], 0.3, 225, 235)
+        self.gridfreq = self._walk(self.gridfreq, 0.01, 49.9, 50.1)
+
+        surplus = self.ppv - sum(self.load.values())
+        if surplus > 0 and self.soc < 100:
+            self.pbat = -min(surplus, self.battery_power)
+        elif surplus < 0 and self.soc > 10:
+            self.pbat = min(-surplus, self.battery_power)
+        else:
+            self.pbat = 0.0
+
+        # The inverter feeds solar and battery power to the AC side, with losses
+        inverter = -(self.ppv + self.pbat) * 0.97
+        for phase in PHASES:
+            self.pinv[phase] = inverter / 3
+            self.pload[phase] = self.load[phase]
+            self.pext[phase] = self.pload[phase] + self.pinv[phase]
+
+    def advance(self, seconds: float) -> None:
+        """Advance the simulation, integrating energy over `seconds`."""
+        self.wpv += self.ppv * seconds * MJ_PER_WS
+        self.wbatprod += max(-self.pbat, 0) * seconds * MJ_PER_WS
+        self.wbatcons += max(self.pbat, 0) * seconds * MJ_PER_WS
+        self.wextcons.add(self.pext, seconds)
+        self.wextprod.add({p: -v for p, v in self.pext.items()}, seconds)
+        self.winvcons.add(self.pinv, seconds)
+        self.winvprod.add({p: -v for p, v in self.pinv.items()}, seconds)
+        self.wloadcons.add(self.pload, seconds)
+        self.wloadprod.add({p: -v for p, v in self.pload.items()}, seconds)
+        for sso in self.ssos:
+            sso.wpv += self.ppv * sso.share * seconds * MJ_PER_WS
+        for eso in self.esos:
+            eso.wbatprod += max(-self.pbat, 0) / len(self.esos) * seconds * MJ_PER_WS
+            eso.wbatcons += max(self.pbat, 0) / len(self.esos) * seconds * MJ_PER_WS
+
+        self.soc = min(
+            max(self.soc - self.pbat * seconds / 3600 / self.battery_capacity * 100, 0),
+            100,
+        )
+        self.cloud = self._walk(self.cloud, 0.01 * math.sqrt(seconds), 0.2, 1)
+        self.now += timedelta(seconds=seconds)
+        self._update_powers()
+
+    def _toggle_fault(self, faultcode: int, codes: int) -> int:
+        if self._random.random() < self.fault_probability:
+            return faultcode ^ (1 << self._random.randrange(codes))
+        return faultcode
+
+    def _ts(self) -> dict[str, str]:
+        return {"val": self.now.strftime(TS_FORMAT)}
+
+    def ehub_payload(self) -> dict:
+        """Return an ehub payload for the current state."""
+        iext = {p: self.pext[p] / self.ul[p] for p in PHASES}
+        iload = {p: self.pload[p] / self.ul[p] for p in PHASES}
+        il = {p: self.pinv[p] / self.ul[p] for p in PHASES}
+        reactive = {p: self.pload[p] * 0.2 for p in PHASES}
+        iavbl = {p: 32 - abs(iext[p]) for p in PHASES}
+        sext = math.sqrt(sum(self.pext.values()) ** 2 + sum(reactive.values()) ** 2)
+        udc = 380 + self._random.uniform(-5, 5)
+        return {
+            "gridfreq": {"val": f"{self.gridfreq:.2f}"},
+            "iace": _phases({p: 0.0 for p in PHASES}),
+            "ul": _phases(self.ul),
+            "il": _phases(il),
+            "ild": _phases({p: il[p] * 0.98 for p in PHASES}),
+            "ilq": _phases({p: il[p] * 0.2 for p in PHASES}),
+            "iext": _phases(iext),
+            "iextd": _phases({p: iext[p] * 0.98 for p in PHASES}),
+            "iextq": _phases({p: iext[p] * 0.2 for p in PHASES}),
+            "iloadd": _phases({p: iload[p] * 0.98 for p in PHASES}),
+            "iloadq": _phases({p: iload[p] * 0.2 for p in PHASES}),
+            "iavbl": _phases(iavbl),
+            "iavblq": _phases(iavbl),
+            "iavblq_3p": {"val": f"{min(iavbl.values()):.2f}"},
+            "sext": {"val": f"{sext:.2f}"},
+            "pext": _phases(self.pext),
+            "pextreactive": _phases(reactive),
+            "pinv": _phases(self.pinv),
+            "pinvreactive": _phases({p: 0.0 for p in PHASES}),
+            "pload": _phases(self.pload),
+            "ploadreactive": _phases(reactive),
+            "ppv": {"val": f"{self.ppv:.2f}"},
+            "pbat": {"val": f"{self.pbat:.2f}"},
+            "udc": {"pos": f"{udc:.2f}", "neg": f"{-udc:.2f}"},
+            "wextprodq": _counter_phases(self.wextprod),
+            "wextconsq": _counter_phases(self.wextcons),
+            "winvprodq": _counter_phases(self.winvprod),
+            "winvconsq": _counter_phases(self.winvcons),
+            "wloadprodq": _counter_phases(self.wloadprod),
+            "wloadconsq": _counter_phases(self.wloadcons),
+            "wpv": {"val": f"{self.wpv:.0f}"},
+            "wbatprod": {"val": f"{self.wbatprod:.0f}"},
+            "wbatcons": {"val": f"{self.wbatcons:.0f}"},
+            "soc": {"val": f"{self.soc:.1f}"},
+            "soh": {"val": f"{self.soh:.1f}"},
+            "ratedcap": {"val": f"{self.battery_capacity:.0f}"},
+            "state": {"val": "4097"},
+            "ts": self._ts(),
+        }
+
+    def sso_payload(self, sso: _Sso) -> dict:
+        """Return an sso payload for the current state."""
+        sso.faultcode = self._toggle_fault(sso.faultcode, len(FAULT_CODES_SSO))
+        ppv = self.ppv * sso.share
+        upv = 600 + 60 * self.cloud if ppv > 0 else 0.0
+        return {
+            "id": {"val": sso.id},
+            "upv": {"val": f"{upv:.3f}"},
+            "ipv": {"val": f"{ppv / upv if upv else 0:.3f}"},
+            "udc": {"val": f"{760 + self._random.uniform(-10, 10):.3f}"},
+            "wpv": {"val": f"{sso.wpv:.0f}"},
+            "temp": {"val": f"{15 + ppv / 500:.3f}"},
+            "relaystatus": {"val": "0"},
+            "faultcode": {"val": f"{sso.faultcode:x}"},
+            "ts": self._ts(),
+        }
+
+    def eso_payload(self, eso: _Eso) -> dict:
+        """Return an eso payload for the current state."""
+        eso.faultcode = self._toggle_fault(eso.faultcode, len(FAULT_CODES_ESO))
+        ubat = 580 + self.soc * 0.5
+        return {
+            "id": {"val": eso.id},
+            "soc": {"val": round(self.soc, 6)},
+            "ubat": {"val": round(ubat, 3)},
+            "ibat": {"val": round(self.pbat / len(self.esos) / ubat, 3)},
+            "temp": {"val": round(20 + abs(self.pbat) / 1000, 3)},
+            "wbatprod": {"val": round(eso.wbatprod)},
+            "wbatcons": {"val": round(eso.wbatcons)},
+            "relaystatus": {"val": "0"},
+            "faultcode": {"val": f"{eso.faultcode:x}"},
+            "ts": self._ts(),
+        }
+
+    def esm_payload(self, esm_id: str) -> dict:
+        """Return an esm payload for the current state."""
+        return {
+            "id": {"val": esm_id},
+            "soc": {"val": f"{self.soc:.1f}"},
+            "soh": {"val": f"{self.soh:.1f}"},
+            "ratedCapacity": {"val": f"{self.battery_capacity:.0f}"},
+            "ratedPower": {"val": f"{self.battery_power:.0f}"},
+            "status": {"val": "0"},
+        }
+
+    def _payloads(self, topic: str) -> list[dict]:
+        if topic == TOPIC_EHUB:
+            return [self.ehub_payload()]
+        if topic == TOPIC_SSO:
+            return [self.sso_payload(sso) for sso in self.ssos]
+        if topic == TOPIC_ESO:
+            return [self.eso_payload(eso) for eso in self.esos]
+        return [self.esm_payload(esm_id) for esm_id in self.esm_ids]
+
+    def messages(self, duration: timedelta) -> Iterator[GeneratedMessage]:
+        """Yield messages for `duration` of simulated time in time order.
+
+        Every topic publishes once at the start and then at its interval.
+        SSO, ESO and ESM topics publish one message per device.
+        """
+        end = self.now + duration
+        order = (TOPIC_EHUB, TOPIC_SSO, TOPIC_ESO, TOPIC_ESM)
+        due = [(self.now, order.index(topic), topic) for topic in order]
+        heapq.heapify(due)
+        while due[0][0] < end:
+            at, index, topic = heapq.heappop(due)
+            if at > self.now:
+                self.advance((at - self.now).total_seconds())
+            for payload in self._payloads(topic):
+                yield GeneratedMessage(
+                    at, f"{self.prefix}/{topic}", json.dumps(payload)
+                )
+            heapq.heappush(
+                due, (at + timedelta(seconds=self.intervals[topic]), index, topic)
+            )
+
+    async def async_publish(
+        self,
+        hass: HomeAssistant,
+        duration: timedelta,
+        speed: float | None = None,
+    ) -> int:
+        """Fire generated messages into Home Assistant.
+
+        Args:
+            hass: Home Assistant instance with MQTT mocked.
+            duration: Simulated time to generate traffic for.
+            speed: How many times faster than real time to publish, or None
+                to publish as fast as possible.
+
+        Returns:
+            Number of messages fired.
+        """
+        count = 0
+        previous: datetime | None = None
+        for message in self.messages(duration):
+            if speed is not None and previous is not None and message.at > previous:
+                await asyncio.sleep((message.at - previous).total_seconds() / speed)
+            previous = message.at
+            async_fire_mqtt_message(hass, message.topic, message.payload)
+            count += 1
+        await hass.async_block_till_done(wait_background_tasks=True)
+        return count
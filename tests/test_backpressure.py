@@ -0,0 +1,51 @@
+"""Tests for the backpressure module."""
+
+from custom_components.ferroamp.backpressure import BackpressureMonitor
+
+
+class TestBackpressureMonitor:
+    """Tests for BackpressureMonitor."""
+
+    def test_clock_offset(self):
+        """Test that a constant lag, such as a clock offset, is not degraded."""
+        monitor = BackpressureMonitor()
+        for now in range(10):
+            assert not monitor.update(-20.0, 3, now)
+        assert monitor.as_dict(10)["lag_baseline"] == -20.0
+
+    def test_degrade_and_recover(self):
+        """Test that a lag above the threshold degrades until it recovers."""
+        monitor = BackpressureMonitor()
+        assert not monitor.update(0.5, 3, 0)
+        assert not monitor.update(3.0, 3, 1)
+        assert monitor.update(4.0, 3, 2)
+        # Within the threshold but not within half of it, still degraded
+        assert monitor.update(2.5, 3, 3)
+        assert not monitor.update(1.5, 3, 7)
+        assert monitor.as_dict(10) == {
+            "degraded": False,
+            "episodes": 1,
+            "degraded_seconds": 5.0,
+            "coalesced": 0,
+            "lag_last": 1.5,
+            "lag_baseline": 0.57,
+        }
+
+    def test_degraded_seconds_include_current_episode(self):
+        """Test that degraded time counts until now while degraded."""
+        monitor = BackpressureMonitor()
+        monitor.update(0.0, 3, 0)
+        monitor.update(10.0, 3, 1)
+        result = monitor.as_dict(4)
+        assert result["degraded"]
+        assert result["degraded_seconds"] == 3.0
+
+    def test_baseline_rises(self):
+        """Test that a clock step is absorbed by the rising baseline."""
+        monitor = BackpressureMonitor()
+        monitor.update(0.0, 3, 0)
+        assert monitor.update(5.0, 3, 1)
+        assert monitor.update(5.0, 3, 300)
+        assert not monitor.update(5.0, 3, 400)
+        monitor.update(5.0, 3, 700)
+        assert monitor.baseline == 5.0
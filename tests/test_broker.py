@@ -0,0 +1,136 @@
+"""End-to-end tests through the in-process MQTT broker."""
+
+import asyncio
+from datetime import timedelta
+import json
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ferroamp.const import CONF_INTERVAL, DOMAIN
+
+from .broker import topic_matches
+from .generator import TrafficGenerator
+
+
+@pytest.mark.parametrize(
+    ("topic_filter", "topic", "expected"),
+    [
+        ("extapi/data/ehub", "extapi/data/ehub", True),
+        ("extapi/data/ehub", "extapi/data/sso", False),
+        ("extapi/#", "extapi/data/ehub", True),
+        ("extapi/#", "extapi", True),
+        ("extapi/+/ehub", "extapi/data/ehub", True),
+        ("extapi/+", "extapi/data/ehub", False),
+        ("extapi/data/ehub/+", "extapi/data/ehub", False),
+        ("#", "extapi/data/ehub", True),
+    ],
+)
+def test_topic_matches(topic_filter, topic, expected):
+    assert topic_matches(topic_filter, topic) is expected
+
+
+async def setup_ferroamp(hass, broker):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    for topic in ("data/ehub", "data/sso", "data/eso", "data/esm", "control/response"):
+        await broker.wait_subscribed(f"extapi/{topic}")
+
+
+async def wait_for_state(hass, entity_id, predicate=None, timeout=10):
+    """Wait for the state of `entity_id` to exist and match `predicate`."""
+    async with asyncio.timeout(timeout):
+        while True:
+            state = hass.states.get(entity_id)
+            if state is not None and (predicate is None or predicate(state)):
+                return state
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_ingest_through_broker(hass, mqtt_live):
+    await setup_ferroamp(hass, mqtt_live)
+
+    generator = TrafficGenerator(sso_count=2)
+    for message in generator.messages(timedelta(seconds=10)):
+        assert mqtt_live.publish(message.topic, message.payload) == 1
+
+    await wait_for_state(hass, "sensor.ferroamp_sso_20120001_pv_string_power")
+    await wait_for_state(hass, "sensor.ferroamp_eso_20030049_state_of_charge")
+    await wait_for_state(hass, "sensor.ferroamp_esm_80000000_state_of_health")
+    state = await wait_for_state(hass, "sensor.ferroamp_external_voltage")
+    assert 3 * 225 <= float(state.state) <= 3 * 235
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_control_round_trip_through_broker(hass, mqtt_live):
+    await setup_ferroamp(hass, mqtt_live)
+
+    # Act as the EnergyHub and acknowledge every control request
+    def respond(topic, payload):
+        request = json.loads(payload)
+        mqtt_live.publish(
+            "extapi/control/response",
+            json.dumps(
+                {"transId": request["transId"], "status": "ack", "msg": "accepted"}
+            ),
+        )
+
+    mqtt_live.on_publish("extapi/control/request", respond)
+    await hass.services.async_call(DOMAIN, "charge", {"power": 1000}, blocking=True)
+
+    requests = await mqtt_live.wait_published("extapi/control/request", count=2)
+    assert json.loads(requests[-1].payload)["cmd"] == {"name": "charge", "arg": 1000}
+    state = await wait_for_state(
+        hass,
+        "sensor.ferroamp_control_status",
+        lambda state: state.attributes.get("status") == "ack",
+    )
+    assert state.state == "charge (1000)"
+    assert state.attributes["message"] == "accepted"
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_slow_hub_does_not_block_client(hass, mqtt_live):
+    await setup_ferroamp(hass, mqtt_live)
+
+    # Act as an EnergyHub that only responds once released
+    release = asyncio.Event()
+
+    async def respond(topic, payload):
+        await release.wait()
+        request = json.loads(payload)
+        mqtt_live.publish(
+            "extapi/control/response",
+            json.dumps({"transId": request["transId"], "status": "ack", "msg": ""}),
+        )
+
+    mqtt_live.on_publish("extapi/control/request", respond)
+    await hass.services.async_call(DOMAIN, "charge", {"power": 1000}, blocking=True)
+    await hass.services.async_call(DOMAIN, "discharge", {"power": 500}, blocking=True)
+
+    # The second request is read while the hub still holds the first
+    requests = await mqtt_live.wait_published(
+        "extapi/control/request", count=3, timeout=2
+    )
+    assert json.loads(requests[-1].payload)["cmd"] == {
+        "name": "discharge",
+        "arg": 500,
+    }
+    release.set()
+    state = await wait_for_state(
+        hass,
+        "sensor.ferroamp_control_status",
+        lambda state: state.state == "discharge (500)"
+        and state.attributes.get("status") == "ack",
+    )
+    assert state.attributes["message"] == ""
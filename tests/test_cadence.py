@@ -0,0 +1,99 @@
+"""Tests for the cadence tracker module."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.ferroamp.cadence import CadenceStats, CadenceTracker
+from custom_components.ferroamp.const import TOPIC_EHUB, TOPIC_ESM
+
+START = datetime(2021, 3, 8, 8, 43, 12, tzinfo=UTC)
+
+
+def ts_event(ts: datetime) -> dict:
+    return {"ts": {"val": ts.strftime("%Y-%m-%dT%H:%M:%SUTC")}}
+
+
+class TestCadenceStats:
+    """Tests for CadenceStats."""
+
+    def test_first_message(self):
+        """Test that a single message records lag but no jitter."""
+        stats = CadenceStats(expected=1)
+        stats.record(START + timedelta(seconds=2), START)
+        result = stats.as_dict()
+        assert result["count"] == 1
+        assert result["missed"] == 0
+        assert result["jitter_avg"] is None
+        assert result["bridge_lag_last"] == 2.0
+        assert result["bridge_lag_avg"] == 2.0
+        assert result["bridge_lag_max"] == 2.0
+
+    def test_jitter(self):
+        """Test jitter is the deviation from the nominal interval."""
+        stats = CadenceStats(expected=1)
+        stats.record(START, None)
+        stats.record(START + timedelta(seconds=1.5), None)
+        stats.record(START + timedelta(seconds=2.5), None)
+        result = stats.as_dict()
+        assert result["jitter_avg"] == 0.25
+        assert result["jitter_max"] == 0.5
+        assert result["bridge_lag_last"] is None
+        assert result["bridge_lag_avg"] is None
+        assert result["bridge_lag_max"] is None
+        assert result["last_ts"] is None
+
+    def test_missed_messages(self):
+        """Test missed messages are counted from device timestamp gaps."""
+        stats = CadenceStats(expected=5)
+        stats.record(START, START)
+        stats.record(START + timedelta(seconds=5), START + timedelta(seconds=5))
+        assert stats.missed == 0
+        stats.record(START + timedelta(seconds=20), START + timedelta(seconds=20))
+        assert stats.missed == 2
+
+    def test_bridge_lag(self):
+        """Test bridge lag statistics."""
+        stats = CadenceStats(expected=1)
+        stats.record(START + timedelta(seconds=1), START)
+        stats.record(START + timedelta(seconds=4), START + timedelta(seconds=1))
+        result = stats.as_dict()
+        assert result["bridge_lag_last"] == 3.0
+        assert result["bridge_lag_avg"] == 2.0
+        assert result["bridge_lag_max"] == 3.0
+        assert result["last_ts"] == (START + timedelta(seconds=1)).isoformat()
+
+
+class TestCadenceTracker:
+    """Tests for CadenceTracker."""
+
+    def test_record_per_topic_and_device(self):
+        """Test statistics are kept per topic and device."""
+        tracker = CadenceTracker()
+        tracker.record(TOPIC_EHUB, "ehub", ts_event(START), START)
+        tracker.record(TOPIC_ESM, "1", ts_event(START), START)
+        tracker.record(TOPIC_ESM, "2", {}, START)
+        assert tracker.get(TOPIC_EHUB, "ehub").expected == 1
+        assert tracker.get(TOPIC_ESM, "1").expected == 60
+        assert tracker.get(TOPIC_ESM, "2").lag_count == 0
+        assert tracker.get(TOPIC_ESM, "3") is None
+        result = tracker.as_dict()
+        assert set(result.keys()) == {TOPIC_EHUB, TOPIC_ESM}
+        assert set(result[TOPIC_ESM].keys()) == {"1", "2"}
+
+    def test_custom_intervals(self):
+        """Test unknown topics fall back to a one second interval."""
+        tracker = CadenceTracker({"custom": 10})
+        tracker.record("custom", "a", {}, START)
+        tracker.record("other", "a", {}, START)
+        assert tracker.get("custom", "a").expected == 10
+        assert tracker.get("other", "a").expected == 1
+
+    def test_factor(self):
+        """Test decimated messages are expected a number of intervals apart."""
+        tracker = CadenceTracker()
+        for second in (0, 3, 6, 10):
+            at = START + timedelta(seconds=second)
+            tracker.record(TOPIC_EHUB, "ehub", ts_event(at), at, 3)
+        stats = tracker.get(TOPIC_EHUB, "ehub")
+        assert stats.expected == 3
+        assert stats.missed == 0
+        assert stats.as_dict()["jitter_max"] == 1.0
@@ -6,7 +6,7 @@ import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ferroamp import CONF_NAME, CONF_PREFIX, config_flow
-from custom_components.ferroamp.const import CONF_INTERVAL
+from custom_components.ferroamp.const import CONF_HEARTBEAT, CONF_INTERVAL
 
 pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
 
@@ -112,3 +112,72 @@ async def test_options_flow(hass, mqtt_mock):
     assert config_entry.options == {
         CONF_INTERVAL: 20,
     }
+
+
+async def test_options_flow_optional(hass, mqtt_mock):
+    """Test optional options in sections are stored flat."""
+    config_entry = MockConfigEntry(
+        domain=config_flow.DOMAIN,
+        unique_id="ferroamp",
+        data={
+            CONF_NAME: "Ferroamp",
+            CONF_PREFIX: "extapi",
+        },
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_INTERVAL: 20,
+            "intervals": {"power_interval": 5},
+            "deadbands": {
+                "power_deadband": 10,
+                "voltage_deadband_percent": 0.5,
+                CONF_HEARTBEAT: 600,
+            },
+            "performance": {},
+        },
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert config_entry.options == {
+        CONF_INTERVAL: 20,
+        "power_interval": 5,
+        "power_deadband": 10.0,
+        "voltage_deadband_percent": 0.5,
+        CONF_HEARTBEAT: 600,
+    }
+
+
+@pytest.mark.parametrize(
+    "user_input",
+    [
+        {CONF_INTERVAL: 0},
+        {CONF_INTERVAL: 20, "intervals": {"power_interval": 0}},
+        {CONF_INTERVAL: 20, "deadbands": {CONF_HEARTBEAT: 0}},
+        {CONF_INTERVAL: 20, "power_interval": 5},
+    ],
+)
+async def test_options_flow_invalid(hass, mqtt_mock, user_input):
+    """Test intervals of 0 and options outside their section are rejected."""
+    config_entry = MockConfigEntry(
+        domain=config_flow.DOMAIN,
+        unique_id="ferroamp",
+        data={
+            CONF_NAME: "Ferroamp",
+            CONF_PREFIX: "extapi",
+        },
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    with pytest.raises(data_entry_flow.InvalidData):
+        await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input=user_input
+        )
+    assert config_entry.options == {}
@@ -0,0 +1,54 @@
+"""Tests for the decimation module."""
+
+from custom_components.ferroamp.const import TOPIC_EHUB, TOPIC_SSO
+from custom_components.ferroamp.decimation import Decimator, decimation_factor
+
+
+def accepted(decimator: Decimator, every: int, period: float, times: list[float]):
+    return [now for now in times if decimator.accept(TOPIC_EHUB, every, period, now)]
+
+
+class TestDecimator:
+    """Tests for Decimator."""
+
+    def test_disabled(self):
+        """Test that all messages are processed without decimation."""
+        decimator = Decimator()
+        assert accepted(decimator, 1, 0, [0, 1, 2]) == [0, 1, 2]
+        assert decimator.as_dict() == {}
+
+    def test_every(self):
+        """Test that only every Nth message is processed."""
+        decimator = Decimator()
+        assert accepted(decimator, 3, 0, list(range(7))) == [0, 3, 6]
+        assert decimator.as_dict() == {TOPIC_EHUB: 4}
+
+    def test_period(self):
+        """Test that at most one message per period is processed."""
+        decimator = Decimator()
+        times = [0, 1, 4.9, 5, 6, 9.9, 10.5]
+        assert accepted(decimator, 1, 5, times) == [0, 5, 10.5]
+        assert decimator.as_dict() == {TOPIC_EHUB: 4}
+
+    def test_every_and_period(self):
+        """Test that a message must pass both every and period."""
+        decimator = Decimator()
+        assert accepted(decimator, 2, 3, list(range(9))) == [0, 4, 8]
+
+    def test_topics(self):
+        """Test that topics are decimated independently."""
+        decimator = Decimator()
+        assert decimator.accept(TOPIC_EHUB, 2, 0, 0)
+        assert decimator.accept(TOPIC_SSO, 2, 0, 0)
+        assert not decimator.accept(TOPIC_EHUB, 2, 0, 1)
+        assert decimator.as_dict() == {TOPIC_EHUB: 1}
+
+
+def test_decimation_factor():
+    assert decimation_factor(1, 1, 0) == 1
+    assert decimation_factor(1, 0, 0) == 1
+    assert decimation_factor(1, 3, 0) == 3
+    assert decimation_factor(1, 1, 5) == 5
+    assert decimation_factor(1, 1, 0.5) == 1
+    # Every second message, of which at most one per 3 seconds: 0, 4, 8
+    assert decimation_factor(1, 2, 3) == 4
@@ -0,0 +1,207 @@
+from unittest.mock import patch
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+from homeassistant.helpers import entity_registry
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.ferroamp.const import (
+    CONF_DIAGNOSTIC_ATTRIBUTES,
+    CONF_INTERVAL,
+    DOMAIN,
+)
+from custom_components.ferroamp.diagnostics import async_get_config_entry_diagnostics
+from custom_components.ferroamp.sensor import CurrentFerroampSensor
+
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+
+def create_config():
+    return MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={
+            CONF_INTERVAL: 0,
+        },
+        version=1,
+        unique_id="ferroamp",
+    )
+
+
+async def test_cadence_diagnostics(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    async_fire_mqtt_message(
+        hass, "extapi/data/ehub", '{"ts": {"val": "2021-03-08T08:43:12UTC"}}'
+    )
+    async_fire_mqtt_message(
+        hass, "extapi/data/ehub", '{"ts": {"val": "2021-03-08T08:43:15UTC"}}'
+    )
+    async_fire_mqtt_message(hass, "extapi/data/eso", '{"id": {"val": "1"}}')
+    async_fire_mqtt_message(
+        hass, "extapi/data/sso", '{"id": {"val": "PS00990-A02-S2"}}'
+    )
+    async_fire_mqtt_message(hass, "extapi/data/esm", '{"id": {"val": "3"}}')
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    phases = [(m["phase"], m.get("topic")) for m in result["timeline"]]
+    # The version and control status sensors are added before subscribing
+    assert phases[:7] == [
+        ("setup", None),
+        ("mqtt_ready", None),
+        ("setup_entry", None),
+        ("platform_setup", None),
+        ("entities_added", None),
+        ("entities_added", None),
+        ("subscribed", "data/ehub"),
+    ]
+    assert ("extapiversion_requested", None) in phases
+    assert ("first_message", "data/ehub") in phases
+    assert ("first_message", "data/esm") in phases
+    assert ("entities_added", None) in phases
+
+    cadence = result["cadence"]
+    assert cadence["data/ehub"]["ehub"]["count"] == 2
+    assert cadence["data/ehub"]["ehub"]["missed"] == 2
+    assert cadence["data/ehub"]["ehub"]["last_ts"] == "2021-03-08T08:43:15+00:00"
+    assert cadence["data/eso"]["1"]["count"] == 1
+    assert cadence["data/eso"]["1"]["expected_interval"] == 5
+    assert cadence["data/sso"]["2"]["count"] == 1
+    assert cadence["data/esm"]["3"]["expected_interval"] == 60
+
+    trace = result["trace"]
+    assert [(t["topic"], t["device"], t["sensors"]) for t in trace] == [
+        ("data/ehub", "ehub", 91),
+        ("data/ehub", "ehub", 91),
+        ("data/eso", "1", 9),
+        ("data/sso", "2", 7),
+        ("data/esm", "3", 5),
+    ]
+    assert all(t["decode_us"] >= 0 for t in trace)
+
+    writes = result["writes"]
+    assert writes["entities"]["sensor.ferroamp_extapi_version"]["total"]["writes"] >= 1
+    assert writes["devices"]["ferroamp_ehub"]["total"]["writes"] >= 1
+
+    memory = result["memory"]
+    assert memory["sensor_classes"]["ThreePhaseEnergyFerroampSensor"]["sensors"] == 6
+    assert memory["sensor_classes"]["FaultcodeFerroampSensor"]["sensors"] == 2
+    assert memory["stores"]["ferroamp_esm_3"] == 5
+
+
+async def test_timeline_with_disabled_sensors(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    entity_registry.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "ferroamp_eso_1-ubat",
+        config_entry=config_entry,
+        suggested_object_id="ferroamp_eso_1_battery_voltage",
+        disabled_by=entity_registry.RegistryEntryDisabler.USER,
+    )
+    with patch.object(
+        CurrentFerroampSensor, "_attr_entity_registry_enabled_default", False
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        async_fire_mqtt_message(hass, "extapi/data/eso", '{"id": {"val": "1"}}')
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.states.get("sensor.ferroamp_eso_1_battery_voltage") is None
+    assert hass.states.get("sensor.ferroamp_eso_1_battery_current") is None
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    # The ESO sensors are added as one batch, the disabled ones are not waited for
+    added = [mark for mark in result["timeline"] if mark["phase"] == "entities_added"]
+    assert added[-1]["count"] == len(hass.states.async_entity_ids("sensor"))
+    assert added[-1]["count"] - added[-2]["count"] > 1
+
+
+async def test_writes_without_change(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    for _ in range(3):
+        async_fire_mqtt_message(
+            hass, "extapi/data/eso", '{"id": {"val": "1"}, "ubat": {"val": 622.6}}'
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    voltage = result["writes"]["entities"]["sensor.ferroamp_eso_1_battery_voltage"]
+    # Writes of an unchanged state add no row to the states table
+    assert voltage["total"]["writes"] >= 3
+    assert voltage["total"]["state_rows"] == voltage["total"]["writes"] - 2
+    assert voltage["total"]["attribute_rows"] == 1
+
+
+async def test_diagnostics_without_data(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    hass.data.setdefault(DOMAIN, {})
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["timeline"] == []
+    assert result["cadence"] == {}
+    assert result["trace"] == []
+    assert result["backpressure"] == {}
+    assert result["decimated"] == {}
+    assert result["unchanged"] == {}
+    assert result["writes"] == {}
+    assert result["memory"]["stores"] == {}
+    assert result["attributes"] == {}
+
+
+async def test_diagnostic_attributes(hass, mqtt_mock):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0, CONF_DIAGNOSTIC_ATTRIBUTES: True},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    async_fire_mqtt_message(
+        hass,
+        "extapi/data/ehub",
+        '{"ul": {"L1": "228.81", "L2": "233.81", "L3": "231.18"}}',
+    )
+    async_fire_mqtt_message(
+        hass, "extapi/data/eso", '{"id": {"val": "1"}, "faultcode": {"val": "0"}}'
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get("sensor.ferroamp_external_voltage")
+    assert state.state == "693.8"
+    assert "L1" not in state.attributes
+    fault = hass.states.get("sensor.ferroamp_eso_1_faultcode")
+    assert "0" not in fault.attributes
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["attributes"]["sensor.ferroamp_external_voltage"] == {
+        "L1": 228.81,
+        "L2": 233.81,
+        "L3": 231.18,
+    }
+    assert result["attributes"]["sensor.ferroamp_eso_1_faultcode"] == {"0": "No errors"}
+    # Sensors without bulky attributes keep theirs
+    assert "sensor.ferroamp_eso_1_battery_voltage" not in result["attributes"]
+
+    hass.config_entries.async_update_entry(config_entry, options={CONF_INTERVAL: 0})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get("sensor.ferroamp_external_voltage")
+    assert state.attributes["L1"] == 228.81
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["attributes"] == {}
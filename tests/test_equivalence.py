@@ -0,0 +1,88 @@
+"""Tests for the differential equivalence harness."""
+
+import json
+
+from homeassistant.components.sensor import SensorStateClass
+import pytest
+
+from benchmarks.capture import CapturedMessage, write_capture
+
+from .equivalence import capture_windows, compare, random_windows, reference_update
+from .generator import TrafficGenerator
+
+
+def last_event_update(sensor, events):
+    """Update from the last event only, a deliberately wrong fast path."""
+    return reference_update(sensor, events[-1:])
+
+
+class TestEquivalence:
+    """Tests for the equivalence harness."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_reference_is_equivalent(self, seed):
+        """Test the reference implementation is equivalent to itself."""
+        assert compare(random_windows(seed, count=50), reference_update) == []
+
+    def test_reports_divergence(self):
+        """Test a divergence is reported with the window that triggered it."""
+        windows = list(random_windows(count=20))
+        divergences = {
+            divergence.sensor: divergence
+            for divergence in compare(windows, last_event_update)
+        }
+        assert "ferroamp_ehub-gridfreq" in divergences
+        assert "ferroamp_ehub-ul" in divergences
+
+        divergence = divergences["ferroamp_ehub-ul"]
+        window = windows[divergence.window]
+        assert len(window) > 1
+        assert len(divergence.values) == len(window)
+        assert divergence.values[-1] == window[-1]["ul"]
+        assert divergence.expected.value != divergence.actual.value
+        assert str(divergence).startswith(
+            f"ferroamp_ehub-ul diverged after window {divergence.window}: "
+        )
+
+    def test_within_tolerance(self):
+        """Test differences within the tolerance are not divergences."""
+
+        def rounding_update(sensor, events):
+            changed = reference_update(sensor, events)
+            # Energy counters only change on an increase, so rounding them
+            # would change whether the next window changes the state
+            if (
+                isinstance(sensor._attr_native_value, float)
+                and sensor.state_class != SensorStateClass.TOTAL_INCREASING
+            ):
+                sensor._attr_native_value *= 1 + 1e-12
+            return changed
+
+        assert compare(random_windows(count=10), rounding_update) == []
+        assert compare(random_windows(count=10), rounding_update, rel_tol=0)
+
+    def test_capture_windows(self, tmp_path):
+        """Test windows are read from the ehub messages of a capture."""
+        path = str(tmp_path / "capture.jsonl.gz")
+        generator = TrafficGenerator(sso_count=1)
+        messages = []
+        for offset in range(25):
+            generator.advance(1)
+            messages.append(
+                CapturedMessage(
+                    offset, "data/ehub", json.dumps(generator.ehub_payload())
+                )
+            )
+            messages.append(
+                CapturedMessage(
+                    offset,
+                    "data/sso",
+                    json.dumps(generator.sso_payload(generator.ssos[0])),
+                )
+            )
+        write_capture(path, messages)
+
+        windows = list(capture_windows(path, 10))
+        assert [len(window) for window in windows] == [10, 10, 5]
+        assert all("gridfreq" in event for window in windows for event in window)
+        assert compare(windows, reference_update) == []
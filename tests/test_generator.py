@@ -0,0 +1,129 @@
+"""Tests for the synthetic traffic generator."""
+
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+import json
+
+from homeassistant.const import CONF_NAME, CONF_PREFIX
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ferroamp.const import CONF_INTERVAL, DOMAIN
+
+from .generator import PHASES, TrafficGenerator
+
+
+def ehub_payloads(generator, duration):
+    return [
+        json.loads(message.payload)
+        for message in generator.messages(duration)
+        if message.topic == "extapi/data/ehub"
+    ]
+
+
+class TestTrafficGenerator:
+    """Tests for TrafficGenerator."""
+
+    def test_message_counts(self):
+        """Test each topic publishes at its interval, once per device."""
+        generator = TrafficGenerator(sso_count=3, eso_count=2, esm_count=4)
+        counts = Counter(
+            message.topic for message in generator.messages(timedelta(minutes=2))
+        )
+        assert counts == {
+            "extapi/data/ehub": 120,
+            "extapi/data/sso": 3 * 24,
+            "extapi/data/eso": 2 * 24,
+            "extapi/data/esm": 4 * 2,
+        }
+
+    def test_messages_in_time_order(self):
+        """Test messages are yielded in order with matching payload timestamps."""
+        generator = TrafficGenerator(intervals={"data/ehub": 0.5})
+        messages = list(generator.messages(timedelta(seconds=10)))
+        assert [m.at for m in messages] == sorted(m.at for m in messages)
+        ehub = [m for m in messages if m.topic == "extapi/data/ehub"]
+        assert len(ehub) == 20
+        assert json.loads(ehub[-1].payload)["ts"]["val"] == "2021-06-01T04:00:09UTC"
+
+    def test_counters_rise(self):
+        """Test energy counters never decrease."""
+        generator = TrafficGenerator(start=datetime(2021, 6, 1, 16, tzinfo=UTC))
+        payloads = ehub_payloads(generator, timedelta(hours=3))
+        for key in ("wpv", "wbatprod", "wbatcons"):
+            values = [int(p[key]["val"]) for p in payloads]
+            assert values == sorted(values)
+            assert values[-1] > values[0]
+        for key in ("wextconsq", "winvprodq", "wloadconsq"):
+            for phase in PHASES:
+                values = [int(p[key][phase]) for p in payloads]
+                assert values == sorted(values)
+
+    def test_phases_correlated(self):
+        """Test grid power is load power plus inverter power on every phase."""
+        for payload in ehub_payloads(TrafficGenerator(), timedelta(hours=1)):
+            for phase in PHASES:
+                assert float(payload["pext"][phase]) == pytest.approx(
+                    float(payload["pload"][phase]) + float(payload["pinv"][phase]),
+                    abs=0.02,
+                )
+
+    def test_soc_follows_battery(self):
+        """Test SoC rises while charging from solar and falls at night."""
+        generator = TrafficGenerator()
+        generator.advance(6 * 3600)
+        assert generator.pbat < 0
+        morning = generator.soc
+        generator.advance(3600)
+        assert generator.soc > morning
+        generator.advance(10 * 3600)
+        evening = generator.soc
+        assert generator.pbat > 0
+        generator.advance(3600)
+        assert generator.soc < evening
+
+    def test_fault_codes(self):
+        """Test fault codes are hex bitmasks when faults are enabled."""
+        generator = TrafficGenerator(fault_probability=1)
+        codes = {
+            json.loads(m.payload)["faultcode"]["val"]
+            for m in generator.messages(timedelta(minutes=5))
+            if m.topic in ("extapi/data/sso", "extapi/data/eso")
+        }
+        assert len(codes) > 1
+        assert all(int(code, 16) >= 0 for code in codes)
+        quiet = TrafficGenerator()
+        assert quiet.sso_payload(quiet.ssos[0])["faultcode"]["val"] == "0"
+
+    def test_seed(self):
+        """Test the same seed generates the same traffic."""
+        first = [
+            m.payload for m in TrafficGenerator(seed=1).messages(timedelta(minutes=10))
+        ]
+        second = [
+            m.payload for m in TrafficGenerator(seed=1).messages(timedelta(minutes=10))
+        ]
+        assert first == second
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_publish_into_sensor_platform(hass, mqtt_mock):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    generator = TrafficGenerator(sso_count=2, eso_count=1, esm_count=1)
+    count = await generator.async_publish(hass, timedelta(minutes=1), speed=1000)
+    assert count == 60 + 2 * 12 + 12 + 1
+
+    assert hass.states.get("sensor.ferroamp_eso_20030049_state_of_charge")
+    assert hass.states.get("sensor.ferroamp_sso_20120001_pv_string_power")
+    state = hass.states.get("sensor.ferroamp_external_voltage")
+    assert 3 * 225 <= float(state.state) <= 3 * 235
@@ -9,12 +9,21 @@ from pytest_homeassistant_custom_component.common import (
     async_fire_mqtt_message,
 )
 
-from custom_components.ferroamp import ATTR_POWER, ATTR_TARGET, async_setup
+from custom_components.ferroamp import (
+    ATTR_POWER,
+    ATTR_TARGET,
+    ATTR_TRACING,
+    async_setup,
+)
 from custom_components.ferroamp.const import (
     CONF_INTERVAL,
+    DATA_CADENCE,
     DATA_DEVICES,
     DATA_LISTENERS,
     DATA_PREFIXES,
+    DATA_TIMELINES,
+    DATA_TRACES,
+    DATA_WRITE_STATS,
     DOMAIN,
 )
 
@@ -61,6 +70,10 @@ async def test_unload(hass, mqtt_mock):
     assert hass.data[DOMAIN][DATA_DEVICES].get(config_entry.unique_id) is None
     assert hass.data[DOMAIN][DATA_PREFIXES].get(config_entry.unique_id) is None
     assert hass.data[DOMAIN][DATA_LISTENERS].get(config_entry.unique_id) is None
+    assert hass.data[DOMAIN][DATA_CADENCE].get(config_entry.unique_id) is None
+    assert hass.data[DOMAIN][DATA_TRACES].get(config_entry.unique_id) is None
+    assert hass.data[DOMAIN][DATA_WRITE_STATS].get(config_entry.unique_id) is None
+    assert hass.data[DOMAIN][DATA_TIMELINES].get(config_entry.unique_id) is None
     assert hass.data[DOMAIN].get(config_entry.unique_id) is None
 
 
@@ -348,3 +361,56 @@ async def test_multiple_configs_correct_prefix_is_used(hass, mqtt_mock):
             )
         ]
     )
+
+
+async def test_service_dump_trace(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    async_fire_mqtt_message(hass, "extapi/data/esm", '{"id":{"val":"1"}}')
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "dump_trace",
+        {},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert list(response.keys()) == ["ferroamp"]
+    assert len(response["ferroamp"]) == 1
+    assert response["ferroamp"][0]["topic"] == "data/esm"
+    assert response["ferroamp"][0]["device"] == "1"
+    assert response["ferroamp"][0]["sensors"] == 5
+
+
+async def test_service_memory_report(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    async_fire_mqtt_message(hass, "extapi/data/esm", '{"id":{"val":"1"}}')
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "memory_report",
+        {ATTR_TRACING: True},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["ferroamp"]["stores"]["ferroamp_esm_1"] == 5
+    assert response["ferroamp"]["tracemalloc"]["tracing"]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "memory_report",
+        {ATTR_TRACING: False},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["ferroamp"]["tracemalloc"] == {"tracing": False}
@@ -0,0 +1,119 @@
+"""Tests for the long-term statistics module."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import subprocess
+import sys
+
+from custom_components.ferroamp.long_term_statistics import (
+    StatisticsAccumulator,
+    build_metadata,
+    build_statistic_id,
+)
+
+START = datetime(2021, 6, 1, 10, tzinfo=UTC)
+
+
+def add_all(accumulator, samples):
+    return [
+        accumulator.statistic(hour)
+        for hour in (
+            accumulator.add(START + timedelta(seconds=offset), value)
+            for offset, value in samples
+        )
+        if hour is not None
+    ]
+
+
+class TestStatisticsAccumulator:
+    """Tests for StatisticsAccumulator."""
+
+    def test_measurement(self):
+        """Test measurements get the mean, min and max of each hour."""
+        accumulator = StatisticsAccumulator(has_sum=False)
+        assert accumulator.restored
+        rows = add_all(
+            accumulator,
+            [(0, 100.0), (1800, 300.0), (3599, 200.0), (3600, 50.0), (7200, 0.0)],
+        )
+        assert rows == [
+            {"start": START, "mean": 200.0, "min": 100.0, "max": 300.0},
+            {
+                "start": START + timedelta(hours=1),
+                "mean": 50.0,
+                "min": 50.0,
+                "max": 50.0,
+            },
+        ]
+
+    def test_total_waits_for_restore(self):
+        """Test totals are ignored until the sum has been restored."""
+        accumulator = StatisticsAccumulator(has_sum=True)
+        assert not accumulator.restored
+        assert add_all(accumulator, [(0, 10.0), (3600, 11.0)]) == []
+        assert accumulator.hour is None
+
+    def test_total(self):
+        """Test totals get the last value and the sum of increases."""
+        accumulator = StatisticsAccumulator(has_sum=True)
+        accumulator.restore(9.0, 100.0)
+        rows = add_all(
+            accumulator,
+            [
+                (0, 10.0),
+                # A small dip is ignored
+                (1000, 9.5),
+                (2000, 11.0),
+                (3600, 12.0),
+                # A large drop is a reset of the counter
+                (4000, 1.0),
+                (7200, 2.0),
+            ],
+        )
+        assert rows == [
+            {"start": START, "state": 11.0, "sum": 102.0},
+            {"start": START + timedelta(hours=1), "state": 1.0, "sum": 104.0},
+        ]
+
+    def test_total_without_history(self):
+        """Test the first value of a new total does not count as an increase."""
+        accumulator = StatisticsAccumulator(has_sum=True)
+        accumulator.restore(None, None)
+        rows = add_all(accumulator, [(0, 10.0), (1800, 10.5), (3600, 11.0)])
+        assert rows == [{"start": START, "state": 10.5, "sum": 0.5}]
+
+    def test_late_sample(self):
+        """Test samples of a completed hour are ignored."""
+        accumulator = StatisticsAccumulator(has_sum=False)
+        rows = add_all(accumulator, [(0, 1.0), (3600, 2.0), (3599, 5.0), (7200, 3.0)])
+        assert [row["max"] for row in rows] == [1.0, 2.0]
+
+
+def test_metadata():
+    statistic_id = build_statistic_id("ferroamp_eso_1-ubat-ibat")
+    assert statistic_id == "ferroamp:ferroamp_eso_1_ubat_ibat"
+    assert build_metadata(statistic_id, "ESO 1 Battery Power", "W", False) == {
+        "has_mean": True,
+        "has_sum": False,
+        "name": "ESO 1 Battery Power",
+        "source": "ferroamp",
+        "statistic_id": statistic_id,
+        "unit_of_measurement": "W",
+    }
+
+
+def test_recorder_not_imported():
+    """Test the sensor platform does not load the recorder until it is used."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, custom_components.ferroamp.sensor; "
+            "print('homeassistant.components.recorder' in sys.modules)",
+        ],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert result.stdout.strip() == "False"
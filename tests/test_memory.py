@@ -0,0 +1,70 @@
+"""Tests for the memory report module."""
+
+import tracemalloc
+
+from custom_components.ferroamp.memory import deep_sizeof, memory_report, set_tracing
+
+
+class FakeSensor:
+    def __init__(self, events=None):
+        if events is not None:
+            self.events = events
+
+
+class OtherSensor(FakeSensor):
+    pass
+
+
+class TestDeepSizeof:
+    """Tests for deep_sizeof."""
+
+    def test_nested(self):
+        """Test nested containers are included in the size."""
+        event = {"ul": {"L1": "230.0"}}
+        assert deep_sizeof(event, set()) > deep_sizeof({}, set())
+
+    def test_shared_objects_counted_once(self):
+        """Test objects already seen are not counted again."""
+        event = {"ul": {"L1": "230.0"}}
+        seen = set()
+        assert deep_sizeof(event, seen) > 0
+        assert deep_sizeof(event, seen) == 0
+        assert deep_sizeof([event, (1, 2)], seen) > 0
+
+
+class TestMemoryReport:
+    """Tests for memory_report."""
+
+    def test_report(self):
+        """Test sensors and buffered events are grouped by class."""
+        event = {"soc": {"val": "50"}}
+        stores = {
+            "ferroamp_esm_1": {
+                "a": FakeSensor([event, event]),
+                "b": OtherSensor([event]),
+                "c": FakeSensor([]),
+            },
+            "ferroamp_ehub": {"d": FakeSensor()},
+        }
+        result = memory_report(stores)
+        assert result["sensor_classes"]["FakeSensor"]["sensors"] == 3
+        assert result["sensor_classes"]["FakeSensor"]["buffered_events"] == 2
+        assert result["sensor_classes"]["FakeSensor"]["events_bytes"] > 0
+        assert result["sensor_classes"]["OtherSensor"]["buffered_events"] == 1
+        assert result["event_buffers"]["buffered_events"] == 3
+        assert result["event_buffers"]["unique_events"] == 1
+        assert result["stores"] == {"ferroamp_esm_1": 3, "ferroamp_ehub": 1}
+
+    def test_tracemalloc(self):
+        """Test tracemalloc statistics are only reported while tracing."""
+        set_tracing(False)
+        assert memory_report({})["tracemalloc"] == {"tracing": False}
+        set_tracing(True)
+        try:
+            assert tracemalloc.is_tracing()
+            result = memory_report({"ferroamp_ehub": {"a": FakeSensor([{}])}}, top=3)
+            assert result["tracemalloc"]["tracing"]
+            assert len(result["tracemalloc"]["top"]) <= 3
+        finally:
+            set_tracing(False)
+        assert not tracemalloc.is_tracing()
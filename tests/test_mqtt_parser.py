@@ -1,5 +1,6 @@
 """Tests for the MQTT parser module."""
 
+from datetime import UTC, datetime
 from unittest.mock import MagicMock
 
 import pytest
@@ -86,6 +87,22 @@ class TestMqttMessageParser:
         event = {"id": {"other": "data"}}
         assert MqttMessageParser.get_id(event) is None
 
+    def test_get_timestamp(self):
+        """Test getting device timestamp from event."""
+        event = {"ts": {"val": "2021-03-08T08:43:12UTC"}}
+        assert MqttMessageParser.get_timestamp(event) == datetime(
+            2021, 3, 8, 8, 43, 12, tzinfo=UTC
+        )
+
+    def test_get_timestamp_missing(self):
+        """Test getting timestamp when not present in event."""
+        assert MqttMessageParser.get_timestamp({"other": "value"}) is None
+
+    def test_get_timestamp_invalid(self):
+        """Test getting timestamp when value cannot be parsed."""
+        assert MqttMessageParser.get_timestamp({"ts": {"val": "garbage"}}) is None
+        assert MqttMessageParser.get_timestamp({"ts": {}}) is None
+
     def test_get_value(self):
         """Test getting raw value from event."""
         event = {"power": {"val": "1234"}}
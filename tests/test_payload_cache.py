@@ -0,0 +1,45 @@
+"""Tests for the payload cache module."""
+
+from custom_components.ferroamp.const import TOPIC_ESM, TOPIC_ESO
+from custom_components.ferroamp.payload_cache import PayloadCache
+
+PAYLOAD = '{"id": {"val": "1"}, "soh": {"val": "89.2"}}'
+EVENT = {"id": {"val": "1"}, "soh": {"val": "89.2"}}
+
+
+class TestPayloadCache:
+    """Tests for PayloadCache."""
+
+    def test_lookup(self):
+        """Test that the last payload of a device is found by its bytes."""
+        cache = PayloadCache()
+        assert cache.lookup(TOPIC_ESM, PAYLOAD) is None
+        cache.store(TOPIC_ESM, "1", PAYLOAD, EVENT)
+        assert cache.lookup(TOPIC_ESM, PAYLOAD) == ("1", EVENT)
+        assert cache.lookup(TOPIC_ESO, PAYLOAD) is None
+
+    def test_store_replaces_previous_payload(self):
+        """Test that only the last payload of each device is kept."""
+        cache = PayloadCache()
+        cache.store(TOPIC_ESM, "1", PAYLOAD, EVENT)
+        cache.store(TOPIC_ESM, "2", "other", {"id": {"val": "2"}})
+        cache.store(TOPIC_ESM, "1", b"changed", EVENT)
+        assert cache.lookup(TOPIC_ESM, PAYLOAD) is None
+        assert cache.lookup(TOPIC_ESM, b"changed") == ("1", EVENT)
+        assert cache.lookup(TOPIC_ESM, "other") == ("2", {"id": {"val": "2"}})
+
+    def test_store_same_payload(self):
+        """Test that storing the same payload again keeps it."""
+        cache = PayloadCache()
+        cache.store(TOPIC_ESM, "1", PAYLOAD, EVENT)
+        cache.store(TOPIC_ESM, "1", PAYLOAD, EVENT)
+        assert cache.lookup(TOPIC_ESM, PAYLOAD) == ("1", EVENT)
+
+    def test_skip(self):
+        """Test that skipped payloads are counted per topic."""
+        cache = PayloadCache()
+        assert cache.as_dict() == {}
+        cache.skip(TOPIC_ESM)
+        cache.skip(TOPIC_ESM)
+        cache.skip(TOPIC_ESO)
+        assert cache.as_dict() == {TOPIC_ESM: 2, TOPIC_ESO: 1}
@@ -1,6 +1,10 @@
+from datetime import UTC, datetime, timedelta
+import json
 from unittest.mock import patch
 import uuid
 
+from homeassistant.components import recorder
+from homeassistant.components.recorder.statistics import get_last_statistics
 from homeassistant.const import CONF_NAME, CONF_PREFIX
 from homeassistant.core import CoreState, State
 from homeassistant.helpers import entity_registry
@@ -10,8 +14,29 @@ from pytest_homeassistant_custom_component.common import (
     async_fire_mqtt_message,
     mock_restore_cache,
 )
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
 
-from custom_components.ferroamp.const import CONF_INTERVAL, DATA_DEVICES, DOMAIN
+from custom_components.ferroamp.const import (
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ALIGNED_WINDOWS,
+    CONF_BACKPRESSURE,
+    CONF_HEARTBEAT,
+    CONF_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_SKIP_UNCHANGED,
+    CONF_STAGGERED_FLUSH,
+    DATA_BACKPRESSURE,
+    DATA_CADENCE,
+    DATA_DECIMATORS,
+    DATA_DEVICES,
+    DATA_PAYLOADS,
+    DOMAIN,
+    MAX_PENDING_EVENTS,
+)
 from custom_components.ferroamp.sensor import (
     BatteryFerroampSensor,
     EnergyFerroampSensor,
@@ -19,6 +44,7 @@ from custom_components.ferroamp.sensor import (
     StringValFerroampSensor,
     TemperatureFerroampSensor,
     VoltageFerroampSensor,
+    ehub_sensors,
 )
 
 pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
@@ -2300,3 +2326,473 @@ async def test_extapi_version_response(hass, mqtt_mock):
         "friendly_name": "EnergyHub Extapi Version",
         "icon": "mdi:counter",
     }
+
+
+async def test_disabled_sensor_buffers_bounded_events(hass, mqtt_mock):
+    config_entry = create_config()
+    config_entry.add_to_hass(hass)
+    er = entity_registry.async_get(hass)
+    er.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "ferroamp_eso_1-ubat",
+        config_entry=config_entry,
+        suggested_object_id="ferroamp_eso_1_battery_voltage",
+        disabled_by=entity_registry.RegistryEntryDisabler.USER,
+    )
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    for _ in range(MAX_PENDING_EVENTS + 50):
+        async_fire_mqtt_message(
+            hass, "extapi/data/eso", '{"id": {"val": "1"}, "ubat": {"val": 622.6}}'
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.states.get("sensor.ferroamp_eso_1_battery_voltage") is None
+    store = hass.data[DOMAIN][DATA_DEVICES][config_entry.unique_id]["ferroamp_eso_1"]
+    assert len(store["ferroamp_eso_1-ubat"].events) == MAX_PENDING_EVENTS
+
+
+async def fire_battery_voltage(hass, voltage):
+    async_fire_mqtt_message(
+        hass,
+        "extapi/data/eso",
+        f'{{"id": {{"val": "1"}}, "ubat": {{"val": {voltage}}}}}',
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return hass.states.get("sensor.ferroamp_eso_1_battery_voltage").state
+
+
+async def test_deadband(hass, mqtt_mock, freezer):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0, "voltage_deadband": 1, CONF_HEARTBEAT: 60},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The first message adds the sensor, its value is written on the next flush
+    await fire_battery_voltage(hass, 622.6)
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 622.6) == "622.6"
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 623.0) == "622.6"
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 623.6) == "622.6"
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 624.0) == "624.0"
+    # The heartbeat writes the state even if it changed less than the deadband
+    freezer.tick(timedelta(seconds=61))
+    assert await fire_battery_voltage(hass, 624.1) == "624.1"
+
+    store = hass.data[DOMAIN][DATA_DEVICES][config_entry.unique_id]["ferroamp_eso_1"]
+    assert store["ferroamp_eso_1-ubat"]._deadband == 1
+    assert store["ferroamp_eso_1-ubat"]._heartbeat == 60
+
+
+async def test_deadband_percent(hass, mqtt_mock, freezer):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0, "voltage_deadband_percent": 1},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The first message adds the sensor, its value is written on the next flush
+    await fire_battery_voltage(hass, 600.0)
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 600.0) == "600.0"
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 605.9) == "600.0"
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 593.9) == "593.9"
+
+    # Deadbands can be changed without reloading
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_INTERVAL: 0, "voltage_deadband_percent": 0}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    freezer.tick(timedelta(seconds=5))
+    assert await fire_battery_voltage(hass, 594.0) == "594.0"
+
+
+async def test_category_intervals(hass, mqtt_mock):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 30, "power_interval": 5, "energy_interval": 300},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    msg = '{"id":{"val":"1"},"wpv":{"val": "4422089590383"}}'
+    async_fire_mqtt_message(hass, "extapi/data/ehub", msg)
+    async_fire_mqtt_message(hass, "extapi/data/esm", msg)
+    async_fire_mqtt_message(hass, "extapi/data/eso", msg)
+    async_fire_mqtt_message(hass, "extapi/data/sso", msg)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    devices = hass.data[DOMAIN][DATA_DEVICES][config_entry.unique_id]
+
+    def intervals():
+        return {
+            "power": devices["ferroamp_ehub"]["ferroamp_ehub-pinv"]._interval,
+            "voltage": devices["ferroamp_sso_1"]["ferroamp_sso_1-upv"]._interval,
+            "energy": devices["ferroamp_ehub"]["ferroamp_ehub-wpv"]._interval,
+            "temperature": devices["ferroamp_eso_1"]["ferroamp_eso_1-temp"]._interval,
+            "battery": devices["ferroamp_esm_1"]["ferroamp_esm_1-ratedPower"]._interval,
+            "other": devices["ferroamp_esm_1"]["ferroamp_esm_1-status"]._interval,
+        }
+
+    assert intervals() == {
+        "power": 5,
+        "voltage": 30,
+        "energy": 300,
+        "temperature": 30,
+        "battery": 30,
+        "other": 30,
+    }
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_INTERVAL: 20, "voltage_interval": 10, "battery_interval": 600},
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert intervals() == {
+        "power": 20,
+        "voltage": 10,
+        "energy": 20,
+        "temperature": 20,
+        "battery": 600,
+        "other": 20,
+    }
+
+
+async def test_adaptive_interval(hass, mqtt_mock, freezer):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={
+            CONF_INTERVAL: 30,
+            CONF_ADAPTIVE_INTERVAL: True,
+            CONF_ADAPTIVE_MIN_INTERVAL: 5,
+            CONF_ADAPTIVE_MAX_INTERVAL: 120,
+        },
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The first message adds the sensor, its value is written on the next flush
+    await fire_battery_voltage(hass, 600.0)
+    freezer.tick(timedelta(seconds=31))
+    assert await fire_battery_voltage(hass, 600.0) == "600.0"
+    store = hass.data[DOMAIN][DATA_DEVICES][config_entry.unique_id]["ferroamp_eso_1"]
+    sensor = store["ferroamp_eso_1-ubat"]
+    # The interval doubles while the value is flat, up to the ceiling
+    assert sensor._interval == 60
+    freezer.tick(timedelta(seconds=61))
+    assert await fire_battery_voltage(hass, 600.2) == "600.2"
+    assert sensor._interval == 120
+    freezer.tick(timedelta(seconds=121))
+    assert await fire_battery_voltage(hass, 600.0) == "600.0"
+    assert sensor._interval == 120
+
+    # A step flushes right away and drops the interval to the floor
+    freezer.tick(timedelta(seconds=10))
+    assert await fire_battery_voltage(hass, 700.0) == "700.0"
+    assert sensor._interval == 5
+    freezer.tick(timedelta(seconds=6))
+    assert await fire_battery_voltage(hass, 700.0) == "700.0"
+    assert sensor._interval == 10
+
+    # Small changes within the ceiling are buffered until the interval passes
+    freezer.tick(timedelta(seconds=6))
+    assert await fire_battery_voltage(hass, 701.0) == "700.0"
+
+
+async def test_aligned_windows(hass, mqtt_mock):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 60, CONF_ALIGNED_WINDOWS: True},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    async def fire(ts, voltage):
+        async_fire_mqtt_message(
+            hass,
+            "extapi/data/eso",
+            f'{{"id": {{"val": "1"}}, "ts": {{"val": "2021-06-01T{ts}UTC"}}, '
+            f'"ubat": {{"val": {voltage}}}}}',
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+        return hass.states.get("sensor.ferroamp_eso_1_battery_voltage").state
+
+    # The first message adds the sensor
+    await fire("09:59:30", 590)
+    # The first sample of the next window closes the previous one
+    assert await fire("10:00:05", 600) == "590.0"
+    assert await fire("10:00:30", 620) == "590.0"
+    assert await fire("10:00:59", 640) == "590.0"
+    assert await fire("10:01:00", 700) == "620.0"
+    assert await fire("10:01:30", 710) == "620.0"
+    assert await fire("10:03:10", 720) == "705.0"
+
+    store = hass.data[DOMAIN][DATA_DEVICES][config_entry.unique_id]["ferroamp_eso_1"]
+    sensor = store["ferroamp_eso_1-ubat"]
+    sensor._interval = 900
+    assert sensor.window_start(datetime(2021, 6, 1, 10, 7, 30, tzinfo=UTC)) == datetime(
+        2021, 6, 1, 10, 0, tzinfo=UTC
+    )
+    assert sensor.window_start(datetime(2021, 6, 1, 10, 15, tzinfo=UTC)) == datetime(
+        2021, 6, 1, 10, 15, tzinfo=UTC
+    )
+
+
+async def test_staggered_flush(hass, mqtt_mock, freezer):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 30, CONF_STAGGERED_FLUSH: True},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The first message adds the sensor, which schedules its first flush
+    assert await fire_battery_voltage(hass, 600.0) == "unknown"
+    store = hass.data[DOMAIN][DATA_DEVICES][config_entry.unique_id]["ferroamp_eso_1"]
+    sensor = store["ferroamp_eso_1-ubat"]
+    due = sensor._due
+    assert 0 < (due - datetime.now()).total_seconds() <= 30
+
+    freezer.move_to(due - timedelta(seconds=1))
+    assert await fire_battery_voltage(hass, 610.0) == "unknown"
+    freezer.move_to(due)
+    assert await fire_battery_voltage(hass, 620.0) == "610.0"
+    assert sensor._due == due + timedelta(seconds=30)
+
+    # Sensors are spread over the interval by their unique_id
+    phases = {
+        (s.next_flush(due) - due).total_seconds()
+        for s in ehub_sensors("ferroamp", 30, None)
+        if isinstance(s, KeyedFerroampSensor)
+    }
+    assert len(phases) > 10
+    assert all(0 < phase <= 30 for phase in phases)
+
+
+async def test_long_term_statistics(recorder_mock, hass, mqtt_mock):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 30, CONF_LONG_TERM_STATISTICS: True},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    async def fire(ts, ibat, kwh):
+        async_fire_mqtt_message(
+            hass,
+            "extapi/data/eso",
+            json.dumps(
+                {
+                    "id": {"val": "1"},
+                    "ts": {"val": f"2021-06-01T{ts}UTC"},
+                    "ubat": {"val": "600"},
+                    "ibat": {"val": str(ibat)},
+                    "wbatprod": {"val": str(kwh * 3600000000)},
+                }
+            ),
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # Samples are accumulated once the entities are added
+    await fire("09:59:59", 0, 9.5)
+    await fire("10:00:00", 10, 10)
+    await fire("10:30:00", 20, 11)
+    await fire("11:00:00", 30, 12)
+    await async_wait_recording_done(hass)
+
+    def last_statistics(statistic_id, types):
+        return get_last_statistics(hass, 1, statistic_id, True, types)[statistic_id]
+
+    start = datetime(2021, 6, 1, 10, tzinfo=UTC).timestamp()
+    power = await recorder.get_instance(hass).async_add_executor_job(
+        last_statistics, "ferroamp:ferroamp_eso_1_ubat_ibat", {"mean", "min", "max"}
+    )
+    assert power == [
+        {"start": start, "end": start + 3600, "mean": 9000, "min": 6000, "max": 12000}
+    ]
+    energy = await recorder.get_instance(hass).async_add_executor_job(
+        last_statistics, "ferroamp:ferroamp_eso_1_wbatprod", {"state", "sum"}
+    )
+    assert energy == [{"start": start, "end": start + 3600, "state": 11, "sum": 1}]
+
+
+async def test_skip_unchanged(hass, mqtt_mock, freezer):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 30, CONF_SKIP_UNCHANGED: True},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    payloads = hass.data[DOMAIN][DATA_PAYLOADS][config_entry.unique_id]
+
+    # The first message adds the sensor, its value is written on the next flush
+    await fire_battery_voltage(hass, 600.0)
+    freezer.tick(timedelta(seconds=31))
+    assert await fire_battery_voltage(hass, 600.0) == "600.0"
+    assert await fire_battery_voltage(hass, 600.0) == "600.0"
+    assert payloads.skipped == {"data/eso": 1}
+
+    # A changed value is buffered, repeats of it are not skipped until written
+    assert await fire_battery_voltage(hass, 610.0) == "600.0"
+    assert await fire_battery_voltage(hass, 610.0) == "600.0"
+    assert payloads.skipped == {"data/eso": 1}
+    freezer.tick(timedelta(seconds=31))
+    assert await fire_battery_voltage(hass, 610.0) == "610.0"
+    assert await fire_battery_voltage(hass, 610.0) == "610.0"
+    assert payloads.skipped == {"data/eso": 2}
+
+    msg = '{"id":{"val":"1"},"soh":{"val":"89.2"},"ratedCapacity":{"val":"15300"}}'
+    async_fire_mqtt_message(hass, "extapi/data/esm", msg)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    freezer.tick(timedelta(seconds=31))
+    async_fire_mqtt_message(hass, "extapi/data/esm", msg)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    with patch(
+        "custom_components.ferroamp.sensor.MqttMessageParser.parse_message"
+    ) as parse_message:
+        async_fire_mqtt_message(hass, "extapi/data/esm", msg)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    parse_message.assert_not_called()
+    assert payloads.skipped == {"data/eso": 2, "data/esm": 1}
+    state = hass.states.get("sensor.ferroamp_esm_1_rated_capacity")
+    assert state.state == "15300"
+
+
+async def test_decimation(hass, mqtt_mock):
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0, "ehub_every": 3},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    for second, frequency in enumerate(["50.0", "50.1", "50.2", "50.3", "50.4"]):
+        async_fire_mqtt_message(
+            hass,
+            "extapi/data/ehub",
+            json.dumps(
+                {
+                    "ts": {"val": f"2021-03-08T08:43:{second:02d}UTC"},
+                    "gridfreq": {"val": frequency},
+                }
+            ),
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get("sensor.ferroamp_estimated_grid_frequency")
+    assert state.state == "50.3"
+    decimator = hass.data[DOMAIN][DATA_DECIMATORS][config_entry.unique_id]
+    assert decimator.skipped == {"data/ehub": 3}
+    # Messages dropped by decimation are not missed messages
+    cadence = hass.data[DOMAIN][DATA_CADENCE][config_entry.unique_id]
+    stats = cadence.get("data/ehub", "ehub")
+    assert stats.count == 2
+    assert stats.expected == 3
+    assert stats.missed == 0
+
+
+def ehub_message(second: int, solar_power: str, grid_frequency: str) -> str:
+    return json.dumps(
+        {
+            "ts": {"val": f"2021-03-08T08:43:{second:02d}UTC"},
+            "ppv": {"val": solar_power},
+            "pext": {"L1": solar_power, "L2": "0", "L3": "0"},
+            "gridfreq": {"val": grid_frequency},
+        }
+    )
+
+
+async def test_backpressure(hass, mqtt_mock, freezer):
+    freezer.move_to("2021-03-08T08:43:19+00:00")
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_NAME: "Ferroamp", CONF_PREFIX: "extapi"},
+        options={CONF_INTERVAL: 0, CONF_BACKPRESSURE: True},
+        version=1,
+        unique_id="ferroamp",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    monitor = hass.data[DOMAIN][DATA_BACKPRESSURE][config_entry.unique_id]
+
+    # The first message adds the sensors, its values are written on the next one
+    async_fire_mqtt_message(hass, "extapi/data/ehub", ehub_message(19, "100.5", "50.0"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    freezer.move_to("2021-03-08T08:43:20+00:00")
+    async_fire_mqtt_message(hass, "extapi/data/ehub", ehub_message(20, "100.5", "50.0"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get("sensor.ferroamp_solar_power").state == "100.5"
+    grid_power = hass.states.get("sensor.ferroamp_grid_power").state
+    assert not monitor.degraded
+
+    # A burst of lagging messages is coalesced and only updates total power and
+    # energy
+    freezer.move_to("2021-03-08T08:43:30+00:00")
+    async_fire_mqtt_message(hass, "extapi/data/ehub", ehub_message(21, "200.5", "50.1"))
+    async_fire_mqtt_message(hass, "extapi/data/ehub", ehub_message(22, "300.5", "50.2"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get("sensor.ferroamp_solar_power").state == "300.5"
+    frequency = hass.states.get("sensor.ferroamp_estimated_grid_frequency")
+    assert frequency.state == "50.0"
+    # Three-phase power is not updated, it parses the phases of every message
+    assert hass.states.get("sensor.ferroamp_grid_power").state == grid_power
+    assert monitor.degraded
+    assert monitor.coalesced == 1
+
+    # Full processing resumes once messages no longer lag
+    freezer.move_to("2021-03-08T08:43:31+00:00")
+    async_fire_mqtt_message(hass, "extapi/data/ehub", ehub_message(31, "400.5", "50.3"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get("sensor.ferroamp_solar_power").state == "400.5"
+    frequency = hass.states.get("sensor.ferroamp_estimated_grid_frequency")
+    assert frequency.state == "50.3"
+    assert hass.states.get("sensor.ferroamp_grid_power").state != grid_power
+    assert not monitor.degraded
+    assert monitor.episodes == 1
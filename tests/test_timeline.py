@@ -0,0 +1,55 @@
+"""Tests for the startup timeline module."""
+
+import time
+from unittest.mock import patch
+
+from custom_components.ferroamp.timeline import StartupTimeline
+
+
+class TestStartupTimeline:
+    """Tests for StartupTimeline."""
+
+    def test_mark(self):
+        """Test phases are recorded relative to the origin."""
+        with patch.object(time, "monotonic", return_value=12.5):
+            timeline = StartupTimeline(10)
+            timeline.mark("setup_entry")
+        timeline.mark("setup", at=10)
+        timeline.mark("subscribed", at=11, topic="data/ehub")
+        assert timeline.as_list() == [
+            {"offset": 2.5, "phase": "setup_entry"},
+            {"offset": 0, "phase": "setup"},
+            {"offset": 1, "phase": "subscribed", "topic": "data/ehub"},
+        ]
+
+    def test_default_origin(self):
+        """Test the origin defaults to the time of creation."""
+        with patch.object(time, "monotonic", return_value=100):
+            timeline = StartupTimeline()
+            timeline.mark("setup_entry")
+        assert timeline.as_list() == [{"offset": 0, "phase": "setup_entry"}]
+
+    def test_mark_once(self):
+        """Test phases with the same key are only recorded once."""
+        timeline = StartupTimeline()
+        timeline.mark_once("data/ehub", "first_message", topic="data/ehub")
+        timeline.mark_once("data/ehub", "first_message", topic="data/ehub")
+        timeline.mark_once("data/sso", "first_message", topic="data/sso")
+        assert [m["topic"] for m in timeline.as_list()] == ["data/ehub", "data/sso"]
+
+    def test_entities_added(self):
+        """Test a phase is recorded each time all pending entities are added."""
+        timeline = StartupTimeline()
+        timeline.entity_pending("a")
+        timeline.entity_pending("b")
+        timeline.entity_added("a")
+        timeline.entity_added("unknown")
+        assert timeline.as_list() == []
+        timeline.entity_added("b")
+        timeline.entity_pending("c")
+        timeline.entity_added("c")
+        marks = timeline.as_list()
+        assert [(m["phase"], m["count"]) for m in marks] == [
+            ("entities_added", 2),
+            ("entities_added", 3),
+        ]
@@ -0,0 +1,42 @@
+"""Tests for the trace recorder module."""
+
+from datetime import UTC, datetime
+
+from custom_components.ferroamp.tracing import TraceRecorder
+
+RECEIVED = datetime(2021, 3, 8, 8, 43, 12, tzinfo=UTC)
+
+
+class TestTraceRecorder:
+    """Tests for TraceRecorder."""
+
+    def test_record(self):
+        """Test recorded entries are returned as dicts."""
+        trace = TraceRecorder()
+        trace.record("data/ehub", "ehub", RECEIVED, 12.345, 90)
+        assert len(trace) == 1
+        assert trace.as_list() == [
+            {
+                "topic": "data/ehub",
+                "device": "ehub",
+                "received": "2021-03-08T08:43:12+00:00",
+                "decode_us": 12.3,
+                "sensors": 90,
+            }
+        ]
+
+    def test_ring_buffer(self):
+        """Test only the most recent entries are kept."""
+        trace = TraceRecorder(size=2)
+        trace.record("data/sso", "1", RECEIVED, 1, 7)
+        trace.record("data/sso", "2", RECEIVED, 1, 7)
+        trace.record("data/sso", "3", RECEIVED, 1, 7)
+        assert len(trace) == 2
+        assert [entry["device"] for entry in trace.as_list()] == ["2", "3"]
+
+    def test_clear(self):
+        """Test clearing the trace."""
+        trace = TraceRecorder()
+        trace.record("data/esm", "1", RECEIVED, 1, 5)
+        trace.clear()
+        assert trace.as_list() == []
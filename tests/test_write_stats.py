@@ -0,0 +1,100 @@
+"""Tests for the write statistics module."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.ferroamp.write_stats import (
+    BUCKET_SECONDS,
+    EntityWriteStats,
+    WriteCounters,
+    WriteStats,
+)
+
+ATTRIBUTES = {"L1": 1.0, "L2": 2.0, "L3": 3.0, "friendly_name": "Grid Power"}
+
+START = datetime(2021, 3, 8, 8, 43, 12, tzinfo=UTC)
+
+
+def updated(seconds: float) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+
+class TestWriteCounters:
+    """Tests for WriteCounters."""
+
+    def test_add(self):
+        """Test adding counters."""
+        counters = WriteCounters(writes=1, state_rows=1, attribute_rows=1)
+        counters.attribute_bytes = 10
+        counters.add(WriteCounters(writes=2, state_rows=1, attribute_bytes=5))
+        assert counters.as_dict() == {
+            "writes": 3,
+            "state_rows": 2,
+            "attribute_rows": 1,
+            "attribute_bytes": 15,
+        }
+
+
+class TestEntityWriteStats:
+    """Tests for EntityWriteStats."""
+
+    def test_unchanged_attributes_share_row(self):
+        """Test only changed attributes count as new attribute rows."""
+        stats = EntityWriteStats("ferroamp_ehub")
+        stats.record(ATTRIBUTES, updated(0), 0)
+        stats.record(ATTRIBUTES, updated(1), 1)
+        stats.record({**ATTRIBUTES, "L1": 1.5}, updated(2), 2)
+        assert stats.total.writes == 3
+        assert stats.total.state_rows == 3
+        assert stats.total.attribute_rows == 2
+        assert stats.total.attribute_bytes > 0
+
+    def test_unchanged_state_adds_no_row(self):
+        """Test writes that leave the state as it is add no rows."""
+        stats = EntityWriteStats("ferroamp_ehub")
+        stats.record(ATTRIBUTES, updated(0), 0)
+        stats.record(ATTRIBUTES, updated(0), 1)
+        stats.record(ATTRIBUTES, updated(0), 2)
+        assert stats.total.writes == 3
+        assert stats.total.state_rows == 1
+        assert stats.total.attribute_rows == 1
+
+    def test_window(self):
+        """Test rolling windows only include recent buckets."""
+        stats = EntityWriteStats("ferroamp_ehub")
+        stats.record({}, updated(0), 0)
+        stats.record({}, updated(1), 10 * BUCKET_SECONDS)
+        stats.record({}, updated(1), 10 * BUCKET_SECONDS + 1)
+        now = 10 * BUCKET_SECONDS + 2
+        assert stats.window(300, now).writes == 2
+        assert stats.window(300, now).state_rows == 1
+        assert stats.window(3600, now).writes == 3
+        assert stats.window(3600, now).state_rows == 2
+
+    def test_buckets_bounded(self):
+        """Test old buckets are dropped."""
+        stats = EntityWriteStats("ferroamp_ehub")
+        for minute in range(120):
+            stats.record({}, updated(minute), minute * BUCKET_SECONDS)
+        assert len(stats.buckets) == 60
+        assert stats.total.writes == 120
+
+
+class TestWriteStats:
+    """Tests for WriteStats."""
+
+    def test_as_dict(self):
+        """Test statistics are reported per entity and per device."""
+        stats = WriteStats()
+        stats.record("sensor.a", "ferroamp_ehub", ATTRIBUTES, updated(0), 0)
+        stats.record("sensor.b", "ferroamp_ehub", {}, updated(0), 0)
+        stats.record("sensor.b", "ferroamp_ehub", {}, updated(0), 1)
+        stats.record("sensor.c", "ferroamp_sso_1", {}, updated(1), 1)
+        result = stats.as_dict(2)
+        assert list(result["entities"].keys()) == ["sensor.b", "sensor.a", "sensor.c"]
+        assert result["entities"]["sensor.b"]["total"]["writes"] == 2
+        assert result["entities"]["sensor.b"]["5m"]["writes"] == 2
+        assert result["entities"]["sensor.b"]["5m"]["state_rows"] == 1
+        assert result["devices"]["ferroamp_ehub"]["total"]["writes"] == 3
+        assert result["devices"]["ferroamp_ehub"]["total"]["state_rows"] == 2
+        assert result["devices"]["ferroamp_ehub"]["1h"]["attribute_rows"] == 2
+        assert result["devices"]["ferroamp_sso_1"]["5m"]["writes"] == 1